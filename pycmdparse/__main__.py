@@ -0,0 +1,44 @@
+"""
+Command line tools for utilities that use pycmdparse:
+
+python -m pycmdparse completion [options] bash|zsh|fish SPEC
+python -m pycmdparse lint [options] SPEC...
+python -m pycmdparse stub SPEC
+
+'completion' generates a shell completion script. (See pycmdparse.completion.)
+'lint' checks specs for problems. (See pycmdparse.lint.) 'stub' generates a
+typing stub for the option values of a parse. (See pycmdparse.stub.) The hidden
+'__complete' command answers a completion request - like running the
+pycmdparse/completer.py file directly, which completion scripts do since it's
+faster.
+"""
+import sys
+
+COMMANDS = ["completion", "lint", "stub"]
+"""The commands. Each is a module in the package, with a 'main' function"""
+
+
+def main(argv):
+    command = argv[1] if len(argv) > 1 else None
+    # modules are imported as needed, so answering completion requests doesn't
+    # import yaml
+    if command == "__complete":
+        from pycmdparse.completer import main as complete
+        return complete(argv[1:])
+    if command == "completion":
+        from pycmdparse.completion import main as completion
+        return completion(argv[1:])
+    if command == "lint":
+        from pycmdparse.lint import main as lint
+        return lint(argv[1:])
+    if command == "stub":
+        from pycmdparse.stub import main as stub
+        return stub(argv[1:])
+    print("Usage: python -m pycmdparse COMMAND [ARGS...]\n\nCommands: {}\n\n"
+          "For help on a command, try: python -m pycmdparse COMMAND --help"
+          .format(", ".join(COMMANDS)))
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -13,8 +13,17 @@ class AbstractOpt(ABC):
     command line. Must be subclassed to provide specific functionality.
     """
 
+    __slots__ = ("_opt_name", "_short_key", "_long_key", "_opt_hint", "_required",
+                 "_is_internal", "_default_value", "_data_type", "_help_text",
+                 "_value", "_initialized", "_supplied_key", "_from_cmdline",
+                 "_keys_and_hint", "_option_keys", "_usage_help", "_env_name")
+    """
+    Specs can define thousands of options, so options don't carry a per-instance
+    __dict__. Subclasses must declare slots for any fields they add
+    """
+
     def __init__(self, opt_name, short_key, long_key, opt_hint, required,
-                 is_internal, default_value, data_type, help_text):
+                 is_internal, default_value, data_type, help_text, env_name=None):
         """
         Instance initializer for an option. Sets instance fields from passed
         values and performs some basic state initialization.
@@ -37,6 +46,9 @@ class AbstractOpt(ABC):
         :param data_type: Supports rudimentary data type validation. Expects a
         DataTypeEnum object
         :param help_text: Help text for the option
+        :param env_name: Optional. The name of an environment variable that supplies
+        the option value when the option isn't on the command line. (See
+        'accept_env')
 
         Determining the option name: after an option is parsed, its value is injected
         into the CmdLine subclass running the arg parser. The Python identifier that
@@ -51,14 +63,8 @@ class AbstractOpt(ABC):
         raises an exception.
 
         """
-        if not long_key and not short_key:
-            raise CmdLineException("YAML must specify 'short' or 'long' "
-                                   "option key")
-        if short_key and len(short_key) != 1:
-            raise CmdLineException("Invalid short key: '{}'".format(short_key))
-
-        self._opt_name = next(e for e in [opt_name, long_key, short_key] if e)\
-            .replace('-', '_')
+        AbstractOpt._check_keys(short_key, long_key)
+        self._opt_name = AbstractOpt._option_name(opt_name, long_key, short_key)
         self._short_key = short_key
         self._long_key = long_key
         self._opt_hint = opt_hint
@@ -67,6 +73,7 @@ class AbstractOpt(ABC):
         self._default_value = default_value
         self._data_type = data_type
         self._help_text = help_text
+        self._env_name = env_name
         self._value = None
         if not required and default_value:
             # an optional param with a default is immediately considered initialized
@@ -79,6 +86,12 @@ class AbstractOpt(ABC):
         # "--filename"):
         self._supplied_key = None
         self._from_cmdline = False
+        # display strings are built once here, rather than on every access while
+        # rendering help or reporting errors
+        self._keys_and_hint = AbstractOpt._format_keys_and_hint(
+            short_key, long_key, opt_hint)
+        self._option_keys = AbstractOpt._format_option_keys(short_key, long_key)
+        self._usage_help = AbstractOpt._prepend_required(help_text, required)
 
     def __repr__(self):
         s = "opt_name: {} short_key: {}; long_key: {}; value: {}; required: {}; " \
@@ -104,25 +117,10 @@ class AbstractOpt(ABC):
     @property
     def keys_and_hint(self):
         """
-        Returns the keys and the hint for an option, formatted for help. The hint is
-        a token or mnemonic that briefly lets the user know what parameter is expected
-        for an option.
-
-        :return: E.g.: if short key is "f" and long key is "file-name", and hint is
-        "pathspec", then returns: "-f,--file-name <pathspec>". If short key is "a"
-        and long key is "action", and hint is is "upload|download", then returns:
-        "-a,--action <upload|download>". If short key is "t" and long key is
-        "timeout", and hint is is "n", then returns: "-t,--timeout <n>". Etc.
+        Returns the keys and the hint for an option, formatted for help. (See
+        '_format_keys_and_hint')
         """
-        s = ""
-        if self._short_key:
-            s += "-" + self._short_key
-        if self._long_key:
-            s += "" if len(s) == 0 else ","
-            s += "--" + self._long_key
-        if self._opt_hint:
-            s += " <" + self._opt_hint + ">"
-        return s
+        return self._keys_and_hint
 
     @property
     def initialized(self):
@@ -156,6 +154,14 @@ class AbstractOpt(ABC):
     def default_value(self):
         return self._default_value
 
+    @property
+    def default_pending(self):
+        """
+        :return: True if the option value is a default that is only computed when
+        read. (See ParamOpt.default_value)
+        """
+        return False
+
     @property
     def data_type(self):
         return self._data_type
@@ -168,6 +174,10 @@ class AbstractOpt(ABC):
     def is_internal(self):
         return self._is_internal
 
+    @property
+    def env_name(self):
+        return self._env_name
+
     @property
     def supplied_key(self):
         return self._supplied_key
@@ -184,20 +194,99 @@ class AbstractOpt(ABC):
     @property
     def option_keys(self):
         """
-        Returns the keys formatted for usage help.
+        Returns the keys formatted for usage help. (See '_format_option_keys')
+        """
+        return self._option_keys
+
+    @property
+    def usage_help(self):
+        """
+        Returns the help text for the option as displayed in the usage instructions:
+        prepended with "Mandatory. " or "Optional. ". (See '_prepend_required')
+        """
+        return self._usage_help
+
+    @staticmethod
+    def _check_keys(short_key, long_key):
+        """
+        Checks the keys of an option
+
+        :raises: CmdLineException if the option has neither key, or the short key
+        isn't one character
+        """
+        if not long_key and not short_key:
+            raise CmdLineException("YAML must specify 'short' or 'long' "
+                                   "option key")
+        if short_key and len(short_key) != 1:
+            raise CmdLineException("Invalid short key: '{}'".format(short_key))
+
+    @staticmethod
+    def _option_name(opt_name, long_key, short_key):
+        """
+        :return: the name of an option - the first non-null of the passed args, with
+        dashes converted to underlines. (See 'Determining the option name' in the
+        initializer)
+        """
+        return (opt_name or long_key or short_key).replace('-', '_')
+
+    @staticmethod
+    def _format_keys_and_hint(short_key, long_key, opt_hint):
+        """
+        Formats the keys and the hint for an option, for help. The hint is a token
+        or mnemonic that briefly lets the user know what parameter is expected for
+        an option.
+
+        :return: E.g.: if short key is "f" and long key is "file-name", and hint is
+        "pathspec", then returns: "-f,--file-name <pathspec>". If short key is "a"
+        and long key is "action", and hint is is "upload|download", then returns:
+        "-a,--action <upload|download>". If short key is "t" and long key is
+        "timeout", and hint is is "n", then returns: "-t,--timeout <n>". Etc.
+        """
+        s = ""
+        if short_key:
+            s += "-" + short_key
+        if long_key:
+            s += "" if len(s) == 0 else ","
+            s += "--" + long_key
+        if opt_hint:
+            s += " <" + opt_hint + ">"
+        return s
+
+    @staticmethod
+    def _format_option_keys(short_key, long_key):
+        """
+        Formats the keys for usage help.
 
         :return: E.g. if short key is "-f" and long key is "--filename" then returns
         "-f,--filename". If only one or the other of short or long key is defined,
         then returns only that part.
         """
         to_return = ""
-        if self._short_key:
-            to_return += "-" + self._short_key
-        if self._long_key:
+        if short_key:
+            to_return += "-" + short_key
+        if long_key:
             to_return += "/" if len(to_return) > 0 else ""
-            to_return += "--" + self._long_key
+            to_return += "--" + long_key
         return to_return
 
+    @staticmethod
+    def _prepend_required(help_text, required):
+        """
+        Returns the passed help text prepended with "Optional. " or "Mandatory. ",
+        based on the value of the passed 'required' param. If the passed help text
+        is 'None' or blank, then returns the help text as is.
+
+        :param help_text: Text to perhaps prepend
+        :param required:  True if the option is required, else False - the
+        option is not required to be provided on the command line
+
+        :return: The value of 'help_text', potentially prepended as described.
+        """
+        if not help_text or len(help_text.strip()) == 0:
+            return help_text
+        else:
+            return ("Mandatory. " if required else "Optional. ") + help_text
+
     def accept(self, stack):
         """
         If the token on the top of the stack matches the short or long key for the
@@ -209,18 +298,80 @@ class AbstractOpt(ABC):
         :param stack: the command line stack
 
         :return: a tuple: element zero is an OptAcceptResultEnum value, element
-        one is an error message if element zero is OptAcceptResultEnum.ERROR
+        one is an error message if element zero is OptAcceptResultEnum.ERROR. If
+        the tuple has more than two elements, then element one is a format string
+        and the remaining elements are its arguments. (Formatting is deferred until
+        the message is displayed - see ParseError.)
         """
-        if stack.size() == 0:
-            return OptAcceptResultEnum.IGNORED,
-        if not re.compile("-{1,2}\\w").match(stack.peek()):
-            # only match options starting with dash or double dash. (Triple-
-            # dash is ignored)
+        if stack.is_empty():
             return OptAcceptResultEnum.IGNORED,
-        if stack.peek().lstrip("-") in [self._short_key, self._long_key]:
+        if self._matches(stack.peek()):
             return self._do_accept(stack)
         return OptAcceptResultEnum.IGNORED,
 
+    def _matches(self, token):
+        """
+        :param token: a token from the command line
+
+        :return: True if the token is this option's short or long key, prefixed
+        with a dash or double dash. (Triple-dash is ignored)
+        """
+        if not re.compile("-{1,2}\\w").match(token):
+            return False
+        return token.lstrip("-") in [self._short_key, self._long_key]
+
+    def _save_state(self):
+        """
+        :return: the state that parsing the command line changes - the value, and
+        whether and how the option was supplied - as a tuple that can be passed to
+        '_restore_state'. Supports the IncrementalParser, which undoes the parse of
+        the tail of a command line
+        """
+        value = list(self._value) if isinstance(self._value, list) else self._value
+        return value, self._initialized, self._supplied_key, self._from_cmdline
+
+    def _restore_state(self, state):
+        """
+        :param state: a tuple returned by '_save_state'
+        """
+        value, self._initialized, self._supplied_key, self._from_cmdline = state
+        self._value = list(value) if isinstance(value, list) else value
+
+    @abstractmethod
+    def accept_env(self, value):
+        """
+        Initializes the option from the value of its environment variable. Called
+        after the command line is parsed, if the option wasn't on the command line.
+        The supplied key is set to the variable name, prefixed with '$', so errors
+        name the variable. Precedence is thus: command line, then environment, then
+        default.
+
+        :param value: the value of the variable. Not empty
+
+        :return: a tuple: element zero is an OptAcceptResultEnum value, element
+        one is an error message format string if element zero is
+        OptAcceptResultEnum.ERROR, and the remaining elements are the format
+        arguments
+        """
+        pass
+
+    @abstractmethod
+    def accept_config(self, value, path):
+        """
+        Initializes the option from its value in a config file. Called after the
+        command line is parsed, if the option wasn't on the command line or in the
+        environment. Like 'accept_env', except the supplied key names the option and
+        the file - e.g. "depth in /etc/foo.yaml".
+
+        :param value: the value in the file. Not None. A string, number, or bool -
+        or a list of them
+
+        :param path: the path of the config file
+
+        :return: see 'accept_env'
+        """
+        pass
+
     @abstractmethod
     def do_final_validate(self):
         """
@@ -314,6 +465,9 @@ class AbstractOpt(ABC):
         belong to the option have been popped.
 
         :return: a tuple: element zero is an OptAcceptResultEnum value, element
-        one is an error message if element zero is OptAcceptResultEnum.ERROR
+        one is an error message if element zero is OptAcceptResultEnum.ERROR. If
+        the tuple has more than two elements, then element one is a format string
+        and the remaining elements are its arguments. (Formatting is deferred until
+        the message is displayed - see ParseError.)
         """
         pass
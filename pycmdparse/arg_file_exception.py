@@ -0,0 +1,11 @@
+from pycmdparse.cmdline_exception import CmdLineException
+
+
+class ArgFileException(CmdLineException):
+    """
+    Raised when an arg file named on the command line can't be read, or names arg
+    files nested too deep. Unlike other CmdLineExceptions, this is a problem with
+    the command line rather than the spec - so the parser reports it as a parse
+    error
+    """
+    pass
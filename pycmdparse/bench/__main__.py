@@ -0,0 +1,158 @@
+import json
+import sys
+
+from pycmdparse.bench.micro_bench import MicroBench
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.opt_acceptresult_enum import OptAcceptResultEnum
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+
+class BenchCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: python -m pycmdparse.bench
+
+    summary: >
+      Runs micro-benchmarks of the pycmdparse parse hot path against generated
+      specs and command lines, and writes the results as JSON.
+
+    supported_options:
+      - category:
+        options:
+        - name      : option_counts
+          short     : o
+          long      : options
+          hint      : n ...
+          multi_type: no-limit
+          datatype  : int
+          default   : [10, 100]
+          help: >
+            The number of options in each generated spec.
+        - name      : token_counts
+          short     : t
+          long      : tokens
+          hint      : n ...
+          multi_type: no-limit
+          datatype  : int
+          default   : [10, 1000, 10000]
+          help: >
+            The number of tokens on each generated command line.
+        - name      : scenarios
+          short     : s
+          long      : scenario
+          hint      : options|positional ...
+          multi_type: no-limit
+          default   : [options, positional]
+          help: >
+            'options' parses a command line of options and their params.
+            'positional' parses one option followed by a long positional tail.
+        - name      : full
+          short     : f
+          long      : full
+          opt       : bool
+          help: >
+            Runs the full suite: 10, 100 and 1000 options, with command lines of
+            10 to 1,000,000 tokens. This takes a while. Overrides --options and
+            --tokens.
+        - name      : min_time
+          short     : m
+          long      : min-time
+          hint      : seconds
+          datatype  : decimal
+          default   : 0.2
+          help: >
+            Each case is repeated until at least this much time has elapsed.
+        - name      : no_alloc
+          long      : no-alloc
+          opt       : bool
+          help: >
+            Skips measuring the memory allocated by each parse, and the memory
+            held by each option.
+        - name      : wrap_size
+          short     : w
+          long      : wrap
+          hint      : n
+          datatype  : int
+          default   : 1048576
+          help: >
+            The length, in characters, of the generated help text used to
+            benchmark word-wrapping. The default is 1 MB.
+        - name      : output
+          long      : output
+          hint      : file
+          help: >
+            Writes the results to the specified file rather than the console.
+        - name      : compare
+          long      : compare
+          hint      : file
+          help: >
+            Compares the results against the results in the specified file from
+            a prior run, and exits with a non-zero status if any case is slower
+            by more than the threshold.
+        - name      : threshold
+          long      : threshold
+          hint      : fraction
+          datatype  : decimal
+          default   : 0.1
+          help: >
+            The slowdown that --compare reports as a regression. The default is
+            0.1 (ten percent).
+    '''
+
+    @classmethod
+    def validator(cls, to_validate):
+        if getattr(to_validate, "opt_name", None) == "scenarios":
+            for scenario in to_validate.value:
+                if scenario not in MicroBench.SCENARIOS:
+                    return OptAcceptResultEnum.ERROR, \
+                           "Unknown scenario: {}".format(scenario)
+        return None,
+
+    option_counts = None
+    token_counts = None
+    scenarios = None
+    full = None
+    min_time = None
+    no_alloc = None
+    wrap_size = None
+    output = None
+    compare = None
+    threshold = None
+
+
+def main(argv):
+    parse_result = BenchCmdLine.parse(argv)
+    if parse_result.value != ParseResultEnum.SUCCESS.value:
+        BenchCmdLine.display_info(parse_result)
+        return 1
+    option_counts = BenchCmdLine.option_counts
+    token_counts = BenchCmdLine.token_counts
+    if BenchCmdLine.full:
+        option_counts = [10, 100, 1000]
+        token_counts = [10, 1000, 100000, 1000000]
+    results = MicroBench.run(option_counts, token_counts, BenchCmdLine.scenarios,
+                             BenchCmdLine.min_time, not BenchCmdLine.no_alloc)
+    if not BenchCmdLine.no_alloc:
+        results["option_memory"] = [MicroBench.option_memory(option_count)
+                                    for option_count in option_counts]
+    results["wrap"] = MicroBench.wrap(BenchCmdLine.wrap_size,
+                                      min_time=BenchCmdLine.min_time)
+    status = 0
+    if BenchCmdLine.compare:
+        with open(BenchCmdLine.compare) as f:
+            comparison = MicroBench.compare(json.load(f), results,
+                                            BenchCmdLine.threshold)
+        results["comparison"] = comparison
+        if any(c["regression"] for c in comparison):
+            status = 2
+    if BenchCmdLine.output:
+        with open(BenchCmdLine.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
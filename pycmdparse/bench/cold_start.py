@@ -0,0 +1,195 @@
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+
+class ColdStart:
+    """
+    Measures what the user of a console utility actually waits for: the time from
+    launching the utility to the first line of program logic - including interpreter
+    start-up, importing pycmdparse, building the spec from the yaml, and parsing the
+    command line. Each run launches the utility script in a fresh interpreter via
+    the cold_start_driver script, which reports the time spent in each phase.
+    """
+
+    PHASES = ["interpreter", "import", "script_load", "spec_build", "parse",
+              "render", "total"]
+    """
+    interpreter: from spawning the process to the first line of the driver
+    import     : importing pycmdparse
+    script_load: loading the utility script as a module
+    spec_build : building the spec from the yaml (CmdLine._init_from_yaml)
+    parse      : parsing the command line, excluding spec_build
+    render     : rendering usage instructions, if the parse result is to show them
+    total      : from spawning the process to the end of the parse, or render
+    """
+
+    VARIANTS = ["parse", "help"]
+    """
+    parse: parses the args supplied for the script
+    help : parses '--help', as a user asking for usage instructions would
+    """
+
+    @staticmethod
+    def run(script, args, runs=20, variants=None, python=None, cache_dir=None):
+        """
+        Launches the passed script repeatedly, and summarizes the timings
+
+        :param script: the path of a utility script that defines a CmdLine subclass
+        (like the scripts in the project 'example' directory)
+        :param args: the command line args to parse, not including the utility name
+        :param runs: the number of times to launch the script for each variant
+        :param variants: a list of variants from ColdStart.VARIANTS. If None, then
+        all variants are run
+        :param python: the interpreter to use. Defaults to the current interpreter
+        :param cache_dir: if not None, the 'cache_dir' setting of the CmdLine
+        subclass - so e.g. the 'help' variant measures rendering usage
+        instructions from the help cache. (See HelpCache)
+
+        :return: a dictionary, suitable for serializing as JSON, with a summary for
+        each variant keyed by variant name. Each summary has the median and p99 time,
+        in milliseconds, for each phase in ColdStart.PHASES
+        """
+        results = {}
+        for variant in variants if variants else ColdStart.VARIANTS:
+            if variant not in ColdStart.VARIANTS:
+                raise CmdLineException("Unknown variant: {}".format(variant))
+            variant_args = ["--help"] if variant == "help" else args
+            samples = [ColdStart.run_once(script, variant_args, python, cache_dir)
+                       for _ in range(runs)]
+            results[variant] = ColdStart.summarize(samples)
+        return {
+            "script": script,
+            "args": args,
+            "runs": runs,
+            "variants": results
+        }
+
+    @staticmethod
+    def run_once(script, args, python=None, cache_dir=None):
+        """
+        Launches the passed script once
+
+        :return: a dictionary with the time, in seconds, of each phase in
+        ColdStart.PHASES, and 'result' - the name of the ParseResultEnum
+        """
+        driver = os.path.join(os.path.dirname(__file__), "cold_start_driver.py")
+        env = dict(os.environ)
+        # make sure the child imports this copy of pycmdparse
+        root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__))))
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in [root, env.get("PYTHONPATH")] if p)
+        cmd = [python if python else sys.executable, driver, repr(time.time()),
+               cache_dir if cache_dir else "", script]
+        cmd.extend(args)
+        completed = subprocess.run(cmd, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, env=env)
+        if completed.returncode != 0:
+            raise CmdLineException("Launch failed: {}".format(
+                completed.stderr.decode(errors="replace")))
+        return json.loads(completed.stdout.decode().splitlines()[-1])
+
+    @staticmethod
+    def summarize(samples):
+        """
+        :param samples: a list of dictionaries returned by 'run_once'
+
+        :return: a dictionary keyed by phase, with the median and p99 of each phase,
+        in milliseconds
+        """
+        to_return = {}
+        for phase in ColdStart.PHASES:
+            values = sorted(sample[phase] * 1000 for sample in samples)
+            p99 = values[max(math.ceil(len(values) * 0.99) - 1, 0)]
+            to_return[phase] = {"median": statistics.median(values), "p99": p99}
+        return to_return
+
+
+class ColdStartCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: python -m pycmdparse.bench.cold_start
+      require_args: true
+
+    summary: >
+      Measures the start-up latency of a utility that uses pycmdparse, by
+      launching it in a fresh interpreter repeatedly, and reports the median
+      and p99 time of each start-up phase as JSON.
+
+    usage: >
+      python -m pycmdparse.bench.cold_start [options] -- SCRIPT [ARGS...]
+
+    positional_params:
+      params: SCRIPT [ARGS...]
+      text: >
+        SCRIPT is a utility script that defines a CmdLine subclass - like the
+        scripts in the pycmdparse 'example' directory. ARGS are the command
+        line args to parse with it.
+
+    supported_options:
+      - category:
+        options:
+        - name      : runs
+          short     : n
+          long      : runs
+          hint      : n
+          datatype  : int
+          default   : 20
+          help: >
+            The number of times to launch the script for each variant.
+        - name      : variants
+          short     : v
+          long      : variant
+          hint      : parse|help ...
+          multi_type: no-limit
+          default   : [parse, help]
+          help: >
+            'parse' parses ARGS. 'help' parses '--help'.
+        - name      : python
+          long      : python
+          hint      : path
+          help: >
+            The interpreter to launch. Defaults to the current interpreter.
+        - name      : help_cache_dir
+          long      : cache-dir
+          hint      : dir
+          help: >
+            Makes the directory the 'cache_dir' setting of the script's
+            CmdLine subclass, so usage instructions are rendered once and then
+            read from the cache.
+    '''
+
+    runs = None
+    variants = None
+    python = None
+    help_cache_dir = None
+
+
+def main(argv):
+    parse_result = ColdStartCmdLine.parse(argv)
+    if parse_result.value != ParseResultEnum.SUCCESS.value:
+        ColdStartCmdLine.display_info(parse_result)
+        return 1
+    params = ColdStartCmdLine.positional_params
+    if not params:
+        print("A SCRIPT is required")
+        return 1
+    results = ColdStart.run(params[0], params[1:], ColdStartCmdLine.runs,
+                            ColdStartCmdLine.variants, ColdStartCmdLine.python,
+                            ColdStartCmdLine.help_cache_dir)
+    json.dump(results, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,68 @@
+"""
+Run by ColdStart in a fresh interpreter, to time the start-up of a utility that
+uses pycmdparse. Usage:
+
+python cold_start_driver.py SPAWN_TIME CACHE_DIR SCRIPT [ARGS...]
+
+Imports pycmdparse, loads SCRIPT as a module (so its '__main__' block doesn't run),
+finds the CmdLine subclass it defines, and parses ARGS with it - timing each step.
+If the parse result is to show usage, then the usage instructions are rendered, to
+a discarded stream. If CACHE_DIR is not empty, then it is the 'cache_dir' setting of
+the CmdLine subclass. Prints the timings, as one line of JSON.
+"""
+import time
+T_START = time.time()
+
+import contextlib  # noqa: E402
+import importlib.util  # noqa: E402
+import io  # noqa: E402
+import json  # noqa: E402
+import sys  # noqa: E402
+
+
+def main(argv):
+    spawn_time = float(argv[1])
+    cache_dir = argv[2]
+    script = argv[3]
+    args = argv[4:]
+
+    # the import of pycmdparse is one of the things being timed
+    from pycmdparse.cmdline import CmdLine
+    from pycmdparse.parse_stats import ParseStats
+    from pycmdparse.parseresult_enum import ParseResultEnum
+    t_import = time.time()
+
+    spec = importlib.util.spec_from_file_location("cold_start_target", script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    cmdline = next(obj for obj in vars(module).values()
+                   if isinstance(obj, type) and issubclass(obj, CmdLine)
+                   and obj.__module__ == module.__name__)
+    t_loaded = time.time()
+
+    stats = ParseStats()
+    settings = cmdline.parse_settings.replace(stats=stats)
+    cmdline.parse_settings = settings.replace(cache_dir=cache_dir) if cache_dir \
+        else settings
+    parse_result = cmdline.parse([script] + args)
+    t_parsed = time.time()
+    if parse_result is ParseResultEnum.SHOW_USAGE:
+        with contextlib.redirect_stdout(io.StringIO()):
+            cmdline.display_info(parse_result)
+    t_ready = time.time()
+
+    spec_build = stats.phases[ParseStats.SPEC_LOAD]
+    print(json.dumps({
+        "result": parse_result.name,
+        "interpreter": T_START - spawn_time,
+        "import": t_import - T_START,
+        "script_load": t_loaded - t_import,
+        "spec_build": spec_build,
+        "parse": t_parsed - t_loaded - spec_build,
+        "render": t_ready - t_parsed,
+        "total": t_ready - spawn_time
+    }))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,457 @@
+import argparse
+import contextlib
+import getopt
+import io
+import json
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from pycmdparse.abstract_opt import AbstractOpt
+from pycmdparse.bench.spec_generator import SpecGenerator
+from pycmdparse.bool_opt import BoolOpt
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.datatype_enum import DataTypeEnum
+from pycmdparse.help_cache import HelpCache
+from pycmdparse.multitype_enum import MultiTypeEnum
+from pycmdparse.parse_stats import ParseStats
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+try:
+    import click
+except ImportError:
+    click = None
+
+
+class CompareBench:
+    """
+    Compares pycmdparse with other command line parsers on equivalent specs. The
+    equivalent argparse, getopt, and - if it is installed - click parsers are built
+    automatically from the options that pycmdparse builds from the yaml, so the
+    comparison stays honest as the spec grows. The same command lines are parsed by
+    each parser.
+
+    getopt and click can't express every pycmdparse option: neither supports an
+    option taking several params, and getopt doesn't support types, defaults or
+    help. For these parsers, the extra params of a multi-valued option are parsed
+    as positional params. They are timed anyway - they are doing comparable work -
+    but their results are marked as not exact.
+    """
+
+    PARSERS = ["pycmdparse", "argparse", "getopt", "click"]
+    """The parsers compared"""
+
+    IMPORTS = {
+        "pycmdparse": "pycmdparse.cmdline",
+        "argparse": "argparse",
+        "getopt": "getopt",
+        "click": "click"
+    }
+    """The module to import to measure the import cost of each parser"""
+
+    @staticmethod
+    def run(yaml_def, corpus, min_time=0.2, import_runs=5):
+        """
+        Runs the comparison
+
+        :param yaml_def: a pycmdparse yaml spec
+        :param corpus: a list of command lines, each a list like sys.argv, that
+        pycmdparse parses successfully against the spec
+        :param min_time: each parse throughput measurement is repeated until at
+        least this many seconds have elapsed
+        :param import_runs: the number of fresh interpreters launched to measure
+        the import cost of each parser
+
+        :return: a dictionary, suitable for serializing as JSON, keyed by parser
+        name. Each entry has: import_ms (median import time in a fresh interpreter),
+        spec_build_ms (time to build the parser), parses_per_sec (parsing every
+        command line in the corpus counts as one parse per command line), help_ms
+        (time to render the help, or None), peak_memory_bytes (peak memory allocated
+        to build the parser and parse the corpus once), and exact (False if the
+        parser can't express the spec exactly)
+        """
+        cmdline = CompareBench._new_cmdline(yaml_def)
+        for args in corpus:
+            CompareBench._pycmdparse_parse(cmdline, args)
+        options = CmdLine._flatten(cmdline._supported_options)
+        exact = {
+            "pycmdparse": True,
+            "argparse": True,
+            "getopt": all(CompareBench._is_scalar(opt) and not opt.data_type
+                          for opt in options if not isinstance(opt, BoolOpt)),
+            "click": all(CompareBench._is_scalar(opt) for opt in options
+                         if not isinstance(opt, BoolOpt)),
+        }
+        builders = {
+            "pycmdparse": lambda: CompareBench._pycmdparse_build(cmdline),
+            "argparse": lambda: CompareBench.to_argparse(cmdline),
+            "getopt": lambda: CompareBench.to_getopt(cmdline),
+            "click": lambda: CompareBench.to_click(cmdline)
+        }
+        parsers = {
+            "pycmdparse": CompareBench._pycmdparse_parse,
+            "argparse": CompareBench._argparse_parse,
+            "getopt": CompareBench._getopt_parse,
+            "click": CompareBench._click_parse
+        }
+        helpers = {
+            "pycmdparse": CompareBench._pycmdparse_help,
+            "argparse": lambda p: p.format_help(),
+            "getopt": None,
+            "click": lambda p: p.get_help(click.Context(p))
+        }
+        results = {}
+        for name in CompareBench.PARSERS:
+            if name == "click" and not click:
+                results[name] = None
+                continue
+            results[name] = CompareBench._measure(
+                builders[name], parsers[name], helpers[name], corpus, min_time)
+            results[name]["import_ms"] = CompareBench.import_ms(
+                CompareBench.IMPORTS[name], import_runs)
+            results[name]["exact"] = exact[name]
+        return results
+
+    @staticmethod
+    def to_argparse(cmdline):
+        """
+        Builds an argparse parser equivalent to the spec of the passed CmdLine
+        subclass, which must already have been initialized from its yaml
+
+        :return: an argparse.ArgumentParser
+        """
+        parser = argparse.ArgumentParser(
+            prog=cmdline._utility_name, description=cmdline._summary,
+            add_help=False, conflict_handler="resolve")
+        types = {
+            DataTypeEnum.INT: int,
+            DataTypeEnum.DECIMAL: float,
+            DataTypeEnum.DATE: AbstractOpt._parse_date,
+            DataTypeEnum.BOOL: bool
+        }
+        for opt in CmdLine._flatten(cmdline._supported_options):
+            kwargs = {"dest": opt.opt_name, "help": opt.help_text,
+                      "required": bool(opt.required)}
+            if isinstance(opt, BoolOpt):
+                kwargs["action"] = "store_true"
+            else:
+                kwargs["metavar"] = opt.opt_hint
+                if opt.data_type:
+                    kwargs["type"] = types[opt.data_type]
+                if CompareBench._is_scalar(opt):
+                    kwargs["default"] = opt.default_value[0] \
+                        if opt.default_value else None
+                else:
+                    # 'extend' matches '-f A -f B' accumulating into one list
+                    kwargs["action"] = "extend" if sys.version_info >= (3, 8) \
+                        else "append"
+                    kwargs["nargs"] = opt.count \
+                        if opt.multi_type is MultiTypeEnum.EXACTLY else "+"
+                    kwargs["default"] = opt.default_value
+            parser.add_argument(*CompareBench._keys(opt), **kwargs)
+        if cmdline._positional_params:
+            parser.add_argument("positional_params", nargs="*",
+                                metavar=cmdline._positional_params.param_text)
+        return parser
+
+    @staticmethod
+    def to_getopt(cmdline):
+        """
+        Builds the getopt equivalent of the spec of the passed CmdLine subclass,
+        which must already have been initialized from its yaml
+
+        :return: a tuple: element zero is the getopt short options string, and
+        element one is the getopt long options list
+        """
+        short_opts = ""
+        long_opts = []
+        for opt in CmdLine._flatten(cmdline._supported_options):
+            takes_param = not isinstance(opt, BoolOpt)
+            if opt.short_key:
+                short_opts += opt.short_key + (":" if takes_param else "")
+            if opt.long_key:
+                long_opts.append(opt.long_key + ("=" if takes_param else ""))
+        return short_opts, long_opts
+
+    @staticmethod
+    def to_click(cmdline):
+        """
+        Builds the click equivalent of the spec of the passed CmdLine subclass,
+        which must already have been initialized from its yaml. Requires click to
+        be installed.
+
+        :return: a click.Command
+        """
+        if not click:
+            raise CmdLineException("click is not installed")
+        types = {
+            DataTypeEnum.INT: int,
+            DataTypeEnum.DECIMAL: float,
+            DataTypeEnum.DATE: AbstractOpt._parse_date,
+            DataTypeEnum.BOOL: bool
+        }
+        params = []
+        for opt in CmdLine._flatten(cmdline._supported_options):
+            kwargs = {"help": opt.help_text, "required": bool(opt.required)}
+            if isinstance(opt, BoolOpt):
+                kwargs["is_flag"] = True
+            else:
+                kwargs["metavar"] = opt.opt_hint
+                if opt.data_type:
+                    kwargs["type"] = types[opt.data_type]
+                if CompareBench._is_scalar(opt):
+                    kwargs["default"] = opt.default_value[0] \
+                        if opt.default_value else None
+                else:
+                    kwargs["multiple"] = True
+                    kwargs["default"] = opt.default_value
+            params.append(click.Option(CompareBench._keys(opt) + [opt.opt_name],
+                                       **kwargs))
+        params.append(click.Argument(["positional_params"], nargs=-1))
+        return click.Command(cmdline._utility_name, params=params,
+                             help=cmdline._summary)
+
+    @staticmethod
+    def import_ms(module, runs=5):
+        """
+        Measures the time to import the passed module in a fresh interpreter
+
+        :param module: the module to import
+        :param runs: the number of interpreters to launch
+
+        :return: the median time, in milliseconds
+        """
+        code = "import time\nt = time.perf_counter()\nimport {}\n" \
+               "print(time.perf_counter() - t)".format(module)
+        samples = []
+        for _ in range(runs):
+            completed = subprocess.run([sys.executable, "-c", code],
+                                       stdout=subprocess.PIPE, check=True)
+            samples.append(float(completed.stdout) * 1000)
+        return statistics.median(samples)
+
+    @staticmethod
+    def _measure(builder, parser, helper, corpus, min_time):
+        """
+        Measures one parser
+
+        :param builder: builds the parser
+        :param parser: parses one command line with the built parser. Returns the
+        number of seconds of the parse that were spent re-building the spec - which
+        are excluded from the parse throughput - or None
+        :param helper: renders the help for the built parser, or None
+        :param corpus: the command lines to parse
+        :param min_time: see 'run'
+
+        :return: a dictionary with spec_build_ms, parses_per_sec, help_ms and
+        peak_memory_bytes
+        """
+        tracemalloc.start()
+        try:
+            built = builder()
+            for args in corpus:
+                parser(built, args)
+            ignore, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        start = time.perf_counter()
+        built = builder()
+        spec_build = time.perf_counter() - start
+
+        parses = 0
+        excluded = 0.0
+        start = time.perf_counter()
+        while True:
+            for args in corpus:
+                excluded += parser(built, args) or 0.0
+            parses += len(corpus)
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+
+        help_ms = None
+        if helper:
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                helper(built)
+                help_ms = (time.perf_counter() - start) * 1000
+        return {
+            "spec_build_ms": spec_build * 1000,
+            "parses_per_sec": parses / (elapsed - excluded),
+            "help_ms": help_ms,
+            "peak_memory_bytes": peak
+        }
+
+    @staticmethod
+    def _new_cmdline(yaml_def):
+        class CompareCmdLine(CmdLine):
+            pass
+        CompareCmdLine.yaml_def = yaml_def
+        return CompareCmdLine
+
+    @staticmethod
+    def _pycmdparse_build(cmdline):
+        cmdline.reset()
+        cmdline._init_from_yaml()
+        return cmdline
+
+    @staticmethod
+    def _pycmdparse_parse(cmdline, args):
+        """
+        Parses the passed args with pycmdparse. pycmdparse builds the spec as part
+        of every parse, so to compare like with like the parse is timed with a
+        ParseStats object, and the spec build time is returned to be excluded from
+        the parse throughput. (It is reported separately as spec_build_ms.)
+
+        :return: the seconds spent building the spec
+        """
+        cmdline.reset()
+        stats = ParseStats()
+        cmdline.parse_settings = cmdline.parse_settings.replace(stats=stats)
+        parse_result = cmdline.parse(args)
+        if parse_result is not ParseResultEnum.SUCCESS:
+            raise CmdLineException("pycmdparse could not parse {}: {}".format(
+                args, cmdline.parse_errors))
+        return stats.phases[ParseStats.SPEC_LOAD]
+
+    @staticmethod
+    def _argparse_parse(parser, args):
+        parser.parse_args(args[1:])
+
+    @staticmethod
+    def _getopt_parse(parser, args):
+        getopt.gnu_getopt(args[1:], parser[0], parser[1])
+
+    @staticmethod
+    def _click_parse(parser, args):
+        parser.make_context(args[0], args[1:])
+
+    @staticmethod
+    def _pycmdparse_help(cmdline):
+        # time the layout, as for the other parsers - not a cache hit
+        HelpCache.clear()
+        cmdline.show_usage()
+
+    @staticmethod
+    def _is_scalar(opt):
+        """
+        :return: True if the passed ParamOpt takes exactly one param
+        """
+        return opt.multi_type is MultiTypeEnum.EXACTLY and opt.count == 1
+
+    @staticmethod
+    def _keys(opt):
+        """
+        :return: the option keys, as a list. E.g. ['-f', '--file']
+        """
+        keys = []
+        if opt.short_key:
+            keys.append("-" + opt.short_key)
+        if opt.long_key:
+            keys.append("--" + opt.long_key)
+        return keys
+
+
+class CompareCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: python -m pycmdparse.bench.compare_bench
+
+    summary: >
+      Compares pycmdparse with argparse, getopt and click (if installed) on
+      equivalent specs, built automatically from a pycmdparse yaml spec.
+      Reports import cost, spec build cost, parse throughput, help rendering
+      time, and peak memory as JSON.
+
+    supported_options:
+      - category:
+        options:
+        - name      : spec
+          short     : s
+          long      : spec
+          hint      : file
+          help: >
+            A file containing a pycmdparse yaml spec. If omitted, then a spec is
+            generated, with the number of options specified by --options.
+        - name      : corpus
+          short     : c
+          long      : corpus
+          hint      : file
+          help: >
+            A file containing the command lines to parse, one per line, starting
+            with the utility name. Required with --spec. If omitted, then a
+            command line is generated for the generated spec, with the number of
+            tokens specified by --tokens.
+        - name      : option_count
+          short     : o
+          long      : options
+          hint      : n
+          datatype  : int
+          default   : 100
+          help: >
+            The number of options in the generated spec.
+        - name      : token_count
+          short     : t
+          long      : tokens
+          hint      : n
+          datatype  : int
+          default   : 100
+          help: >
+            The number of tokens in the generated command line.
+        - name      : min_time
+          short     : m
+          long      : min-time
+          hint      : seconds
+          datatype  : decimal
+          default   : 0.2
+          help: >
+            Each parse throughput measurement is repeated until at least this
+            much time has elapsed.
+        - name      : import_runs
+          long      : import-runs
+          hint      : n
+          datatype  : int
+          default   : 5
+          help: >
+            The number of fresh interpreters launched to time each import.
+    '''
+
+    spec = None
+    corpus = None
+    option_count = None
+    token_count = None
+    min_time = None
+    import_runs = None
+
+
+def main(argv):
+    parse_result = CompareCmdLine.parse(argv)
+    if parse_result.value != ParseResultEnum.SUCCESS.value:
+        CompareCmdLine.display_info(parse_result)
+        return 1
+    if CompareCmdLine.spec:
+        if not CompareCmdLine.corpus:
+            print("--corpus is required with --spec")
+            return 1
+        with open(CompareCmdLine.spec) as f:
+            yaml_def = f.read()
+        with open(CompareCmdLine.corpus) as f:
+            corpus = [shlex.split(line) for line in f if line.strip()]
+    else:
+        yaml_def = SpecGenerator.yaml_spec(CompareCmdLine.option_count)
+        corpus = [SpecGenerator.option_args(CompareCmdLine.option_count,
+                                            CompareCmdLine.token_count)]
+    results = CompareBench.run(yaml_def, corpus, CompareCmdLine.min_time,
+                               CompareCmdLine.import_runs)
+    json.dump(results, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,258 @@
+import platform
+import time
+import tracemalloc
+
+import yaml
+
+from pycmdparse.bench.spec_generator import SpecGenerator
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.opt_category import OptCategory
+from pycmdparse.opt_factory import OptFactory
+from pycmdparse.parse_settings import ParseSettings
+from pycmdparse.parse_stats import ParseStats
+from pycmdparse.parseresult_enum import ParseResultEnum
+from pycmdparse.util import Util
+
+
+class MicroBench:
+    """
+    Micro-benchmarks for the parse hot path. Each benchmark case generates a spec
+    with a given number of options (see SpecGenerator), and a command line with a
+    given number of tokens, then parses the command line repeatedly, timing each
+    phase with a ParseStats object.
+    """
+
+    SCENARIOS = ["options", "positional"]
+    """
+    options   : the command line consists of options and option params
+    positional: the command line is one option, then a long positional tail
+    """
+
+    HOT_PHASES = [ParseStats.TOKENIZE, ParseStats.DISPATCH,
+                  ParseStats.FINAL_VALIDATE, ParseStats.VALIDATOR,
+                  ParseStats.ADD_FIELDS]
+    """The phases whose cost scales with the command line, rather than the spec"""
+
+    @staticmethod
+    def run(option_counts, token_counts, scenarios=None, min_time=0.2,
+            allocations=True):
+        """
+        Runs every combination of the passed scenarios, option counts and token
+        counts.
+
+        :param option_counts: a list of option counts. E.g. [10, 100, 1000]
+        :param token_counts: a list of command line token counts
+        :param scenarios: a list of scenarios from MicroBench.SCENARIOS. If None,
+        then all scenarios are run
+        :param min_time: each case is repeated until at least this many seconds
+        have elapsed (and at least once)
+        :param allocations: if True, measure memory allocated during a parse
+
+        :return: a dictionary, suitable for serializing as JSON, with environment
+        information, and a 'results' list holding one dictionary per case. (See
+        'run_case')
+        """
+        results = []
+        for scenario in scenarios if scenarios else MicroBench.SCENARIOS:
+            for option_count in option_counts:
+                for token_count in token_counts:
+                    results.append(MicroBench.run_case(
+                        scenario, option_count, token_count, min_time, allocations))
+        return {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "results": results
+        }
+
+    @staticmethod
+    def run_case(scenario, option_count, token_count, min_time=0.2,
+                 allocations=True):
+        """
+        Runs a single benchmark case
+
+        :param scenario: one of MicroBench.SCENARIOS
+        :param option_count: the number of options in the generated spec
+        :param token_count: the number of tokens on the generated command line
+        :param min_time: see 'run'
+        :param allocations: see 'run'
+
+        :return: a dictionary with the case parameters and these results:
+        ops_per_sec (complete parses, including spec load, per second), ns_per_token
+        (time spent in the hot phases per token), phases (mean seconds per parse in
+        each phase), and - if requested - alloc_peak_bytes and alloc_retained_bytes
+        (memory allocated during one parse, and still allocated at its end)
+        """
+        if scenario not in MicroBench.SCENARIOS:
+            raise CmdLineException("Unknown scenario: {}".format(scenario))
+        positional = scenario == "positional"
+        cmdline = MicroBench._new_cmdline(
+            SpecGenerator.yaml_spec(option_count, positional))
+        args = SpecGenerator.positional_args(token_count) if positional \
+            else SpecGenerator.option_args(option_count, token_count)
+        stats = cmdline.parse_settings.stats
+
+        MicroBench._parse(cmdline, args)  # warm up, and verify the parse succeeds
+        stats.reset()
+        iterations = 0
+        start = time.perf_counter()
+        while True:
+            MicroBench._parse(cmdline, args)
+            iterations += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+
+        tokens = len(args) - 1
+        hot = sum(stats.phases[phase] for phase in MicroBench.HOT_PHASES)
+        result = {
+            "scenario": scenario,
+            "options": option_count,
+            "tokens": tokens,
+            "iterations": iterations,
+            "seconds": elapsed,
+            "ops_per_sec": iterations / elapsed,
+            "ns_per_token": hot / iterations / tokens * 1e9 if tokens else None,
+            "phases": {phase: stats.phases[phase] / iterations
+                       for phase in ParseStats.PHASES}
+        }
+        if allocations:
+            result.update(MicroBench._allocations(cmdline, args))
+        return result
+
+    @staticmethod
+    def option_memory(option_count):
+        """
+        Measures the memory held by the option objects of a spec - excluding the
+        yaml parsing, and the strings shared with the parsed yaml
+
+        :param option_count: the number of options in the generated spec
+
+        :return: a dictionary with the option count, the total bytes allocated to
+        build the options, and the bytes per option
+        """
+        parsed = yaml.load(SpecGenerator.yaml_spec(option_count),
+                           Loader=yaml.FullLoader)
+        option_dicts = parsed["supported_options"][0]["options"]
+        tracemalloc.start()
+        try:
+            category = OptCategory(None)
+            for opt_dict in option_dicts:
+                category.options.append(OptFactory.create_option(opt_dict))
+            current, ignore = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {
+            "options": option_count,
+            "bytes": current,
+            "bytes_per_option": current / option_count
+        }
+
+    @staticmethod
+    def wrap(size, width=80, min_time=0.2):
+        """
+        Measures the word-wrapping of help text, as done when rendering usage
+        instructions (See 'Util.split_string')
+
+        :param size: the length of the generated help text, in characters
+        :param width: the width to wrap the text to
+        :param min_time: see 'run'
+
+        :return: a dictionary with the text size and wrap width, the number of
+        segments produced, and the mean seconds and the megabytes per second to
+        wrap the text
+        """
+        text = SpecGenerator.help_text(size)
+        iterations = 0
+        start = time.perf_counter()
+        while True:
+            segments = Util.split_string(text, width)
+            iterations += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        return {
+            "bytes": len(text),
+            "width": width,
+            "segments": len(segments),
+            "seconds": elapsed / iterations,
+            "mb_per_sec": len(text) * iterations / elapsed / (1 << 20)
+        }
+
+    @staticmethod
+    def compare(baseline, current, threshold=0.1):
+        """
+        Compares two sets of results produced by 'run' - e.g. from two releases.
+
+        :param baseline: the results to compare against
+        :param current: the new results
+        :param threshold: the fractional slowdown in ops_per_sec above which a case
+        is reported as a regression. E.g. 0.1 is ten percent
+
+        :return: a list of dictionaries - one for each case present in both sets
+        of results - with the case parameters, the 'ratio' of current to baseline
+        ops_per_sec, and 'regression', which is True if the slowdown exceeds the
+        threshold
+        """
+        def key(r):
+            return r["scenario"], r["options"], r["tokens"]
+
+        baseline_results = {key(r): r for r in baseline["results"]}
+        to_return = []
+        for r in current["results"]:
+            b = baseline_results.get(key(r))
+            if not b:
+                continue
+            ratio = r["ops_per_sec"] / b["ops_per_sec"]
+            to_return.append({
+                "scenario": r["scenario"],
+                "options": r["options"],
+                "tokens": r["tokens"],
+                "ratio": ratio,
+                "regression": ratio < 1 - threshold
+            })
+        return to_return
+
+    @staticmethod
+    def _new_cmdline(yaml_def):
+        """
+        :return: a new CmdLine subclass initialized with the passed yaml, and a
+        ParseStats object
+        """
+        class BenchCmdLine(CmdLine):
+            pass
+        BenchCmdLine.yaml_def = yaml_def
+        BenchCmdLine.parse_settings = ParseSettings(stats=ParseStats())
+        return BenchCmdLine
+
+    @staticmethod
+    def _parse(cmdline, args):
+        """
+        Parses the passed args with the passed CmdLine subclass, resetting it first
+        so each parse starts from the same state
+
+        :raises: CmdLineException if the parse doesn't succeed, since that would
+        invalidate the benchmark
+        """
+        cmdline.reset()
+        parse_result = cmdline.parse(args)
+        if parse_result is not ParseResultEnum.SUCCESS:
+            raise CmdLineException("Benchmark parse failed: {}"
+                                   .format(cmdline.parse_errors))
+
+    @staticmethod
+    def _allocations(cmdline, args):
+        """
+        Measures the memory allocated by one parse
+
+        :return: a dictionary with alloc_peak_bytes and alloc_retained_bytes
+        """
+        cmdline.reset()
+        tracemalloc.start()
+        try:
+            cmdline.parse(args)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {"alloc_peak_bytes": peak, "alloc_retained_bytes": current}
@@ -0,0 +1,144 @@
+class SpecGenerator:
+    """
+    Generates synthetic yaml specs, and command lines to parse against them, for
+    benchmarking. Options cycle through four kinds, so every spec contains a mix of:
+
+    bool  : a BoolOpt                                   e.g. --opt0
+    param : a ParamOpt taking exactly one param         e.g. --opt1 VAL
+    multi : a no-limit ParamOpt                         e.g. --opt2 V V V
+    typed : a no-limit ParamOpt with an 'int' data type e.g. --opt3 1 2 3
+    """
+
+    KINDS = ["bool", "param", "multi", "typed"]
+    """The kinds of options generated, in the order they are generated"""
+
+    GROUP_SIZE = 8
+    """The number of params supplied each time a multi-valued option is repeated"""
+
+    @staticmethod
+    def kind_of(index):
+        """
+        :param index: the zero-relative index of a generated option
+
+        :return: the kind of the option at the passed index - one of
+        SpecGenerator.KINDS
+        """
+        return SpecGenerator.KINDS[index % len(SpecGenerator.KINDS)]
+
+    @staticmethod
+    def yaml_spec(option_count, positional=False):
+        """
+        Generates a yaml spec
+
+        :param option_count: the number of options to define. If less than the
+        number of option kinds, then the option kinds are not all represented
+        :param positional: if True, then the spec defines positional params
+
+        :return: the yaml, as a string
+        """
+        lines = ["utility:", "  name: bench", "summary: >",
+                 "  A generated spec with {} options".format(option_count)]
+        if positional:
+            lines.extend(["positional_params:", "  params: FILE ...",
+                          "  text: The files to process"])
+        lines.extend(["supported_options:", "  - category: Generated",
+                      "    options:"])
+        for i in range(option_count):
+            kind = SpecGenerator.kind_of(i)
+            lines.append("    - long: opt{}".format(i))
+            if kind == "bool":
+                lines.append("      opt: bool")
+            else:
+                lines.append("      opt: param")
+                lines.append("      hint: val")
+                if kind in ["multi", "typed"]:
+                    lines.append("      multi_type: no-limit")
+                if kind == "typed":
+                    lines.append("      datatype: int")
+            lines.append("      help: Generated {} option number {}".format(kind, i))
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def option_args(option_count, token_count):
+        """
+        Generates a command line consisting only of options and their params. Each
+        bool and single-param option is used once, then the multi-valued options
+        are repeated - in groups of GROUP_SIZE params - until the requested number
+        of tokens is reached.
+
+        :param option_count: the number of options in the spec (see 'yaml_spec')
+        :param token_count: the number of tokens to generate, not counting the
+        utility name. The result may be a few tokens short, since an option
+        is never separated from its params
+
+        :return: the command line as a list, like sys.argv
+        """
+        args = ["bench"]
+        limit = token_count + 1
+        multi = []
+        for i in range(option_count):
+            kind = SpecGenerator.kind_of(i)
+            if kind == "bool" and len(args) < limit:
+                args.append("--opt{}".format(i))
+            elif kind == "param" and len(args) + 1 < limit:
+                args.extend(["--opt{}".format(i), "val"])
+            elif kind in ["multi", "typed"]:
+                multi.append(i)
+        cur = 0
+        while multi and len(args) + 1 < limit:
+            i = multi[cur % len(multi)]
+            cur += 1
+            args.append("--opt{}".format(i))
+            count = min(SpecGenerator.GROUP_SIZE, limit - len(args))
+            if SpecGenerator.kind_of(i) == "typed":
+                # start at one: a param that converts to zero fails validation
+                args.extend(str(n) for n in range(1, count + 1))
+            else:
+                args.extend("val{}".format(n) for n in range(count))
+        return args
+
+    @staticmethod
+    def positional_args(token_count):
+        """
+        Generates a command line consisting of one option, then '--', then a long
+        tail of positional params
+
+        :param token_count: the number of tokens to generate, not counting the
+        utility name
+
+        :return: the command line as a list, like sys.argv
+        """
+        args = ["bench", "--opt0", "--"]
+        args.extend("file{}".format(n) for n in range(max(token_count - 2, 0)))
+        return args
+
+    @staticmethod
+    def help_text(size):
+        """
+        Generates help text like a long 'details' or 'addendum' section - e.g. an
+        embedded changelog - with short lines of words of varying length, indented
+        list items, blank lines, and long paragraphs, as yaml produces from a
+        folded ('>') block.
+
+        :param size: the approximate length of the text, in characters
+
+        :return: the text, as a string
+        """
+        words = ["the", "parser", "option", "now", "accepts", "a", "configurable",
+                 "number", "of", "params", "and", "reports", "errors", "in",
+                 "one-pass", "--long-option-name", "for", "each", "release"]
+        lines = []
+        length = 0
+        i = 0
+        while length < size:
+            if i % 7 == 6:
+                line = ""
+            else:
+                count = 200 + i * 37 % 1000 if i % 7 == 5 else 5 + i % 30
+                line = " ".join(words[(i + j) % len(words)] for j in range(count))
+                if i % 7 in [3, 4]:
+                    line = "  - " + line
+            lines.append(line)
+            length += len(line) + 1
+            i += 1
+        return "\n".join(lines)
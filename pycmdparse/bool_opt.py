@@ -22,11 +22,20 @@ class BoolOpt(AbstractOpt):
     positional parameters, then it would be a parse error: Unsupported option.
     """
 
+    __slots__ = ()
+
+    FLAG_VALUES = {"true": True, "yes": True, "on": True, "1": True,
+                   "false": False, "no": False, "off": False, "0": False}
+    """
+    The values of an environment variable - or config file entry - that set the
+    option. Case-insensitive
+    """
+
     def __init__(self, opt_name, short_key, long_key, opt_hint, required, is_internal,
-                 help_text):
+                 help_text, env_name=None):
         # super init sets object value to False, and sets initialized to True
         super().__init__(opt_name, short_key, long_key, opt_hint, required,
-                         is_internal, False, DataTypeEnum.BOOL, help_text)
+                         is_internal, False, DataTypeEnum.BOOL, help_text, env_name)
 
     @property
     def value(self):
@@ -45,11 +54,54 @@ class BoolOpt(AbstractOpt):
 
         if self._supplied_key:
             return OptAcceptResultEnum.ERROR,\
-                   "Option {} already specified once".format(self._supplied_key)
+                   "Option {} already specified once", self._supplied_key
         self._supplied_key = stack.pop()
         self._value = True
         self._from_cmdline = True
         return OptAcceptResultEnum.ACCEPTED,
 
+    def accept_env(self, value):
+        """
+        Sets the option from its environment variable. E.g. "MY_UTIL_VERBOSE=yes"
+        is the same as "--verbose" on the command line. (See BoolOpt.FLAG_VALUES)
+
+        :param value: the value of the variable
+
+        :return: OptAcceptResultEnum.ACCEPTED if the value is true or false. Else
+        returns OptAcceptResultEnum.ERROR
+        """
+        return self._accept_flag("$" + self._env_name, value)
+
+    def accept_config(self, value, path):
+        """
+        Sets the option from a config file. The value can be a bool, or one of
+        BoolOpt.FLAG_VALUES
+
+        :param value: the value in the file
+        :param path: the path of the config file
+
+        :return: see 'accept_env'
+        """
+        return self._accept_flag("{} in {}".format(self._opt_name, path), value)
+
+    def _accept_flag(self, supplied_key, value):
+        """
+        Sets the option from a value supplied other than on the command line
+
+        :param supplied_key: describes where the value was supplied, for errors
+        :param value: the value
+
+        :return: see 'accept_env'
+        """
+        self._supplied_key = supplied_key
+        flag = value if isinstance(value, bool) \
+            else BoolOpt.FLAG_VALUES.get(str(value).strip().lower())
+        if flag is None:
+            return OptAcceptResultEnum.ERROR, \
+                "{}: expected true or false but found '{}'", supplied_key, value
+        # set, but not from the command line - whether true or false
+        self._value = flag
+        return OptAcceptResultEnum.ACCEPTED,
+
     def do_final_validate(self):
         return OptAcceptResultEnum.ACCEPTED,
@@ -1,14 +1,33 @@
+import itertools
+import json
+import os
+import shlex
+
 import yaml
 
+from pycmdparse.arg_file_exception import ArgFileException
 from pycmdparse.class_property import classproperty, classproperty_support
 from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.config_cache import ConfigCache
+from pycmdparse.datatype_enum import DataTypeEnum
+from pycmdparse.errorkind_enum import ErrorKindEnum
+from pycmdparse.help_cache import HelpCache
+from pycmdparse.help_index import HelpIndex
 from pycmdparse.opt_acceptresult_enum import OptAcceptResultEnum
 from pycmdparse.opt_category import OptCategory
-from pycmdparse.opt_factory import OptFactory
+from pycmdparse.opt_spec import OptSpec
+from pycmdparse.opt_table import OptTable
+from pycmdparse.option_values import OptionValues
+from pycmdparse.parse_error import ParseError
+from pycmdparse.parse_info import ParseInfo
+from pycmdparse.parse_settings import ParseSettings
+from pycmdparse.parse_stats import ParseStats
 from pycmdparse.parseresult_enum import ParseResultEnum
+from pycmdparse.plugin_index import PluginIndex
 from pycmdparse.positional_params import PositionalParams
 from pycmdparse.showinfo import ShowInfo
 from pycmdparse.splitter import Splitter
+from pycmdparse.subcommand import Subcommand
 from pycmdparse.usage_example import UsageExample
 
 
@@ -32,6 +51,13 @@ class CmdLine:
     yaml_def = None
     """A yaml string that defines the parsing rqts. and usage instructions"""
 
+    parse_settings = ParseSettings()
+    """
+    The settings that tune parsing and usage instructions - e.g. whether to collect
+    all the errors on the command line, or a cache directory. A ParseSettings
+    object. Assign a new one in the subclass to change them
+    """
+
     _utility_name = None
     """The name of the program or utility that is importing the module"""
 
@@ -68,6 +94,55 @@ class CmdLine:
     command line. After successful command-line parsing, the enclosing utility code
     would be able to rely on the existence of a field named 'filename' in this class
     having value '/my-file.tar'.
+
+    The option objects in a category are only created when its 'options' are first
+    read. (See '_opt_table'.)
+    """
+
+    _opt_table = None
+    """
+    The supported options, as an OptTable: the option specs, indexed by key, name,
+    and env name. An option object is only created when the option is referenced,
+    so parsing doesn't create the options that aren't used
+    """
+
+    _env_options = None
+    """
+    Maps the name of each environment variable defined by an option's "env" entry
+    to the index of the option in '_opt_table' - so options not on the command line
+    can be looked up in the environment with one lookup each. Built with the options
+    """
+
+    _subcommands = None
+    """
+    The subcommands defined by the spec's "subcommands" section - Subcommand
+    objects, keyed by name - or None. The first positional token on the command
+    line names the subcommand, and the args after it are parsed by the
+    subcommand's CmdLine subclass
+    """
+
+    _subcommand = None
+    """
+    The Subcommand named on the command line by the last parse - or None. (See
+    ParseInfo.subcommand)
+    """
+
+    _subcommand_position = None
+    """
+    Set while parsing: the index of the subcommand name on the tokenized command
+    line, counting the utility name as token zero - or None if it wasn't reached
+    """
+
+    _passthrough = None
+    """
+    The args on the command line that the last 'parse_known' didn't recognize - a
+    list - or None if the last parse was by 'parse'. (See ParseInfo.passthrough)
+    """
+
+    _known_args = None
+    """
+    Set while 'parse_known' parses: a tuple of the command line, as a list, and the
+    index in it of the arg each token came from. (See Splitter.arg_indices)
     """
 
     _details = None
@@ -88,28 +163,75 @@ class CmdLine:
     author information, Github URL, website URLs, etc.
     """
 
+    _raw_spec = None
+    """
+    The yaml spec as loaded by the yaml parser - a dictionary - from which the other
+    fields are initialized, and from which usage instructions are rendered
+    """
+
+    _help_options = ["-h", "--help"]
+    """The options that request usage instructions - compared case-insensitively"""
+
+    _help_category_option = "--help-category"
+    """
+    As the first arg, requests the help for one category of options. Unless the
+    spec defines an option with this long key
+    """
+
+    _help_query = None
+    """
+    Set by 'parse' when the first arg requests help: a tuple of the help option
+    ("--help", or "--help-category") and its argument - e.g. a search term - or None
+    """
+
+    _result = None
+    """
+    The option values of the last successful parse - an OptionValues object. (See
+    'result')
+    """
+
+    _reserved_names = None
+    """
+    The names of the CmdLine attributes - and of the private OptionValues attributes
+    - as a frozenset. Option fields can't have these names. Built on first use
+    """
+
     _parse_errors = None
     """
     Initialized by the parser with any errors encountered during
-    command-line parsing
+    command-line parsing. A list of ParseError objects
     """
 
     # noinspection PyMethodParameters
     @classproperty
     def parse_errors(cls):
         """
-        :return:  the parse errors as a list. Could be empty. Never None
+        :return:  the parse error messages as a list of strings. Could be empty.
+        Never None
         """
-        return cls._parse_errors
+        return [error.message for error in cls._parse_errors] \
+            if cls._parse_errors else []
 
     # noinspection PyMethodParameters
     @classproperty
     def positional_params(cls):
         """
-        :return:  the positional params as a list. Could be empty. Never None
+        :return:  the positional params as a list. Could be empty. Never None. If
+        the spec reads the params from stdin, and none were supplied on the command
+        line, then an iterator that yields the params as they are read
         """
         return cls._positional_params.params if cls._positional_params else []
 
+    # noinspection PyMethodParameters
+    @classproperty
+    def parse_info(cls):
+        """
+        :return: a ParseInfo object, reading what the last parse found beyond the
+        option fields: the errors, the option values as one object, the subcommand,
+        and the args passed through
+        """
+        return ParseInfo(cls)
+
     @classmethod
     def reset(cls):
         """
@@ -117,6 +239,13 @@ class CmdLine:
         """
         cls._positional_params = None
         cls._supported_options = None
+        cls._opt_table = None
+        cls._env_options = None
+        cls._subcommands = None
+        cls._subcommand = None
+        cls._subcommand_position = None
+        cls._passthrough = None
+        cls._known_args = None
         cls._details = None
         cls._addendum = None
         cls._examples = None
@@ -124,7 +253,10 @@ class CmdLine:
         cls._summary = None
         cls._utility_name = None
         cls._require_args = None
+        cls._raw_spec = None
+        cls._help_query = None
         cls._parse_errors = None
+        cls._result = None
         # don't reset the yaml def - it might be being reused for a test
 
     @classmethod
@@ -138,11 +270,7 @@ class CmdLine:
 
         :return: the option object if one exists by the passed name, else None
         """
-        flattened_options = CmdLine._flatten(cls._supported_options)
-        for opt in flattened_options:
-            if opt.opt_name == option_name:
-                return opt
-        return None
+        return cls._opt_table.get(option_name) if cls._opt_table else None
 
     @classmethod
     def display_info(cls, parse_result):
@@ -155,21 +283,199 @@ class CmdLine:
 
         :param parse_result: the result of a prior command line parse operation
         """
+        if cls._subcommand:
+            # the subcommand's args were parsed - and the result returned - by its
+            # CmdLine subclass
+            cls._subcommand.cmdline.display_info(parse_result)
+            return
         if parse_result in [ParseResultEnum.PARSE_ERROR,
                             ParseResultEnum.MISSING_MANDATORY_ARG]:
             if cls._parse_errors and len(cls._parse_errors) > 0:
                 ShowInfo.show_errors(cls._parse_errors, cls._utility_name)
         elif parse_result is ParseResultEnum.SHOW_USAGE:
-            cls.show_usage()
+            option, arg = cls._help_query if cls._help_query else (None, None)
+            if option == CmdLine._help_category_option:
+                cls._show_category_help(arg)
+            elif arg:
+                cls._show_option_help(arg)
+            else:
+                cls.show_usage()
 
     @classmethod
     def show_usage(cls):
         """
-        Shows full usage instructions (mainly to support test)
+        Shows full usage instructions. The instructions are rendered from the raw
+        yaml spec, so the options don't need to have been built - and so can be
+        shown without calling 'parse'. The rendered instructions are cached by spec
+        and console width (see HelpCache) so they are only laid out once.
+        """
+        if not cls.yaml_def:
+            return
+        settings = cls.parse_settings
+        width = ShowInfo.terminal_width()
+        spec_hash = cls._usage_hash()
+        cached = HelpCache.get(spec_hash, width, settings.cache_dir)
+        if cached:
+            if settings.use_pager:
+                ShowInfo.show_lines(cached[0].split("\n")[:-1], True)
+            else:
+                ShowInfo.write(cached[0])
+            return
+        parsed = cls._raw_spec if cls._raw_spec is not None else cls._load_spec()
+        text = ShowInfo.show_lines(CmdLine._usage_lines(
+            parsed, width, cls._plugin_subcommands(parsed)), settings.use_pager)
+        if text is not None:
+            HelpCache.put(spec_hash, width, text, cls._accepts_help(parsed),
+                          settings.cache_dir)
+
+    @classmethod
+    def _show_option_help(cls, term):
+        """
+        Shows the help for the options whose keys, hint, or help text match the
+        passed search term. (See HelpIndex.search.) Requested on the command line by
+        '--help=<term>'.
+
+        :param term: the search term
+        """
+        selected = cls._help_index().search(term)
+        if selected:
+            ShowInfo.show_lines(ShowInfo.option_lines(
+                "Options matching '{}':".format(term), selected,
+                ShowInfo.terminal_width()), cls.parse_settings.use_pager)
+        else:
+            ShowInfo.write("\nNo options match '{}'\n".format(term))
+
+    @classmethod
+    def _show_category_help(cls, name=None):
+        """
+        Shows the help for the options in one category. If the category doesn't
+        exist - or no category is passed - then lists the categories. Requested on
+        the command line by '--help-category <name>'.
+
+        :param name: the category name
         """
-        ShowInfo.show_usage(cls._utility_name, cls._summary, cls._usage,
-                            cls._supported_options, cls._details, cls._examples,
-                            cls._positional_params, cls._addendum)
+        index = cls._help_index()
+        selected = index.category(name) if name else None
+        if selected:
+            ShowInfo.show_lines(ShowInfo.option_lines(
+                "Options and parameters:", selected, ShowInfo.terminal_width()),
+                cls.parse_settings.use_pager)
+            return
+        text = "\nUnknown help category: '{}'\n".format(name) if name else ""
+        text += "\nHelp categories:\n\n"
+        for category_name in index.category_names:
+            text += "{}\n".format(category_name)
+        ShowInfo.write(text)
+
+    @classmethod
+    def _help_index(cls, parsed=None):
+        """
+        Gets the HelpIndex for the spec from the help cache - or builds it, and adds
+        it to the cache.
+
+        :param parsed: the yaml spec, as loaded by the yaml parser, or None to use
+        the spec loaded by the last parse - or load it
+
+        :return: the index
+        """
+        spec_hash = HelpCache.spec_hash(cls.yaml_def)
+        index = HelpCache.get_index(spec_hash, cls.parse_settings.cache_dir)
+        if index is None:
+            if parsed is None:
+                parsed = cls._raw_spec if cls._raw_spec is not None \
+                    else cls._load_spec()
+            index = HelpIndex.from_spec(parsed)
+            HelpCache.put_index(spec_hash, index, cls.parse_settings.cache_dir)
+        return index
+
+    @classmethod
+    def _usage_hash(cls):
+        """
+        :return: the hash under which the usage instructions are cached - of the
+        spec, and of the plugin subcommands listed with it
+        """
+        plugins = cls._plugins()
+        return HelpCache.spec_hash(cls.yaml_def + json.dumps(plugins, sort_keys=True)
+                                   if plugins else cls.yaml_def)
+
+    @classmethod
+    def _plugins(cls):
+        """
+        :return: the index of the plugin subcommands - see PluginIndex.load - or an
+        empty dictionary if 'plugin_group' isn't set
+        """
+        settings = cls.parse_settings
+        return PluginIndex.load(settings.plugin_group, settings.cache_dir) \
+            if settings.plugin_group else {}
+
+    @classmethod
+    def _plugin_subcommands(cls, parsed):
+        """
+        Gets the plugin subcommands to list in the usage instructions. Listing a
+        plugin imports its module, and loads its spec for its summary. A plugin
+        that can't be loaded is listed without a summary - the error is reported if
+        it's used.
+
+        :param parsed: the yaml spec, as loaded by the yaml parser. Plugins having
+        the name of a subcommand in the spec aren't listed
+
+        :return: a list of Subcommand objects, by name
+        """
+        plugins = cls._plugins()
+        if not plugins:
+            return []
+        names = {sub_dict.get("name") for sub_dict in parsed.get("subcommands") or []
+                 if isinstance(sub_dict, dict)}
+        subcommands = []
+        for name in sorted(plugins):
+            if name in names:
+                continue
+            sub_dict = {"name": name, "cmdline": plugins[name]}
+            try:
+                spec = Subcommand(sub_dict, cls).cmdline._load_spec()
+                sub_dict["summary"] = spec.get("summary") \
+                    if isinstance(spec, dict) else None
+            except Exception:
+                pass
+            subcommands.append(Subcommand(sub_dict, cls))
+        return subcommands
+
+    @staticmethod
+    def _usage_lines(parsed, width, plugins=None):
+        """
+        Renders usage instructions from the raw yaml spec. Options are represented
+        by OptSpec objects, rather than by the objects used to parse the command
+        line.
+
+        :param parsed: the yaml spec, as loaded by the yaml parser
+        :param width: the console width to wrap the instructions to
+        :param plugins: Subcommand objects for the plugin subcommands, listed after
+        the subcommands in the spec
+
+        :return: a generator of the lines of the instructions. (See
+        ShowInfo.usage_lines)
+        """
+        utility = parsed.get("utility")
+        supported_options = None
+        if parsed.get("supported_options"):
+            supported_options = []
+            for category in parsed.get("supported_options"):
+                opt_cat = OptCategory(category.get("category"))
+                for opt in category.get("options"):
+                    opt_cat.options.append(OptSpec(opt))
+                supported_options.append(opt_cat)
+        positional_params = PositionalParams(parsed.get("positional_params")) \
+            if parsed.get("positional_params") else None
+        examples = [UsageExample(example) for example in parsed.get("examples")] \
+            if parsed.get("examples") else None
+        # listed from the root spec - the subcommands' own specs aren't loaded
+        subcommands = [Subcommand(sub_dict) for sub_dict in parsed.get("subcommands")
+                       or []] + (plugins or [])
+        return ShowInfo.usage_lines(utility.get("name") if utility else None,
+                                    parsed.get("summary"), parsed.get("usage"),
+                                    supported_options, parsed.get("details"),
+                                    examples, positional_params,
+                                    parsed.get("addendum"), width, subcommands)
 
     @classmethod
     def parse(cls, cmd_line):
@@ -186,111 +492,552 @@ class CmdLine:
         sys.argv. The first element is expected to be the invoking utility name.
         This element is ignored by the parser.
 
+        If the spec defines subcommands, then the first positional token names the
+        subcommand, and the args after it - as they are on the command line - are
+        parsed by the subcommand's CmdLine subclass. (See '_parse_subcommand'.)
+
         :return: a ParseResultEnum, indicating the results of the command-line parse.
+        If a subcommand was parsed, then the result of its parse
+        """
+        return cls._parse_command_line(cmd_line, False)
+
+    @classmethod
+    def parse_known(cls, cmd_line):
         """
-        cls._init_from_yaml()
+        Parses the command line like 'parse' - except that args the spec doesn't
+        support are passed through, rather than being errors. E.g. for a wrapper that
+        passes the args it doesn't know to a child process. The passed through args
+        are available from the 'passthrough' class property, in order, as they are
+        on the command line - so the child's command line can be built from them as
+        is. These are passed through:
+
+        1) An unsupported option. If it's the first token of its arg, then the whole
+           arg - e.g. '-abc' or '--x=y'. Otherwise - e.g. '-x' in '-vx', when '-v'
+           is supported - the token
+        2) A value that isn't an option's param, or a positional param
+        3) The tokens left over once the options are parsed, if the spec doesn't
+           define positional params. (The '--' that ends the options isn't passed
+           through)
+
+        Arg files aren't expanded: an arg file arg is passed through.
+
+        :param cmd_line: see 'parse'
+
+        :return: see 'parse'
+        """
+        return cls._parse_command_line(cmd_line, True)
+
+    @classmethod
+    def _parse_command_line(cls, cmd_line, known):
+        """
+        Parses the command line. (See 'parse', and 'parse_known')
+
+        :param cmd_line: see 'parse'
+        :param known: True to pass through args the spec doesn't support
+
+        :return: see 'parse'
+        """
+        stats = cls.parse_settings.stats
+        if stats:
+            start = stats.now()
+        parsed = None
+        cls._parse_errors = None
+        cls._help_query = None
+        cls._subcommand = None
+        cls._subcommand_position = None
+        cls._passthrough = [] if known else None
+        help_request = CmdLine._help_request(cmd_line) if cls.yaml_def else None
+        if help_request:
+            # help is rendered from the raw spec, or from the help cache - so don't
+            # build the options
+            show_help, parsed = cls._check_help_request(help_request)
+            if show_help:
+                cls._help_query = help_request
+                if parsed is not None:
+                    cls._raw_spec = parsed
+                if stats:
+                    stats.lap(ParseStats.SPEC_LOAD, start)
+                    stats.parse_done(cls._parse_errors)
+                return ParseResultEnum.SHOW_USAGE
+        cls._init_from_yaml(parsed)
+        if stats:
+            start = stats.lap(ParseStats.SPEC_LOAD, start)
         has_options = True if cls._supported_options else False
+        # arg files are expanded by the subcommands, so the args following a
+        # subcommand can be passed on as they are on the command line. For the same
+        # reason, 'parse_known' doesn't expand them
+        settings = cls.parse_settings
+        arg_files = settings.arg_file_prefix if not cls._subcommands and not known \
+            else None, settings.arg_file_delimiter, settings.arg_file_nesting
         if type(cmd_line) is str:
-            cmdline_stack = Splitter.split_str(cmd_line, has_options)
+            args = shlex.split(cmd_line)
         elif type(cmd_line) is list:
-            cmdline_stack = Splitter.split_list(cmd_line, has_options)
+            args = cmd_line
         else:
             raise CmdLineException("Can only parse a string or a list")
-        if cmdline_stack.size() == 1 and cls._require_args:
-            # if there are no command line args, but the class wants them, then
-            # return SHOW PARSE_ERROR
-            cls._append_error("At least one option or param is required")
+        if known:
+            cls._known_args = args, Splitter.arg_indices(args, has_options)
+        cmdline_stack = Splitter.split_list(args, has_options, *arg_files)
+        if stats:
+            # arg files are read as parsing reaches them - so that's timed as
+            # dispatch, and the tokens are counted once they're parsed
+            stats.lap(ParseStats.TOKENIZE, start)
+        try:
+            if cls._require_args and not cmdline_stack.at_least(2):
+                # if there are no command line args, but the class wants them, then
+                # return SHOW PARSE_ERROR
+                cls._append_error(ParseError(ErrorKindEnum.REQUIRE_ARGS,
+                                             "At least one option or param is "
+                                             "required"))
+                parse_result = ParseResultEnum.PARSE_ERROR
+            else:
+                cmdline_stack.pop()  # discard - arg 0 is utility name
+                parse_result = cls._parse(cmdline_stack)
+        except ArgFileException as e:
+            # arg files are read as parsing reaches them - so parsing stops here
+            cls._append_error(ParseError(ErrorKindEnum.ARG_FILE, e.args[0]))
+            parse_result = ParseResultEnum.PARSE_ERROR
+        if stats:
+            stats.tokens += cmdline_stack.position()
+        cls._known_args = None
+        if stats:
+            stats.parse_done(cls._parse_errors)
+        if parse_result is ParseResultEnum.SUCCESS and cls._subcommands:
+            parse_result = cls._parse_subcommand(args, has_options, known)
+        return parse_result
+
+    @classmethod
+    def _parse_subcommand(cls, args, has_options, known=False):
+        """
+        Parses the args following the subcommand on the command line with the
+        subcommand's CmdLine subclass - which is only resolved, and its spec only
+        loaded, now. The subclass is passed the args as they are on the command line
+        - so they're split according to its own spec - after a utility name
+        made of the root's utility name and the subcommand name.
+
+        :param args: the command line, as a list
+        :param has_options: True if the root spec defines options
+        :param known: True to parse the args with 'parse_known'
+
+        :return: a ParseResultEnum: the result of the subcommand's parse - or
+        PARSE_ERROR if there is no subcommand on the command line, or it is unknown
+        """
+        if cls._subcommand_position is None:
+            cls._append_error(ParseError(
+                ErrorKindEnum.SUBCOMMAND, "A subcommand is required. One of: {0}",
+                ", ".join(cls._subcommands)))
+            return ParseResultEnum.PARSE_ERROR
+        index = Splitter.arg_indices(args, has_options)[cls._subcommand_position]
+        subcommand = cls._subcommands.get(args[index])
+        if subcommand is None:
+            cls._append_error(ParseError(
+                ErrorKindEnum.SUBCOMMAND, "Unknown subcommand: '{0}'", args[index],
+                token_index=cls._subcommand_position))
             return ParseResultEnum.PARSE_ERROR
-        cmdline_stack.pop()  # discard - arg 0 is utility name
-        return cls._parse(cmdline_stack)
+        cmdline = subcommand.cmdline
+        cls._subcommand = subcommand
+        utility_name = cls._utility_name or args[0]
+        parse_result = cmdline._parse_command_line(
+            ["{} {}".format(utility_name, subcommand.name)] + args[index + 1:], known)
+        if known:
+            cls._passthrough.extend(cmdline.parse_info.passthrough)
+        return parse_result
 
     @classmethod
     def _parse(cls, cmdline_stack):
         """
-        Actually does the command line parsing.
+        Actually does the command line parsing. Unless the 'collect_errors' setting
+        is True, returns at the first error. Otherwise, recoverable errors
+        are recorded and parsing continues, so all errors are reported at once.
 
         :param cmdline_stack: as built from the command line. Left at top, right
         at bottom
 
         :return: a ParseResultEnum object indicating the result of the parse
         """
-        flattened_options = CmdLine._flatten(cls._supported_options)
-        if len(flattened_options) > 0:
+        stats = cls.parse_settings.stats
+        if stats:
+            start = stats.now()
+        table = cls._opt_table if cls._opt_table is not None else OptTable([])
+        failed = set()  # options having errors - skipped by the validator
+
+        parse_result = cls._parse_tokens(cmdline_stack, table, failed)
+        if stats:
+            stats.lap(ParseStats.DISPATCH, start)
+        if parse_result:
+            return parse_result
+        return cls._validate_parse(table, failed)
+
+    @classmethod
+    def _validate_parse(cls, table, failed):
+        """
+        Validates the options and positional params once all the tokens on the
+        command line have been parsed - and if all is good, adds the option fields to
+        the class.
+
+        :param table: the supported options - an OptTable
+        :param failed: a set of the options having errors. Options that report an
+        error are added to it
+
+        :return: a ParseResultEnum object indicating the result of the parse
+        """
+        cls._result = None
+        stats = cls.parse_settings.stats
+        if stats:
+            start = stats.now()
+        parse_result = cls._final_validate(table, failed)
+        if stats:
+            start = stats.lap(ParseStats.FINAL_VALIDATE, start)
+        if parse_result:
+            return parse_result
+
+        parse_result = cls._run_validator(table, failed)
+        if stats:
+            start = stats.lap(ParseStats.VALIDATOR, start)
+        if parse_result:
+            return parse_result
+
+        if cls._parse_errors:
+            # only possible when collecting errors
+            if all(error.kind is ErrorKindEnum.MISSING_MANDATORY
+                   for error in cls._parse_errors):
+                return ParseResultEnum.MISSING_MANDATORY_ARG
+            return ParseResultEnum.PARSE_ERROR
+
+        # all is good: inject fields into the subclass - one for each option - and
+        # set their values as parsed from the command line
+        cls._add_fields()
+        if stats:
+            stats.lap(ParseStats.ADD_FIELDS, start)
+        return ParseResultEnum.SUCCESS
+
+    @classmethod
+    def _parse_tokens(cls, cmdline_stack, table, failed):
+        """
+        Offers the tokens on the command line to the supported options, and
+        handles the positional params.
+
+        :param cmdline_stack: the command line stack
+        :param table: the supported options - an OptTable
+        :param failed: a set. Options that report an error are added to it
+
+        :return: a ParseResultEnum if parsing must stop here, else None
+        """
+        if len(table) > 0 or cls._subcommands:
             # if empty, then no options, so all command-line args are
-            # positional params
-            while cmdline_stack.size() > 0:
-                if cmdline_stack.peek().lower() in ["-h", "--help"]:
-                    return ParseResultEnum.SHOW_USAGE
-                if cmdline_stack.peek() == "--":
-                    cmdline_stack.pop()
-                    cls._handle_positional_params(cmdline_stack)
+            # positional params - unless they start with a subcommand
+            while not cmdline_stack.is_empty():
+                parse_result = cls._parse_token(cmdline_stack, table, failed)
+                if parse_result is ParseResultEnum.SUCCESS:
                     break
-                accept_result = OptAcceptResultEnum.IGNORED,
-                for supported_option in flattened_options:
-                    accept_result = supported_option.accept(cmdline_stack)
-                    if accept_result[0] is not OptAcceptResultEnum.IGNORED:
-                        break
-                if accept_result[0] is OptAcceptResultEnum.IGNORED:
-                    if not cmdline_stack.peek().startswith("-"):
-                        if not cmdline_stack.has_options():
-                            cls._handle_positional_params(cmdline_stack)
-                            break
-                        else:
-                            cls._append_error("Unsupported option: '{0}'".
-                                              format(cmdline_stack.peek()))
-                            return ParseResultEnum.PARSE_ERROR
-                    else:
-                        cls._append_error("Unsupported option: '{0}'".
-                                          format(cmdline_stack.peek()))
-                        return ParseResultEnum.PARSE_ERROR
-                elif accept_result[0] is OptAcceptResultEnum.ERROR:
-                    cls._append_error(accept_result[1])
-                    return ParseResultEnum.PARSE_ERROR
+                if parse_result:
+                    return parse_result
+        return cls._parse_remaining(cmdline_stack)
+
+    @classmethod
+    def _parse_token(cls, cmdline_stack, table, failed):
+        """
+        Parses the token at the top of the stack: offers it to the option having
+        the token as its key, and pops the tokens consumed by the option. Or, if the
+        token starts the positional params, handles them.
+
+        :param cmdline_stack: the command line stack. Must not be empty
+        :param table: the supported options - an OptTable
+        :param failed: a set. Options that report an error are added to it
+
+        :return: None to continue with the next token. ParseResultEnum.SUCCESS if the
+        positional params were reached - so no options remain to be parsed. Any
+        other ParseResultEnum if parsing must stop here
+        """
+        stats = cls.parse_settings.stats
+        if cmdline_stack.peek().lower() in CmdLine._help_options:
+            return ParseResultEnum.SHOW_USAGE
+        if cmdline_stack.peek() == "--":
+            cmdline_stack.pop()
+            cls._handle_positional_params(cmdline_stack)
+            return ParseResultEnum.SUCCESS
+        token_index = cmdline_stack.position()
+        option, accept_result = cls._dispatch(cmdline_stack, table)
+        if stats:
+            stats.option_lookups += 1
+        if accept_result[0] is OptAcceptResultEnum.IGNORED:
+            token = cmdline_stack.peek()
+            if (not token.startswith("-") or token == "-") \
+                    and (cls._subcommands or not cmdline_stack.has_options()):
+                cls._handle_positional_params(cmdline_stack)
+                return ParseResultEnum.SUCCESS
+            if cls._known_args:
+                cls._pass_through(cmdline_stack, table)
+                return None
+            cls._append_error(ParseError(
+                ErrorKindEnum.UNSUPPORTED_OPTION, "Unsupported option: '{0}'",
+                cmdline_stack.peek(), token_index=token_index))
+            if not cls.parse_settings.collect_errors:
+                return ParseResultEnum.PARSE_ERROR
+            cmdline_stack.pop()
+        elif accept_result[0] is OptAcceptResultEnum.ERROR:
+            cls._append_error(ParseError(
+                ErrorKindEnum.OPTION_ERROR, *accept_result[1:],
+                option=option, token_index=token_index))
+            if not cls.parse_settings.collect_errors:
+                return ParseResultEnum.PARSE_ERROR
+            failed.add(option)
+            if cmdline_stack.position() == token_index:
+                # the option didn't consume its key - skip past it
+                cmdline_stack.pop()
+        return None
+
+    @classmethod
+    def _parse_remaining(cls, cmdline_stack):
+        """
+        Handles the tokens left on the stack once no options remain to be parsed:
+        they're the positional params - or, if the yaml doesn't define positional
+        params, an error.
+
+        :param cmdline_stack: the command line stack
 
-        if cmdline_stack.size() > 0:
+        :return: a ParseResultEnum if parsing must stop here, else None
+        """
+        if not cmdline_stack.is_empty():
             cls._handle_positional_params(cmdline_stack)
 
-        if cmdline_stack.size() > 0:
-            cls._append_error("Arg parse error at: {0}".format(
-                cmdline_stack.pop_all()))
-            return ParseResultEnum.PARSE_ERROR
+        if cls._known_args:
+            while not cmdline_stack.is_empty():
+                cls._pass_through(cmdline_stack)
+        if not cmdline_stack.is_empty():
+            token_index = cmdline_stack.position()
+            cls._append_error(ParseError(
+                ErrorKindEnum.UNPARSED_ARGS, "Arg parse error at: {0}",
+                cmdline_stack.pop_all(), token_index=token_index))
+            if not cls.parse_settings.collect_errors:
+                return ParseResultEnum.PARSE_ERROR
+        return None
+
+    @classmethod
+    def _pass_through(cls, cmdline_stack, table=None):
+        """
+        Passes through the token at the top of the stack, when parsing with
+        'parse_known'. If the token is the first of its arg on the command line,
+        and none of the rest of its tokens are supported options, then the arg is
+        passed through as is - and the rest of its tokens are popped too.
+        Otherwise - the token is in the middle of an arg like '-vx', or leads an arg
+        like '-xv' - just the token is passed through, and the rest of the arg is
+        left to be parsed.
+
+        :param cmdline_stack: the command line stack. Must not be empty
+        :param table: the supported options - an OptTable - or None if the tokens
+        can't be options
+        """
+        args, indices = cls._known_args
+        position = cmdline_stack.position()
+        index = indices[position]
+        if indices[position - 1] == index or table and any(
+                token and table.lookup(token)
+                for token in Splitter.split_arg(args[index])[1:]):
+            cls._passthrough.append(cmdline_stack.pop())
+            return
+        cls._passthrough.append(args[index])
+        cmdline_stack.pop()
+        while not cmdline_stack.is_empty() \
+                and indices[cmdline_stack.position()] == index:
+            cmdline_stack.pop()
+
+    @classmethod
+    def _final_validate(cls, table, failed):
+        """
+        Gives each option the chance to validate its params once the entire
+        command line has been parsed, then checks for missing mandatory options.
+        Options that haven't been created weren't supplied, so have nothing to
+        validate - except required options, which are created to be checked.
+
+        :param table: the supported options - an OptTable
+        :param failed: a set. Options that report an error are added to it
 
-        for supported_option in flattened_options:
+        :return: a ParseResultEnum if parsing must stop here, else None
+        """
+        parse_result = cls._apply_env(table, failed)
+        if parse_result:
+            return parse_result
+        parse_result = cls._apply_config(table, failed)
+        if parse_result:
+            return parse_result
+        stats = cls.parse_settings.stats
+        for supported_option in table.created():
             accept_result = supported_option.do_final_validate()
             if accept_result[0] is OptAcceptResultEnum.ERROR:
-                cls._append_error(accept_result[1])
-                return ParseResultEnum.PARSE_ERROR
+                cls._append_error(ParseError(
+                    ErrorKindEnum.INVALID_VALUE, *accept_result[1:],
+                    option=supported_option))
+                if not cls.parse_settings.collect_errors:
+                    return ParseResultEnum.PARSE_ERROR
+                failed.add(supported_option)
+            elif stats and supported_option.data_type \
+                    and supported_option.data_type is not DataTypeEnum.BOOL \
+                    and supported_option.from_cmdline:
+                value = supported_option.value
+                stats.conversions += len(value) if isinstance(value, list) else 1
 
-        missing = [opt for opt in flattened_options if opt.required
-                   and not opt.initialized]
+        missing = [opt for opt in (table.option(index) for index in table.required)
+                   if not opt.initialized]
 
         if len(missing) != 0:
-            cls._append_error("Mandatory option(s) not provided: {0}".format(
+            cls._append_error(ParseError(
+                ErrorKindEnum.MISSING_MANDATORY,
+                "Mandatory option(s) not provided: {0}",
                 [opt.option_keys for opt in missing]))
-            return ParseResultEnum.MISSING_MANDATORY_ARG
-
-        # A callback can be defined in the subclass to perform customized validation
-        # of positional params - and - individual options on the command line. The
-        # function must return a tuple: element zero is an # OptAcceptResultEnum
-        # value, and element one is an error message to display to the user if
-        # element zero is 'ERROR'
-
-        if hasattr(cls, 'validator') and callable(cls.validator):
-            for supported_option in flattened_options:
-                accept_result = cls.validator(supported_option)
-                if accept_result[0] is OptAcceptResultEnum.ERROR:
-                    cls._append_error(accept_result[1])
+            if not cls.parse_settings.collect_errors:
+                return ParseResultEnum.MISSING_MANDATORY_ARG
+            failed.update(missing)
+        return None
+
+    @classmethod
+    def _apply_env(cls, table, failed):
+        """
+        Initializes the options that weren't on the command line from their
+        environment variables, if set and not empty. (See AbstractOpt.accept_env)
+
+        :param table: the supported options - an OptTable
+        :param failed: a set. Options that report an error are added to it
+
+        :return: a ParseResultEnum if parsing must stop here, else None
+        """
+        if not cls._env_options:
+            return None
+        environ = os.environ
+        for env_name, index in cls._env_options.items():
+            value = environ.get(env_name)
+            if not value:
+                continue
+            option = table.option(index)
+            if option.supplied_key is not None:
+                continue
+            accept_result = option.accept_env(value)
+            if accept_result[0] is OptAcceptResultEnum.ERROR:
+                cls._append_error(ParseError(
+                    ErrorKindEnum.INVALID_VALUE, *accept_result[1:], option=option))
+                if not cls.parse_settings.collect_errors:
                     return ParseResultEnum.PARSE_ERROR
+                failed.add(option)
+        return None
+
+    @classmethod
+    def _apply_config(cls, table, failed):
+        """
+        Initializes the options that weren't on the command line or in the
+        environment from the config files. (See AbstractOpt.accept_config.) The
+        values in the files are layered first, so each option is initialized once.
+
+        :param table: the supported options - an OptTable
+        :param failed: a set. Options that report an error are added to it
 
-            accept_result = cls.validator(cls._positional_params)
+        :return: a ParseResultEnum if parsing must stop here, else None
+        """
+        settings = cls.parse_settings
+        paths = [(os.path.expanduser(path), False) for path in settings.config_files] \
+            if settings.config_files else []
+        if settings.config_option:
+            option = table.get(settings.config_option)
+            if not option:
+                raise CmdLineException("Config option '{}' is not defined"
+                                       .format(settings.config_option))
+            # the option hasn't been validated yet - so use its params as supplied
+            supplied = option._value if option.supplied_key \
+                else option.default_value
+            if supplied:
+                paths.extend((str(path), True) for path in supplied)
+        if not paths:
+            return None
+        layered = {}
+        for path, explicit in paths:
+            try:
+                values = ConfigCache.load(path, settings.cache_dir)
+                if values is None and explicit:
+                    raise CmdLineException("Config file not found: {}".format(path))
+            except CmdLineException as e:
+                cls._append_error(ParseError(ErrorKindEnum.CONFIG_ERROR, e.args[0]))
+                if not settings.collect_errors:
+                    return ParseResultEnum.PARSE_ERROR
+                continue
+            if values:
+                for name, value in values.items():
+                    layered[name.replace("-", "_")] = value, path
+        if not layered:
+            return None
+        for name, (value, path) in layered.items():
+            option = table.get(name)
+            if not option:
+                cls._append_error(ParseError(ErrorKindEnum.CONFIG_ERROR,
+                                             "{}: unsupported option: '{}'",
+                                             path, name))
+                if not settings.collect_errors:
+                    return ParseResultEnum.PARSE_ERROR
+                continue
+            if option.supplied_key is not None or value is None:
+                continue
+            accept_result = option.accept_config(value, path)
             if accept_result[0] is OptAcceptResultEnum.ERROR:
-                cls._append_error(accept_result[1])
+                cls._append_error(ParseError(
+                    ErrorKindEnum.INVALID_VALUE, *accept_result[1:], option=option))
+                if not settings.collect_errors:
+                    return ParseResultEnum.PARSE_ERROR
+                failed.add(option)
+        return None
+
+    @classmethod
+    def _run_validator(cls, table, failed):
+        """
+        A callback can be defined in the subclass to perform customized validation
+        of positional params - and - individual options on the command line. The
+        function must return a tuple: element zero is an OptAcceptResultEnum
+        value, and element one is an error message to display to the user if
+        element zero is 'ERROR'. If the callback is defined, this function calls
+        it for each option that doesn't already have an error, and then for the
+        positional params. (So all the options are created.)
+
+        :param table: the supported options - an OptTable
+        :param failed: the options that have errors
+
+        :return: a ParseResultEnum if parsing must stop here, else None
+        """
+        if not hasattr(cls, 'validator') or not callable(cls.validator):
+            return None
+        for supported_option in table.options():
+            if supported_option in failed:
+                continue
+            accept_result = cls.validator(supported_option)
+            if accept_result[0] is OptAcceptResultEnum.ERROR:
+                cls._append_error(ParseError(
+                    ErrorKindEnum.VALIDATOR, *accept_result[1:],
+                    option=supported_option))
+                if not cls.parse_settings.collect_errors:
+                    return ParseResultEnum.PARSE_ERROR
+
+        accept_result = cls.validator(cls._positional_params)
+        if accept_result[0] is OptAcceptResultEnum.ERROR:
+            cls._append_error(ParseError(ErrorKindEnum.VALIDATOR,
+                                         *accept_result[1:]))
+            if not cls.parse_settings.collect_errors:
                 return ParseResultEnum.PARSE_ERROR
+        return None
 
-        # all is good: inject fields into the subclass - one for each option - and
-        # set their values as parsed from the command line
-        cls._add_fields()
-        return ParseResultEnum.SUCCESS
+    @staticmethod
+    def _dispatch(cmdline_stack, table):
+        """
+        Offers the token at the top of the stack to the option having the token as
+        its key - found with one lookup, however many options the spec defines.
+
+        :param cmdline_stack: the command line stack
+        :param table: the supported options - an OptTable
+
+        :return: a tuple: element zero is the option that handled the token, or None
+        if no option handled it. Element one is the accept result tuple from the
+        option. (See AbstractOpt.accept)
+        """
+        supported_option = table.lookup(cmdline_stack.peek())
+        if supported_option is None:
+            return None, (OptAcceptResultEnum.IGNORED,)
+        # the key matched - so no need for 'accept' to match it again
+        return supported_option, supported_option._do_accept(cmdline_stack)
 
     @staticmethod
     def _flatten(supported_opts):
@@ -317,23 +1064,30 @@ class CmdLine:
         off the stack and stores them as positional parameters. Caller will have
         already made the determination that the remaining command line tokens are
         in fact positional parameters. (This function doesn't check.). If the
-        yaml doesn't define positional parameters, then does nothing.
+        yaml doesn't define positional parameters, then does nothing. If the yaml
+        defines subcommands, then the tokens are the subcommand and its args -
+        which are parsed from the command line once the root options have been
+        parsed. (See '_parse_subcommand'.)
 
         :param cmdline_stack: the remaining tokens on the command line
         """
-        if cls._positional_params:
+        if cls._subcommands:
+            if not cmdline_stack.is_empty():
+                cls._subcommand_position = cmdline_stack.position()
+                cmdline_stack.pop_all()
+        elif cls._positional_params:
             cls._positional_params.params = cmdline_stack.pop_all()
 
     @classmethod
-    def _append_error(cls, err_message):
+    def _append_error(cls, error):
         """
-        Appends the passed error message to the class error list
+        Appends the passed error to the class error list
 
-        :param err_message: the error message to append
+        :param error: the ParseError to append
         """
         if not cls._parse_errors:
             cls._parse_errors = []
-        cls._parse_errors.append(err_message)
+        cls._parse_errors.append(error)
 
     @classmethod
     def _add_fields(cls):
@@ -347,33 +1101,189 @@ class CmdLine:
 
         It's a little more intuitive way to access the option values. If the field is
         already present in the class, then this just sets the value, otherwise it
-        creates the field and sets the value.
+        creates the field and sets the value. If the value is a default computed by a
+        callable, then the field is a LazyField, which only computes it when read.
+        The values are also stored in an OptionValues object. (See ParseInfo.result.)
+        """
+        # the names were checked when the options were built (see '_check_options')
+        fields = cls._opt_table.fields() if cls._opt_table else []
+        for opt_name, value in fields:
+            setattr(cls, opt_name, value)
+        cls._result = OptionValues.create(cls._result_class_name(), fields)
+
+    @classmethod
+    def result_stub(cls):
+        """
+        Generates a typing stub for the class of the 'result' object - so IDEs and
+        type checkers know its fields. E.g. write it to a .pyi file, and annotate
+        the result with the class. (Also see 'python -m pycmdparse stub'.)
+
+        :return: Python source defining the class, with a typed field per option
+        """
+        if cls._opt_table is None:
+            cls._init_from_yaml()
+        return OptionValues.stub(cls._result_class_name(), cls._opt_table.options()
+                                 if cls._opt_table else [])
+
+    @classmethod
+    def _result_class_name(cls):
+        """
+        :return: the name of the class generated for the 'result' object. E.g.
+        "MyCmdLineOptions"
+        """
+        return cls.__name__ + "Options"
+
+    @staticmethod
+    def _help_request(cmd_line):
+        """
+        Checks whether the first arg on the raw command line requests help - before
+        the spec is built. The first arg is split the way the Splitter splits it, so
+        - e.g. - '-hv', '-H', and '--help=x' all request help, as they do when the
+        command line is parsed. (Whether the spec defines options, which is also
+        required, is checked by '_check_help_request'.)
+
+        :param cmd_line: the command line, as passed to 'parse'
+
+        :return: None if the first arg doesn't request help. Otherwise a tuple of
+        the help option - "--help" (for "-h" too) or "--help-category" - and the
+        argument supplied for it, or None. A search term is only taken from the
+        "--help=x" form - so '-h x' shows full help, as it always has - and a
+        category name from that form, or the next arg
         """
-        for opt in CmdLine._flatten(cls._supported_options):
-            if not opt.opt_name.isidentifier():
-                raise CmdLineException("Specified option name '{}' must be "
-                                       "a valid Python identifier".
-                                       format(opt.opt_name))
-            if opt.opt_name in dir(CmdLine):
-                raise CmdLineException("Specified option name '{}' clashes".
-                                       format(opt.opt_name))
-            setattr(cls, opt.opt_name, opt.value)
+        if type(cmd_line) is str:
+            # only tokenize as far as the arg after the first
+            lexer = shlex.shlex(cmd_line, posix=True)
+            lexer.whitespace_split = True
+            lexer.commenters = ''
+            try:
+                tokens = list(itertools.islice(lexer, 3))
+            except ValueError:
+                # left for the parse to report
+                return None
+        elif type(cmd_line) is list:
+            tokens = cmd_line[0:3]
+        else:
+            return None
+        if len(tokens) < 2:
+            return None
+        first = tokens[1]
+        if len(first) < 2 or first[0] != "-" or first == "--":
+            return None
+        split = Splitter.split_list([first], True).pop_all()
+        option = split[0].lower() if split else None
+        if option in CmdLine._help_options:
+            option = CmdLine._help_options[1]
+        elif option != CmdLine._help_category_option:
+            return None
+        arg = None
+        if len(split) > 1:
+            # e.g. '--help=x' - but not '-hv'
+            if split[1] and not split[1].startswith("-"):
+                arg = split[1]
+        elif option == CmdLine._help_category_option and len(tokens) > 2 \
+                and tokens[2] != "--":
+            arg = tokens[2]
+        return option, arg
 
     @classmethod
-    def _init_from_yaml(cls):
+    def _check_help_request(cls, help_request):
+        """
+        Checks whether help requested on the command line can be shown: the spec
+        must define options or subcommands - else '-h' and '--help' are positional
+        params - and must not define the '--help-category' option itself. Only
+        loads the spec if the help cache can't answer.
+
+        :param help_request: as returned by '_help_request'
+
+        :return: a tuple of True if the help can be shown, and the yaml spec as
+        loaded by the yaml parser - or None if it didn't need to be loaded
+        """
+        option, arg = help_request
+        if option == CmdLine._help_options[1] and not arg:
+            cached = HelpCache.get(cls._usage_hash(), ShowInfo.terminal_width(),
+                                   cls.parse_settings.cache_dir)
+            if cached:
+                return cached[1], None
+            parsed = cls._load_spec()
+            return cls._accepts_help(parsed), parsed
+        parsed = None
+        index = HelpCache.get_index(HelpCache.spec_hash(cls.yaml_def),
+                                    cls.parse_settings.cache_dir)
+        if index is None:
+            parsed = cls._load_spec()
+            index = cls._help_index(parsed)
+        if option == CmdLine._help_category_option \
+                and index.has_long_key(CmdLine._help_category_option[2:]):
+            return False, parsed
+        if index.has_options or option == CmdLine._help_category_option:
+            return index.has_options, parsed
+        if parsed is None:
+            parsed = cls._load_spec()
+        return cls._accepts_help(parsed), parsed
+
+    @classmethod
+    def _accepts_help(cls, parsed):
+        """
+        :param parsed: the yaml spec, as loaded by the yaml parser
+
+        :return: True if '-h' and '--help' request help: if the spec defines
+        options, or subcommands - else they're positional params
+        """
+        return CmdLine._has_options(parsed) or bool(parsed.get("subcommands")) \
+            or bool(cls.parse_settings.plugin_group)
+
+    @staticmethod
+    def _has_options(parsed):
+        """
+        :param parsed: the yaml spec, as loaded by the yaml parser
+
+        :return: True if the spec defines at least one option
+        """
+        categories = parsed.get("supported_options")
+        return any(category.get("options") for category in categories) \
+            if categories else False
+
+    @classmethod
+    def _load_spec(cls):
+        """
+        Loads the yaml string in the class 'yaml_def' field with the yaml parser
+
+        :return: the loaded yaml - a dictionary
+        """
+        try:
+            return yaml.load(cls.yaml_def, Loader=yaml.FullLoader)
+        except Exception as e:
+            raise CmdLineException("Error parsing the yaml: " + e.args[0])
+
+    @classmethod
+    def _init_from_yaml(cls, parsed=None):
         """
         Parses the yaml string in the class 'yaml_def' field, and initializes the
         following class fields from the yaml: utility, summary, usage,
         positional_params, supported_options, details, examples, and addendum. If the
         yaml is missing an entry, then the corresponding class field is set to None.
+        The options are indexed in an OptTable - but not created - and checked. (See
+        '_check_options'.)
+
+        :param parsed: the yaml, if already loaded by '_load_spec'. If None, then the
+        yaml is loaded
         """
         if not cls.yaml_def:
             # nothing to do
             return
 
         try:
-            parsed = yaml.load(cls.yaml_def, Loader=yaml.FullLoader)
+            if parsed is None:
+                parsed = cls._load_spec()
+            cls._raw_spec = parsed
+            # rebuilt from scratch - not appended to - if parsed more than once
+            cls._supported_options = None
+            cls._opt_table = None
+            cls._env_options = None
+            cls._subcommands = None
+            cls._examples = None
             utility = parsed.get("utility")
+            env_prefix = utility.get("env_prefix") if utility else None
             if utility:
                 cls._utility_name = utility.get("name")
                 cls._require_args = utility.get("require_args")
@@ -384,14 +1294,38 @@ class CmdLine:
             if parsed.get("positional_params"):
                 cls._positional_params = PositionalParams(
                     parsed.get("positional_params"))
+            plugins = cls._plugins()
+            if parsed.get("subcommands") or plugins:
+                if parsed.get("positional_params"):
+                    raise CmdLineException("A spec can't define both positional_params "
+                                           "and subcommands")
+                cls._subcommands = {}
+                for sub_dict in parsed.get("subcommands") or []:
+                    subcommand = Subcommand(sub_dict, cls)
+                    if subcommand.name in cls._subcommands:
+                        raise CmdLineException("Subcommand '{}' is defined more than "
+                                               "once".format(subcommand.name))
+                    cls._subcommands[subcommand.name] = subcommand
+                for name, cmdline_name in plugins.items():
+                    if name not in cls._subcommands:
+                        cls._subcommands[name] = Subcommand(
+                            {"name": name, "cmdline": cmdline_name}, cls)
             if parsed.get("supported_options"):
+                opt_dicts = []
+                categories = []
                 for category in parsed.get("supported_options"):
-                    opt_cat = OptCategory(category.get("category"))
-                    for opt in category.get("options"):
-                        opt_cat.options.append(OptFactory.create_option(opt))
-                    if not cls._supported_options:
-                        cls._supported_options = []
-                    cls._supported_options.append(opt_cat)
+                    start = len(opt_dicts)
+                    opt_dicts.extend(category.get("options"))
+                    categories.append((category.get("category"),
+                                       range(start, len(opt_dicts))))
+                table = OptTable(opt_dicts, env_prefix, cls)
+                cls._supported_options = [OptCategory(name, table, indices)
+                                          for name, indices in categories]
+                cls._opt_table = table
+                cls._env_options = table.env_options
+                problems = CmdLine._check_options(table.keys)
+                if problems:
+                    raise CmdLineException(problems[0])
             cls._details = parsed.get("details")
             if parsed.get("examples"):
                 for example in parsed.get("examples"):
@@ -403,3 +1337,48 @@ class CmdLine:
             raise e
         except Exception as e:
             raise CmdLineException("Error parsing the yaml: " + e.args[0])
+
+    @staticmethod
+    def _check_options(keys):
+        """
+        Checks the options built from a spec for problems that would otherwise go
+        unnoticed, or only be found when fields are injected: option names that
+        aren't valid Python identifiers, or that clash with CmdLine attributes, and
+        options that share a name, a short key, or a long key - since only the
+        first of them would ever be parsed. The checks are done once, when the
+        options are built, rather than on every parse.
+
+        :param keys: a (name, short key, long key) tuple for each option. (See
+        OptTable.keys)
+
+        :return: a list of messages describing the problems. Empty if there are none
+        """
+        if CmdLine._reserved_names is None:
+            CmdLine._reserved_names = frozenset(dir(CmdLine)).union(
+                name for name in dir(OptionValues) if name.startswith("_"))
+        problems = []
+        names = set()
+        short_keys = set()
+        long_keys = set()
+        for opt_name, short_key, long_key in keys:
+            if not opt_name.isidentifier():
+                problems.append("Specified option name '{}' must be a valid Python "
+                                "identifier".format(opt_name))
+            elif opt_name in CmdLine._reserved_names:
+                problems.append("Specified option name '{}' clashes"
+                                .format(opt_name))
+            elif opt_name in names:
+                problems.append("Specified option name '{}' is used by more than "
+                                "one option".format(opt_name))
+            names.add(opt_name)
+            if short_key in short_keys:
+                problems.append("Short key '-{}' is used by more than one option"
+                                .format(short_key))
+            elif short_key:
+                short_keys.add(short_key)
+            if long_key in long_keys:
+                problems.append("Long key '--{}' is used by more than one option"
+                                .format(long_key))
+            elif long_key:
+                long_keys.add(long_key)
+        return problems
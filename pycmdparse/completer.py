@@ -0,0 +1,156 @@
+"""
+Answers shell completion requests from a completion index - written by
+'python -m pycmdparse completion --index FILE'. Completion scripts run this file
+directly, on every press of the tab key, like so:
+
+python -S -E completer.py INDEX CWORD WORD...
+
+where WORD... are the words on the command line - the command first - and CWORD
+is the index of the word being completed. Prints the candidates, one per line. So
+that a response takes a few milliseconds more than starting the interpreter, this
+module only imports 'sys': the index is a line-based text file - not yaml or
+JSON - and no options are built.
+"""
+import sys
+
+
+class Completer:
+    """
+    Produces completion candidates for a command line, from a table of the options
+    supported by a utility
+    """
+
+    __slots__ = ("_options",)
+
+    FORMAT = "pycmdparse-completion 1"
+    """The first line of an index file"""
+
+    FILES = "__files__"
+    """
+    Returned as the only candidate when the shell should complete file names - e.g.
+    for a positional param, or the param of an option with no fixed choices
+    """
+
+    def __init__(self, options):
+        """
+        Initializes the instance
+
+        :param options: a list of (short key, long key, takes param, choices) tuples.
+        Either key can be empty. 'choices' is a list of the values the option's
+        param can take - or empty, if any value can be supplied
+        """
+        self._options = options
+
+    @property
+    def options(self):
+        return self._options
+
+    @staticmethod
+    def load(path):
+        """
+        Loads an index file
+
+        :param path: the path of a file written by 'to_text'
+
+        :return: a Completer, or None if the file isn't a valid index
+        """
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().split("\n")
+        if not lines or lines[0] != Completer.FORMAT:
+            return None
+        options = []
+        for line in lines[1:]:
+            fields = line.split("\t")
+            if len(fields) >= 3:
+                options.append((fields[0], fields[1], fields[2] == "1",
+                                [choice for choice in fields[3:] if choice]))
+        return Completer(options)
+
+    def to_text(self):
+        """
+        :return: the index file contents. After the format line, each line holds the
+        fields of an option tuple, separated by tabs - with the choices last
+        """
+        lines = [Completer.FORMAT]
+        for short_key, long_key, takes_param, choices in self._options:
+            lines.append("\t".join([short_key, long_key,
+                                    "1" if takes_param else "0"] + choices))
+        return "\n".join(lines) + "\n"
+
+    def complete(self, cword, words):
+        """
+        Produces the candidates for the word being completed
+
+        :param cword: the index in 'words' of the word being completed
+        :param words: the words on the command line, starting with the command. The
+        list can end before 'cword', if the word being completed is empty
+
+        :return: a list of candidates, or [Completer.FILES]
+        """
+        cur = words[cword] if cword < len(words) else ""
+        if "--" in words[1:cword]:
+            # only positional params follow
+            return [Completer.FILES]
+        if cur.startswith("--") and "=" in cur:
+            key, value = cur.split("=", 1)
+            values = self._values(key, value)
+            if values is None or values == [Completer.FILES]:
+                return values or []
+            return [key + "=" + v for v in values]
+        prev = words[cword - 1] if 0 < cword <= len(words) else ""
+        values = self._values(prev, cur)
+        if values is not None:
+            return values
+        if cur.startswith("-"):
+            return [key for key in self._keys() if key.startswith(cur)]
+        return [Completer.FILES]
+
+    def _values(self, key, prefix):
+        """
+        :return: the candidates for the param of the option with the passed key,
+        that start with the passed prefix. None if the key isn't an option that
+        takes a param
+        """
+        for short_key, long_key, takes_param, choices in self._options:
+            if (short_key and key == "-" + short_key) \
+                    or (long_key and key == "--" + long_key):
+                if not takes_param:
+                    return None
+                if not choices:
+                    return [Completer.FILES]
+                return [choice for choice in choices if choice.startswith(prefix)]
+        return None
+
+    def _keys(self):
+        """
+        :return: every option key - long keys first
+        """
+        keys = ["--" + long_key for ignore, long_key, ignore, ignore in self._options
+                if long_key]
+        keys.extend("-" + short_key for short_key, ignore, ignore, ignore
+                    in self._options if short_key)
+        return keys
+
+
+def main(argv):
+    """
+    :param argv: [program name, INDEX, CWORD, WORD...]
+
+    :return: the exit status
+    """
+    if len(argv) < 3 or not argv[2].isdigit():
+        return 2
+    try:
+        completer = Completer.load(argv[1])
+    except OSError:
+        return 1
+    if completer is None:
+        return 1
+    candidates = completer.complete(int(argv[2]), argv[3:])
+    if candidates:
+        sys.stdout.write("\n".join(candidates) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
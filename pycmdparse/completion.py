@@ -0,0 +1,391 @@
+import importlib.util
+import os
+import re
+import shlex
+import sys
+
+from pycmdparse.bool_opt import BoolOpt
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.completer import Completer
+from pycmdparse.help_index import HelpIndex
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+
+class Completion:
+    """
+    Generates shell completion scripts for a utility that uses pycmdparse, from the
+    options built from its spec. A script is either static - the option keys and
+    param choices are written into the script, so completing doesn't start Python -
+    or dynamic: the script runs the Completer module against a completion index
+    file, which can be regenerated when the spec changes without re-installing the
+    script.
+    """
+
+    SHELLS = ["bash", "zsh", "fish"]
+    """The shells that scripts can be generated for"""
+
+    @staticmethod
+    def load_cmdline(spec):
+        """
+        Loads a utility's CmdLine subclass
+
+        :param spec: the path of a utility script that defines a CmdLine subclass,
+        or the path of a yaml file holding the utility's spec
+
+        :return: the CmdLine subclass
+        """
+        if spec.endswith(".py"):
+            module_spec = importlib.util.spec_from_file_location(
+                "pycmdparse_completion_target", spec)
+            module = importlib.util.module_from_spec(module_spec)
+            module_spec.loader.exec_module(module)
+            cmdline = next((obj for obj in vars(module).values()
+                            if isinstance(obj, type) and issubclass(obj, CmdLine)
+                            and obj.__module__ == module.__name__), None)
+            if not cmdline:
+                raise CmdLineException("No CmdLine subclass in: {}".format(spec))
+            return cmdline
+
+        class SpecCmdLine(CmdLine):
+            pass
+        with open(spec, encoding="utf-8") as f:
+            SpecCmdLine.yaml_def = f.read()
+        return SpecCmdLine
+
+    @staticmethod
+    def entries(cmdline):
+        """
+        Builds the table of options to complete
+
+        :param cmdline: a CmdLine subclass
+
+        :return: a list of (short key, long key, takes param, choices, description)
+        tuples - one for each option that isn't internal, plus the help options that
+        the parser handles. 'choices' are the values in a hint like 'a|b|c'
+        """
+        cmdline.reset()
+        cmdline._init_from_yaml()
+        options = CmdLine._flatten(cmdline._supported_options)
+        to_return = [(opt.short_key or "", opt.long_key or "",
+                      not isinstance(opt, BoolOpt), Completion._choices(opt.opt_hint),
+                      Completion._describe(opt.help_text))
+                     for opt in options if not opt.is_internal]
+        if options:
+            if not any(opt.long_key == "help" for opt in options):
+                to_return.append(("h", "help", False, [],
+                                  "Shows usage instructions"))
+            if not any(opt.long_key == "help-category" for opt in options):
+                to_return.append(("", "help-category", True,
+                                  HelpIndex.from_spec(cmdline._raw_spec)
+                                  .category_names,
+                                  "Shows the options in a category"))
+        return to_return
+
+    @staticmethod
+    def completer(entries):
+        """
+        :param entries: as returned by 'entries'
+
+        :return: a Completer for the passed entries - e.g. to write an index file
+        """
+        return Completer([(short_key, long_key, takes_param, choices)
+                          for short_key, long_key, takes_param, choices, ignore
+                          in entries])
+
+    @staticmethod
+    def script(shell, command, entries, index=None, python=None):
+        """
+        Generates a completion script
+
+        :param shell: one of Completion.SHELLS
+        :param command: the command to complete
+        :param entries: as returned by 'entries'
+        :param index: if None, then generates a static script. Otherwise, the path
+        of an index file (see 'completer') that the generated script answers
+        completion requests from
+        :param python: the interpreter the generated script runs the Completer
+        with. Defaults to the current interpreter
+
+        :return: the script
+        """
+        if shell not in Completion.SHELLS:
+            raise CmdLineException("Unsupported shell: {}".format(shell))
+        func = "_" + re.sub(r"\W", "_", command) + "_complete"
+        responder = None
+        if index:
+            responder = " ".join(shlex.quote(part) for part in [
+                python if python else sys.executable, "-S", "-E",
+                os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "completer.py"),
+                os.path.abspath(index)])
+        generator = {"bash": Completion._bash, "zsh": Completion._zsh,
+                     "fish": Completion._fish}[shell]
+        script = generator(command, func, entries, responder)
+        header = "# {} completion for {} - generated by: python -m pycmdparse " \
+                 "completion\n".format(shell, command)
+        if script.startswith("#compdef"):
+            # zsh only recognizes the tag on the first line
+            first, rest = script.split("\n", 1)
+            return first + "\n" + header + rest
+        return header + script
+
+    @staticmethod
+    def _bash(command, func, entries, responder):
+        if responder:
+            body = '''    local IFS=$'\\n'
+    local candidates
+    candidates=($({} "$COMP_CWORD" "${{COMP_WORDS[@]}}" 2>/dev/null))
+    if [[ "${{candidates[0]}}" == {} ]]; then
+        COMPREPLY=()
+    elif (( ${{#candidates[@]}} )); then
+        COMPREPLY=($(printf '%q\\n' "${{candidates[@]}}"))
+    fi
+'''.format(responder, Completer.FILES)
+        else:
+            cases = ""
+            for short_key, long_key, takes_param, choices, ignore in entries:
+                if not takes_param:
+                    continue
+                pattern = Completion._case_pattern(short_key, long_key)
+                cases += "        {})\n".format(pattern)
+                if choices:
+                    cases += "            COMPREPLY=($(printf '%q\\n' $(compgen -W " \
+                             "{} -- \"$cur\")))\n".format(Completion._bash_words(
+                                 choices))
+                cases += "            return ;;\n"
+            body = '''    local IFS=$'\\n'
+    local cur=${{COMP_WORDS[COMP_CWORD]}} prev=${{COMP_WORDS[COMP_CWORD-1]}}
+    local word
+    for word in "${{COMP_WORDS[@]:1:COMP_CWORD-1}}"; do
+        [[ "$word" == -- ]] && return
+    done
+    case "$prev" in
+{}    esac
+    if [[ "$cur" == -* ]]; then
+        COMPREPLY=($(compgen -W {} -- "$cur"))
+    fi
+'''.format(cases, Completion._bash_words(Completion._all_keys(entries)))
+        return "{}()\n{{\n{}}}\ncomplete -o default -F {} {}\n".format(
+            func, body, func, shlex.quote(command))
+
+    @staticmethod
+    def _zsh(command, func, entries, responder):
+        if responder:
+            body = '''    local -a candidates
+    candidates=("${{(@f)$({} $((CURRENT - 1)) "${{words[@]}}" 2>/dev/null)}}")
+    if [[ "${{candidates[1]}}" == {} ]]; then
+        _files
+    elif [[ -n "${{candidates[1]}}" ]]; then
+        compadd -a candidates
+    fi
+'''.format(responder, Completer.FILES)
+        else:
+            cases = ""
+            for short_key, long_key, takes_param, choices, ignore in entries:
+                if not takes_param:
+                    continue
+                pattern = Completion._case_pattern(short_key, long_key)
+                cases += "        {})\n".format(pattern)
+                if choices:
+                    cases += "            local -a choices\n" \
+                             "            choices=({})\n" \
+                             "            compadd -a choices\n".format(
+                                 " ".join(Completion._zsh_quote(choice)
+                                          for choice in choices))
+                else:
+                    cases += "            _files\n"
+                cases += "            return ;;\n"
+            body = '''    local dashes=${{words[(I)--]}}
+    if (( dashes > 0 && dashes < CURRENT )); then
+        _files
+        return
+    fi
+    case "${{words[CURRENT-1]}}" in
+{}    esac
+    if [[ "$PREFIX" == -* ]]; then
+        local -a keys
+        keys=({})
+        compadd -a keys
+    else
+        _files
+    fi
+'''.format(cases, " ".join(Completion._zsh_quote(key)
+                           for key in Completion._all_keys(entries)))
+        return "#compdef {}\n{}() {{\n{}}}\ncompdef {} {}\n".format(
+            command, func, body, func, Completion._zsh_quote(command))
+
+    @staticmethod
+    def _fish(command, func, entries, responder):
+        command = Completion._fish_quote(command)
+        if responder:
+            return '''function {0}
+    set -l candidates ({1} (count (commandline -opc)) (commandline -opc) \\
+        (commandline -ct) 2>/dev/null)
+    if test "$candidates[1]" = {2}
+        __fish_complete_path (commandline -ct)
+    else
+        printf '%s\\n' $candidates
+    end
+end
+complete -c {3} -f -a '({0})'
+'''.format(func, responder, Completer.FILES, command)
+        lines = []
+        for short_key, long_key, takes_param, choices, description in entries:
+            line = "complete -c " + command
+            if short_key:
+                line += " -s " + Completion._fish_quote(short_key)
+            if long_key:
+                line += " -l " + Completion._fish_quote(long_key)
+            if choices:
+                line += " -x -a " + Completion._fish_quote(
+                    " ".join(Completion._fish_quote(choice) for choice in choices))
+            elif takes_param:
+                line += " -r"
+            if description:
+                line += " -d " + Completion._fish_quote(description)
+            lines.append(line)
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _choices(hint):
+        """
+        :return: the choices in a hint like 'a|b|c' - or 'a|b|c ...' for an option
+        taking several params - else an empty list
+        """
+        if not hint or "|" not in str(hint):
+            return []
+        choices = str(hint).split()[0].split("|")
+        return choices if all(choices) else []
+
+    @staticmethod
+    def _describe(help_text):
+        """
+        :return: the first sentence of the passed help text, shortened to fit a
+        completion menu
+        """
+        if not help_text:
+            return ""
+        text = " ".join(str(help_text).split())
+        text = text.split(". ")[0].rstrip(".")
+        return text if len(text) <= 60 else text[0:57] + "..."
+
+    @staticmethod
+    def _all_keys(entries):
+        """
+        :return: the keys of all the entries - long keys first
+        """
+        keys = ["--" + long_key for ignore, long_key, ignore, ignore, ignore
+                in entries if long_key]
+        keys.extend("-" + short_key for short_key, ignore, ignore, ignore, ignore
+                    in entries if short_key)
+        return keys
+
+    @staticmethod
+    def _case_pattern(short_key, long_key):
+        """
+        :return: the keys of an option as a shell case pattern. E.g. '-f'|'--file'
+        """
+        keys = []
+        if short_key:
+            keys.append("'-" + short_key + "'")
+        if long_key:
+            keys.append("'--" + long_key + "'")
+        return "|".join(keys)
+
+    @staticmethod
+    def _bash_words(words):
+        """
+        :return: the passed words as a bash ANSI-C quoted string, separated by
+        newlines - so words can contain spaces
+        """
+        return "$'" + "\\n".join(word.replace("\\", "\\\\").replace("'", "\\'")
+                                 for word in words) + "'"
+
+    @staticmethod
+    def _zsh_quote(word):
+        return "'" + word.replace("'", "'\\''") + "'"
+
+    @staticmethod
+    def _fish_quote(word):
+        return "'" + word.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+class CompletionCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: python -m pycmdparse completion
+      require_args: true
+
+    summary: >
+      Generates a shell completion script for a utility that uses pycmdparse, and
+      writes it to the console.
+
+    usage: >
+      python -m pycmdparse completion [options] bash|zsh|fish SPEC
+
+    positional_params:
+      params: bash|zsh|fish SPEC
+      text: >
+        SPEC is a utility script that defines a CmdLine subclass - like the
+        scripts in the pycmdparse 'example' directory - or a yaml file holding
+        the utility's spec.
+
+    supported_options:
+      - category:
+        options:
+        - name      : command
+          short     : c
+          long      : command
+          hint      : name
+          help: >
+            The command to complete. Defaults to the utility name in the spec.
+        - name      : index
+          short     : i
+          long      : index
+          hint      : file
+          help: >
+            Writes a completion index to the specified file, and generates a
+            script that answers each completion request from the index, rather
+            than a static script. When the spec changes, only the index needs to
+            be written again.
+        - name      : python
+          long      : python
+          hint      : path
+          help: >
+            With --index, the interpreter the script uses to answer completion
+            requests. Defaults to the current interpreter.
+    '''
+
+    command = None
+    index = None
+    python = None
+
+
+def main(argv):
+    parse_result = CompletionCmdLine.parse(argv)
+    if parse_result.value != ParseResultEnum.SUCCESS.value:
+        CompletionCmdLine.display_info(parse_result)
+        return 1
+    params = CompletionCmdLine.positional_params
+    if len(params) != 2 or params[0] not in Completion.SHELLS:
+        print("A shell (one of: {}) and a SPEC are required"
+              .format(", ".join(Completion.SHELLS)))
+        return 1
+    shell, spec = params
+    cmdline = Completion.load_cmdline(spec)
+    entries = Completion.entries(cmdline)
+    command = CompletionCmdLine.command
+    if not command:
+        command = cmdline._utility_name
+        if not command or len(command.split()) != 1:
+            command = os.path.splitext(os.path.basename(spec))[0]
+    index = CompletionCmdLine.index
+    if index:
+        if os.path.dirname(index):
+            os.makedirs(os.path.dirname(index), exist_ok=True)
+        with open(index, "w", encoding="utf-8") as f:
+            f.write(Completion.completer(entries).to_text())
+    sys.stdout.write(Completion.script(shell, command, entries, index,
+                                       CompletionCmdLine.python))
+    return 0
@@ -0,0 +1,167 @@
+import configparser
+import hashlib
+import json
+import os
+
+import yaml
+
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.util import Util
+
+
+class ConfigCache:
+    """
+    Loads config files - which supply option values, keyed by option name - and
+    memoizes the loaded values, keyed by the path, modification time, and size of
+    the file. So a config that hasn't changed costs one 'stat' call. The values are
+    held in memory for the life of the process and, if a cache directory is
+    supplied, are also persisted there - so the many short-lived invocations of a
+    utility that share a config file don't each parse it.
+    """
+
+    YAML_TYPES = [".yaml", ".yml"]
+    """The extensions of yaml config files"""
+
+    TOML_TYPES = [".toml"]
+    """The extensions of toml config files"""
+
+    INI_TYPES = [".ini", ".cfg", ".conf"]
+    """The extensions of ini config files"""
+
+    _cache = {}
+    """((modification time, size), values) tuples, keyed by absolute path"""
+
+    @staticmethod
+    def load(path, cache_dir=None):
+        """
+        Gets the values in a config file - from the cache if the file is unchanged,
+        else by parsing the file
+
+        :param path: the path of the config file
+        :param cache_dir: a directory in which loaded values are persisted, or None
+        to only use the in-memory cache
+
+        :return: a dictionary of the values in the file, keyed by option name. Or
+        None if the file doesn't exist
+
+        :raises: CmdLineException if the file can't be read or parsed
+        """
+        path = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            raise CmdLineException("Unable to read config file: {}: {}"
+                                   .format(path, e.strerror))
+        key = st.st_mtime_ns, st.st_size
+        entry = ConfigCache._cache.get(path)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        values = ConfigCache._get_persisted(path, key, cache_dir) if cache_dir \
+            else None
+        if values is None:
+            values = ConfigCache._parse(path)
+            if cache_dir:
+                Util.write_cache_file(ConfigCache._path(path, cache_dir),
+                                      json.dumps({"path": path, "key": key,
+                                                  "values": values}))
+        ConfigCache._cache[path] = key, values
+        return values
+
+    @staticmethod
+    def clear():
+        """
+        Empties the in-memory cache. (Persisted values are not removed.)
+        """
+        ConfigCache._cache.clear()
+
+    @staticmethod
+    def _get_persisted(path, key, cache_dir):
+        """
+        :return: the values persisted in the cache directory for the config file,
+        or None if they aren't persisted - or were loaded from a different version
+        of the file
+        """
+        try:
+            with open(ConfigCache._path(path, cache_dir), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("path") != path \
+                or entry.get("key") != list(key):
+            return None
+        return entry.get("values")
+
+    @staticmethod
+    def _parse(path):
+        """
+        Parses a config file. The type of file is determined by its extension:
+        yaml, toml, or ini. (See ConfigCache.YAML_TYPES etc.) A yaml or toml file
+        holds a mapping of option names to values. In an ini file, the values can be
+        in any section - a later section overrides an earlier one. Values are
+        normalized to what JSON can hold - e.g. dates become ISO strings - so values
+        read from the cache directory are the same as values parsed from the file
+
+        :param path: the path of the file
+
+        :return: a dictionary of the values in the file
+
+        :raises: CmdLineException if the file can't be read or parsed
+        """
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in ConfigCache.YAML_TYPES + ConfigCache.TOML_TYPES \
+                + ConfigCache.INI_TYPES:
+            raise CmdLineException("Unsupported config file type: {}".format(path))
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            if ext in ConfigCache.YAML_TYPES:
+                values = yaml.safe_load(text)
+            elif ext in ConfigCache.TOML_TYPES:
+                values = ConfigCache._toml_loads(text)
+            else:
+                parser = configparser.ConfigParser(interpolation=None)
+                parser.read_string(text, path)
+                values = {}
+                for section in [parser.defaults()] + \
+                        [parser[name] for name in parser.sections()]:
+                    values.update(section)
+        except OSError as e:
+            raise CmdLineException("Unable to read config file: {}: {}"
+                                   .format(path, e.strerror))
+        except (ValueError, yaml.YAMLError, configparser.Error) as e:
+            raise CmdLineException("Unable to parse config file: {}: {}"
+                                   .format(path, e))
+        if values is None:
+            return {}
+        if not isinstance(values, dict):
+            raise CmdLineException("Config file must hold a mapping of option names "
+                                   "to values: {}".format(path))
+        return json.loads(json.dumps(values, default=str))
+
+    @staticmethod
+    def _toml_loads(text):
+        """
+        Parses TOML with the standard library parser in Python 3.11 and later,
+        or else the 'toml' package, if installed
+        """
+        try:
+            import tomllib
+            return tomllib.loads(text)
+        except ImportError:
+            pass
+        try:
+            import toml
+        except ImportError:
+            raise CmdLineException("TOML config files require Python 3.11 or later, "
+                                   "or the 'toml' package")
+        return toml.loads(text)
+
+    @staticmethod
+    def _path(path, cache_dir):
+        """
+        :return: the path of the file that persists the values of a config file
+        """
+        digest = hashlib.sha1(path.encode("utf-8", "surrogateescape")).hexdigest()
+        return os.path.join(cache_dir, "config-{}.json".format(digest))
@@ -0,0 +1,68 @@
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.util import Util
+
+
+class DefaultCall:
+    """
+    A default computed by a callable - for defaults that are costly to compute, like
+    the number of CPUs available, or the root of the current repo. The yaml names
+    the callable in an option's 'default_call' entry, either as a dotted path - e.g.
+    "my_util.defaults.cpu_count" - or as the name of a class method on the CmdLine
+    subclass. The callable is only resolved and called when the default is needed,
+    and its result is cached for the life of the process.
+    """
+
+    __slots__ = ("_name", "_cmdline")
+
+    _results = {}
+    """The results of the callables called so far, keyed by callable"""
+
+    def __init__(self, name, cmdline=None):
+        """
+        Initializes the instance
+
+        :param name: the dotted path of a callable, or the name of a class method
+        on the 'cmdline' class
+        :param cmdline: the CmdLine subclass that defines the option
+        """
+        if not isinstance(name, str) or not name:
+            raise CmdLineException("Invalid default_call: {}".format(name))
+        self._name = name
+        self._cmdline = cmdline
+
+    @property
+    def name(self):
+        return self._name
+
+    def __call__(self):
+        """
+        :return: the result of the callable - called on the first call for the
+        callable in the process, and cached
+
+        :raises: CmdLineException if the callable can't be found
+        """
+        key = self._name if "." in self._name else (self._cmdline, self._name)
+        try:
+            return DefaultCall._results[key]
+        except KeyError:
+            pass
+        result = self._resolve()()
+        DefaultCall._results[key] = result
+        return result
+
+    @staticmethod
+    def clear():
+        """
+        Supports testing. Forgets the cached results
+        """
+        DefaultCall._results.clear()
+
+    def _resolve(self):
+        """
+        :return: the callable - a function in a module, or a method of a class in a
+        module, or a class method of the CmdLine subclass. (See Util.find_object)
+        """
+        found = Util.find_object(self._name, self._cmdline)
+        if not callable(found):
+            raise CmdLineException("Unable to find default_call: {}".format(self._name))
+        return found
@@ -0,0 +1,29 @@
+from enum import Enum
+
+
+class ErrorKindEnum(Enum):
+    """
+    Classifies a ParseError - the kind of problem the parser found on the
+    command line
+    """
+
+    REQUIRE_ARGS = 1
+    """The yaml requires args, and none were provided"""
+    UNSUPPORTED_OPTION = 2
+    """A token on the command line did not match any supported option"""
+    OPTION_ERROR = 3
+    """An option matched a token, but could not consume it (e.g. missing value)"""
+    UNPARSED_ARGS = 4
+    """Tokens were left on the command line after parsing completed"""
+    INVALID_VALUE = 5
+    """An option's params failed final validation (count or data type)"""
+    MISSING_MANDATORY = 6
+    """One or more mandatory options were not provided"""
+    VALIDATOR = 7
+    """The validator callback in the CmdLine subclass rejected a value"""
+    CONFIG_ERROR = 8
+    """A config file could not be read, or named an unsupported option"""
+    SUBCOMMAND = 9
+    """The spec defines subcommands, and none - or an unknown one - was provided"""
+    ARG_FILE = 10
+    """An arg file could not be read, or named arg files nested too deep"""
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+
+from pycmdparse.help_index import HelpIndex
+from pycmdparse.util import Util
+
+
+class HelpCache:
+    """
+    Memoizes rendered usage instructions, keyed by a hash of the yaml spec and the
+    console width the text was wrapped to - so that showing usage more than once
+    for the same spec and width skips the layout. The rendered text is held in
+    memory for the life of the process and, if a cache directory is supplied, is
+    also persisted there, so separate invocations of a utility with --help (e.g.
+    from CI scripts, or documentation generation) skip the layout too. The HelpIndex
+    for a spec is cached in the same way.
+    """
+
+    FORMAT_VERSION = 2
+    """
+    Included in the spec hash. Incremented whenever the rendering changes, so that
+    text persisted by a prior version is not reused
+    """
+
+    _cache = {}
+    """(rendered text, has options) tuples, keyed by (spec hash, width)"""
+
+    _indexes = {}
+    """HelpIndex objects, keyed by spec hash"""
+
+    @staticmethod
+    def spec_hash(yaml_def):
+        """
+        :param yaml_def: the yaml spec
+
+        :return: a hex digest identifying the spec
+        """
+        h = hashlib.sha1("{}\n".format(HelpCache.FORMAT_VERSION).encode())
+        h.update(yaml_def.encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def get(spec_hash, width, cache_dir=None):
+        """
+        Gets rendered usage instructions from the cache
+
+        :param spec_hash: as returned by 'spec_hash'
+        :param width: the console width the text was wrapped to
+        :param cache_dir: a directory in which rendered text is persisted, or None
+        to only use the in-memory cache
+
+        :return: a tuple of the rendered text, and whether '--help' requests usage
+        (see 'put') - or None if the text isn't cached
+        """
+        entry = HelpCache._cache.get((spec_hash, width))
+        if entry is None and cache_dir:
+            try:
+                with open(HelpCache._path(spec_hash, width, cache_dir),
+                          encoding="utf-8") as f:
+                    has_options = f.readline() == "1\n"
+                    entry = f.read(), has_options
+            except OSError:
+                return None
+            HelpCache._cache[(spec_hash, width)] = entry
+        return entry
+
+    @staticmethod
+    def put(spec_hash, width, text, has_options, cache_dir=None):
+        """
+        Adds rendered usage instructions to the cache. Failure to persist the text
+        is ignored, since the text can always be rendered again.
+
+        :param spec_hash: as returned by 'spec_hash'
+        :param width: the console width the text was wrapped to
+        :param text: the rendered text
+        :param has_options: True if '--help' requests usage - if the spec defines
+        any options, or subcommands. Cached with the text, so this can be known
+        without loading the spec
+        :param cache_dir: see 'get'
+        """
+        HelpCache._cache[(spec_hash, width)] = text, has_options
+        if cache_dir:
+            Util.write_cache_file(HelpCache._path(spec_hash, width, cache_dir),
+                                  ("1\n" if has_options else "0\n") + text)
+
+    @staticmethod
+    def get_index(spec_hash, cache_dir=None):
+        """
+        Gets a HelpIndex from the cache
+
+        :param spec_hash: as returned by 'spec_hash'
+        :param cache_dir: see 'get'
+
+        :return: the index, or None if it isn't cached
+        """
+        index = HelpCache._indexes.get(spec_hash)
+        if index is None and cache_dir:
+            try:
+                with open(HelpCache._index_path(spec_hash, cache_dir),
+                          encoding="utf-8") as f:
+                    index = HelpIndex.from_dict(json.load(f))
+            except (OSError, ValueError, KeyError):
+                return None
+            HelpCache._indexes[spec_hash] = index
+        return index
+
+    @staticmethod
+    def put_index(spec_hash, index, cache_dir=None):
+        """
+        Adds a HelpIndex to the cache. Failure to persist the index is ignored.
+
+        :param spec_hash: as returned by 'spec_hash'
+        :param index: the index
+        :param cache_dir: see 'get'
+        """
+        HelpCache._indexes[spec_hash] = index
+        if cache_dir:
+            Util.write_cache_file(HelpCache._index_path(spec_hash, cache_dir),
+                                  json.dumps(index.to_dict()))
+
+    @staticmethod
+    def clear():
+        """
+        Empties the in-memory cache. (Persisted text and indexes are not removed.)
+        """
+        HelpCache._cache.clear()
+        HelpCache._indexes.clear()
+
+    @staticmethod
+    def _path(spec_hash, width, cache_dir):
+        """
+        :return: the path of the file that persists the rendered text
+        """
+        return os.path.join(cache_dir, "help-{}-{}.txt".format(spec_hash, width))
+
+    @staticmethod
+    def _index_path(spec_hash, cache_dir):
+        """
+        :return: the path of the file that persists the index
+        """
+        return os.path.join(cache_dir, "index-{}.json".format(spec_hash))
@@ -0,0 +1,179 @@
+import bisect
+import re
+
+from pycmdparse.opt_category import OptCategory
+from pycmdparse.opt_spec import OptSpec
+
+
+class HelpIndex:
+    """
+    An inverted index of the options in a spec, supporting '--help=<term>' and
+    '--help-category <name>'. Each word in an option's keys, hint and help text maps
+    to the options containing it, so finding the options that match a term is a
+    binary search of the sorted words, rather than rendering and searching the full
+    usage instructions. Built once per spec - and cached with the rendered usage
+    instructions (see HelpCache).
+    """
+
+    __slots__ = ("_options", "_categories", "_postings", "_words")
+
+    _WORD = re.compile(r"\w+")
+    """Splits text into the words that are indexed, and that are searched for"""
+
+    def __init__(self, options, categories, postings=None):
+        """
+        Initializes the instance. (See 'from_spec', and 'from_dict')
+
+        :param options: a list of OptSpec objects - all the options in the spec
+        :param categories: a list of (category name, [option ordinal, ...]) tuples,
+        where an ordinal is an index into 'options'
+        :param postings: a dictionary of word -> [option ordinal, ...]. If None,
+        then the postings are built from the options
+        """
+        self._options = options
+        self._categories = categories
+        self._postings = postings if postings is not None \
+            else HelpIndex._build_postings(options)
+        self._words = sorted(self._postings)
+
+    @staticmethod
+    def from_spec(parsed):
+        """
+        Builds an index
+
+        :param parsed: the yaml spec, as loaded by the yaml parser
+
+        :return: the index
+        """
+        options = []
+        categories = []
+        for category in parsed.get("supported_options") or []:
+            ordinals = []
+            for opt in category.get("options") or []:
+                ordinals.append(len(options))
+                options.append(OptSpec(opt))
+            categories.append((category.get("category"), ordinals))
+        return HelpIndex(options, categories)
+
+    @staticmethod
+    def from_dict(index_dict):
+        """
+        :param index_dict: a dictionary returned by 'to_dict'
+
+        :return: the index
+        """
+        return HelpIndex([OptSpec(opt) for opt in index_dict["options"]],
+                         [(name, ordinals)
+                          for name, ordinals in index_dict["categories"]],
+                         index_dict["postings"])
+
+    def to_dict(self):
+        """
+        :return: the index as a dictionary of plain values - so it can be persisted
+        as JSON
+        """
+        return {"options": [opt.to_dict() for opt in self._options],
+                "categories": [[name, ordinals]
+                               for name, ordinals in self._categories],
+                "postings": self._postings}
+
+    @property
+    def has_options(self):
+        return len(self._options) > 0
+
+    @property
+    def category_names(self):
+        """
+        :return: the names of the categories that have a name, and options shown
+        in usage instructions - so not only internal options
+        """
+        return [name for name, ordinals in self._categories
+                if name and len(str(name).strip()) > 0
+                and any(not self._options[ordinal].is_internal
+                        for ordinal in ordinals)]
+
+    def has_long_key(self, long_key):
+        """
+        :return: True if the spec defines an option with the passed long key
+        """
+        return any(opt.long_key == long_key for opt in self._options)
+
+    def search(self, term):
+        """
+        Finds the options whose keys, hint, or help text contain - for every word in
+        the passed term - a word starting with it. So 'recurs' matches 'recursion'.
+        Case is ignored. Internal options are never matched, since they aren't shown
+        in usage instructions.
+
+        :param term: the search term. E.g. 'depth', or '--file-name'
+
+        :return: a list of OptCategory objects holding the matching options - in
+        the order they're defined in the spec. Categories with no matching options
+        are omitted
+        """
+        matched = None
+        for word in HelpIndex._WORD.findall(term.lower()):
+            ordinals = self._prefixed(word)
+            matched = ordinals if matched is None else matched & ordinals
+            if not matched:
+                return []
+        if not matched:
+            return []
+        return self._select(lambda ignore, ordinal: ordinal in matched)
+
+    def category(self, name):
+        """
+        :param name: a category name. Case and surrounding spaces are ignored
+
+        :return: a list holding the OptCategory with the passed name, or an empty
+        list if there is no such category
+        """
+        name = name.strip().lower()
+        return self._select(lambda category_name, ignore: category_name is not None
+                            and str(category_name).strip().lower() == name)
+
+    def _select(self, selector):
+        """
+        :param selector: a function of (category name, option ordinal) returning
+        True to select the option
+
+        :return: a list of OptCategory objects holding the selected options
+        """
+        to_return = []
+        for name, ordinals in self._categories:
+            opt_cat = OptCategory(name)
+            for ordinal in ordinals:
+                opt = self._options[ordinal]
+                if not opt.is_internal and selector(name, ordinal):
+                    opt_cat.options.append(opt)
+            if opt_cat.options:
+                to_return.append(opt_cat)
+        return to_return
+
+    def _prefixed(self, prefix):
+        """
+        :return: the set of ordinals of the options containing a word starting with
+        the passed prefix. The indexed words are sorted, so the words starting with
+        the prefix are adjacent
+        """
+        ordinals = set()
+        i = bisect.bisect_left(self._words, prefix)
+        while i < len(self._words) and self._words[i].startswith(prefix):
+            ordinals.update(self._postings[self._words[i]])
+            i += 1
+        return ordinals
+
+    @staticmethod
+    def _build_postings(options):
+        """
+        :return: a dictionary mapping each word in the keys, hint and help text of
+        the passed options to the ordinals of the options containing it
+        """
+        postings = {}
+        for ordinal, opt in enumerate(options):
+            text = " ".join(str(field) for field in
+                            [opt.short_key, opt.long_key, opt.opt_hint,
+                             opt.help_text] if field)
+            for word in set(HelpIndex._WORD.findall(text.lower())):
+                postings.setdefault(word, []).append(ordinal)
+        return postings
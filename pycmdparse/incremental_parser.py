@@ -0,0 +1,319 @@
+import io
+import shlex
+
+from pycmdparse.errorkind_enum import ErrorKindEnum
+from pycmdparse.multitype_enum import MultiTypeEnum
+from pycmdparse.opt_table import OptTable
+from pycmdparse.param_opt import ParamOpt
+from pycmdparse.parse_error import ParseError
+from pycmdparse.parseresult_enum import ParseResultEnum
+from pycmdparse.splitter import Splitter
+from pycmdparse.stack import Stack
+
+
+class IncrementalParser:
+    """
+    Re-parses a command line as it is edited - e.g. on each keystroke in an
+    interactive console that underlines errors and offers hints. The spec is loaded,
+    and the options built, once. The parse state is kept per token, so when the
+    line is edited, only the args from the first edited one on are lexed again, and
+    only the tokens from the first changed one on are parsed again: the options are
+    restored to their state before that token, and parsing resumes there. The
+    options are then validated, like 'CmdLine.parse' does.
+
+    Usage:
+
+        parser = IncrementalParser(MyCmdLine)
+        parse_result = parser.update("my-util -v --file")
+        pending = parser.pending_param()
+        parse_result = parser.update("my-util -v --file foo.txt")
+    """
+
+    __slots__ = ("_cmdline", "_table", "_options", "_line", "_words", "_tokens",
+                 "_token_words", "_steps", "_errors", "_final_states", "_result")
+
+    def __init__(self, cmdline):
+        """
+        Initializes the instance. Resets the passed class, and builds its options
+        from the yaml
+
+        :param cmdline: a CmdLine subclass. Like 'parse', 'update' sets the class
+        fields - the errors, positional params, and option fields
+        """
+        cmdline.reset()
+        cmdline._init_from_yaml()
+        self._cmdline = cmdline
+        self._table = cmdline._opt_table if cmdline._opt_table is not None \
+            else OptTable([])
+        # all the options are created, to offer them as completions
+        self._options = self._table.options()
+        self._line = None
+        self._words = []
+        """
+        A (arg, start offset, end offset, tokens) tuple for each arg in the line, as
+        lexed by shlex. 'tokens' are the tokens the arg is split into
+        """
+        self._tokens = []
+        """The tokens of all the args - i.e. the command line stack, as a list"""
+        self._token_words = []
+        """For each token, the index in '_words' of the arg it was split from"""
+        self._steps = []
+        """
+        A (start, end, horizon, option, state, error count, parse result) tuple for
+        each token parsed by 'CmdLine._parse_token'. 'start' and 'end' are the
+        indexes of the tokens the step consumed. 'horizon' bounds the tokens the
+        step looked at: the step is still valid if the tokens before the horizon
+        are unchanged. 'option' is the option the token was dispatched to - or None
+        - and 'state' is that option's state before the step. 'error count' is the
+        number of errors recorded before the step
+        """
+        self._errors = []
+        """The errors recorded by the steps"""
+        self._final_states = []
+        """(option, state) tuples, to undo the final validation of the options"""
+        self._result = None
+
+    @property
+    def line(self):
+        return self._line
+
+    @property
+    def tokens(self):
+        return self._tokens
+
+    @property
+    def errors(self):
+        """
+        :return: the errors found parsing the line - a list of ParseError objects.
+        Could be empty. Never None
+        """
+        return list(self._cmdline._parse_errors) if self._cmdline._parse_errors \
+            else []
+
+    def update(self, line):
+        """
+        Parses the passed command line, re-using the parse of the previous line up
+        to the first token that was changed
+
+        :param line: the command line as a string, starting with the utility name -
+        like a string passed to 'CmdLine.parse'
+
+        :return: a ParseResultEnum, as returned by 'CmdLine.parse'
+        """
+        if line == self._line:
+            return self._result
+        cls = self._cmdline
+        for option, state in self._final_states:
+            option._restore_state(state)
+        self._final_states = []
+        old_tokens = self._tokens
+        self._relex(line)
+        unchanged = 0
+        for old_token, token in zip(old_tokens, self._tokens):
+            if old_token != token:
+                break
+            unchanged += 1
+        keep = len(self._steps)
+        while keep > 0 and self._steps[keep - 1][2] > unchanged:
+            keep -= 1
+        if keep < len(self._steps):
+            for step in reversed(self._steps[keep:]):
+                if step[3]:
+                    step[3]._restore_state(step[4])
+            self._errors = self._errors[0:self._steps[keep][5]]
+            self._steps = self._steps[0:keep]
+        cls._parse_errors = list(self._errors) if self._errors else None
+        if cls._positional_params:
+            cls._positional_params.params = []
+        self._line = line
+        self._result = self._resume()
+        return self._result
+
+    def token_span(self, token_index):
+        """
+        :param token_index: the index of a token - e.g. from a ParseError. The
+        utility name is token zero
+
+        :return: a (start, end) tuple: the offsets in the line of the arg the token
+        was split from - e.g. to underline an error. None if there is no such token
+        """
+        if token_index is None or not 0 <= token_index < len(self._token_words):
+            return None
+        ignore, start, end, ignore = self._words[self._token_words[token_index]]
+        return start, end
+
+    def pending_param(self):
+        """
+        :return: if the line ends with an option that can take more params, then a
+        tuple: element zero is the option, and element one is the number of params
+        it can still take - or None if there's no limit. Otherwise None
+        """
+        if not self._steps:
+            return None
+        start, end, ignore, option, ignore, ignore, result = self._steps[-1]
+        if not isinstance(option, ParamOpt) or result is ParseResultEnum.SUCCESS \
+                or max(end, start + 1) < len(self._tokens):
+            return None
+        if option.multi_type is MultiTypeEnum.NO_LIMIT:
+            return option, None
+        remaining = option.count - len(option._value)
+        return (option, remaining) if remaining > 0 else None
+
+    def valid_options(self):
+        """
+        :return: the options that can be supplied next - a list of AbstractOpt
+        objects. Empty in the positional params, and while an option still needs an
+        exact count of params. Internal options, and bool options already supplied,
+        are omitted
+        """
+        if self._steps and self._steps[-1][6] is ParseResultEnum.SUCCESS:
+            return []
+        pending = self.pending_param()
+        if pending and pending[0].multi_type is MultiTypeEnum.EXACTLY:
+            return []
+        return [opt for opt in self._options if not opt.is_internal
+                and not (opt.supplied_key and not isinstance(opt, ParamOpt))]
+
+    def _resume(self):
+        """
+        Parses the tokens after the retained steps, then validates the options
+
+        :return: a ParseResultEnum
+        """
+        cls = self._cmdline
+        stack = Stack(self._tokens)
+        if stack.size() <= 1 and cls._require_args:
+            cls._append_error(ParseError(ErrorKindEnum.REQUIRE_ARGS,
+                                         "At least one option or param is "
+                                         "required"))
+            return ParseResultEnum.PARSE_ERROR
+        position = self._steps[-1][1] if self._steps else 1
+        for i in range(min(position, stack.size())):
+            stack.pop()
+        parse_result = self._steps[-1][6] if self._steps else None
+        if self._options and parse_result is None:
+            while stack.size() > 0:
+                start = stack.position()
+                option = self._table.lookup(stack.peek())
+                state = option._save_state() if option else None
+                error_count = len(cls._parse_errors) if cls._parse_errors else 0
+                token = stack.peek()
+                value = not token.startswith("-") or token == "-"
+                parse_result = cls._parse_token(stack, self._table, set())
+                end = stack.position()
+                if parse_result is ParseResultEnum.SUCCESS or (value and not option):
+                    # the step handled the positional params, or checked the rest
+                    # of the line for options
+                    horizon = len(self._tokens) + 1
+                else:
+                    # an option can look at the token after those it consumed
+                    horizon = max(end, start + 1) + 1
+                self._steps.append((start, end, horizon, option, state,
+                                    error_count, parse_result))
+                if parse_result:
+                    break
+        self._errors = list(cls._parse_errors) if cls._parse_errors else []
+        if parse_result is ParseResultEnum.SUCCESS:
+            # the positional params were reached
+            parse_result = None
+        if not parse_result:
+            parse_result = cls._parse_remaining(stack)
+        if parse_result:
+            return parse_result
+        touched = {step[3] for step in self._steps if step[3]}
+        if cls.parse_settings.config_files or cls.parse_settings.config_option:
+            # options not on the line can be set from config files
+            touched = set(self._options)
+        elif cls._env_options:
+            # options not on the line can be set from the environment
+            touched.update(self._table.option(index)
+                           for index in cls._env_options.values())
+        self._final_states = [(option, option._save_state()) for option in touched]
+        failed = {error.option for error in self._errors
+                  if error.kind is ErrorKindEnum.OPTION_ERROR}
+        return cls._validate_parse(self._table, failed)
+
+    def _relex(self, line):
+        """
+        Lexes the passed line into args and tokens - re-using the args of the
+        previous line that end before the first changed character
+        """
+        changed = 0
+        if self._line is not None:
+            for old_char, char in zip(self._line, line):
+                if old_char != char:
+                    break
+                changed += 1
+        kept = 0
+        while kept < len(self._words) and self._words[kept][2] < changed:
+            kept += 1
+        offset = self._words[kept - 1][2] if kept else 0
+        self._words = self._words[0:kept]
+        in_positional_params = not self._options \
+            or any(word[0] == "--" for word in self._words)
+        for word, start, end in IncrementalParser._lex(line, offset):
+            if in_positional_params or word == "--":
+                tokens = [word]
+                in_positional_params = True
+            else:
+                tokens = Splitter.split_arg(word)
+            self._words.append((word, start, end, tokens))
+        self._tokens = []
+        self._token_words = []
+        for i, word in enumerate(self._words):
+            self._tokens.extend(word[3])
+            self._token_words.extend([i] * len(word[3]))
+
+    @staticmethod
+    def _lex(line, offset):
+        """
+        Splits the passed line like shlex.split, keeping the offsets of each arg.
+        An unclosed quote - as when the line is being typed - is closed at the end
+        of the line, rather than being an error.
+
+        :param line: the command line
+        :param offset: the offset to start at. Must not be inside an arg
+
+        :return: a list of (arg, start offset, end offset) tuples
+        """
+        to_return = []
+        text = line[offset:]
+        lexer = shlex.shlex(io.StringIO(text), posix=True)
+        lexer.whitespace_split = True
+        lexer.commenters = ""
+        while True:
+            start = lexer.instream.tell()
+            while start < len(text) and text[start] in lexer.whitespace:
+                start += 1
+            try:
+                word = lexer.get_token()
+            except ValueError:
+                word = IncrementalParser._close_quote(text[start:])
+                to_return.append((word, offset + start, len(line)))
+                break
+            if word is None:
+                break
+            # the lexer consumes the whitespace that ends an arg
+            end = lexer.instream.tell() if lexer.state is None \
+                else lexer.instream.tell() - 1
+            to_return.append((word, offset + start, offset + end))
+        return to_return
+
+    @staticmethod
+    def _close_quote(text):
+        """
+        :param text: an arg that shlex can't split, because of an unclosed quote or
+        a trailing escape
+
+        :return: the arg, lexed as though the quote were closed
+        """
+        # a trailing escape is dropped, rather than escaping an added quote
+        candidates = [text[0:-1]] if text.endswith("\\") else []
+        for candidate in candidates + [text + '"', text + "'"]:
+            try:
+                words = shlex.split(candidate)
+            except ValueError:
+                continue
+            if len(words) == 1:
+                return words[0]
+        return text
@@ -0,0 +1,24 @@
+class LazyField:
+    """
+    Injected into a CmdLine subclass, in place of the value of an option whose
+    default is computed by a callable (see DefaultCall) - so the callable is only
+    called if the utility reads the field. This is a descriptor, so reading the
+    field reads the option value.
+    """
+
+    __slots__ = ("_option",)
+
+    def __init__(self, option):
+        """
+        Initializes the instance
+
+        :param option: the option whose value the field holds
+        """
+        self._option = option
+
+    @property
+    def value(self):
+        return self._option.value
+
+    def __get__(self, obj, objtype=None):
+        return self._option.value
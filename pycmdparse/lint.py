@@ -0,0 +1,231 @@
+import sys
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.completion import Completion
+from pycmdparse.default_call import DefaultCall
+from pycmdparse.opt_factory import OptFactory
+from pycmdparse.parseresult_enum import ParseResultEnum
+from pycmdparse.positional_params import PositionalParams
+from pycmdparse.subcommand import Subcommand
+
+
+class Lint:
+    """
+    Checks a utility's spec for problems - so they can be found when the spec is
+    written, or in CI, rather than by a user. Reports all the problems in the spec,
+    where 'CmdLine.parse' raises an exception for the first one it finds. As well
+    as the checks done when the options are built (see CmdLine._check_options),
+    creates every option - which a parse only does for the options it uses (see
+    OptTable) - and finds entries the parser doesn't know - e.g. misspelled keys,
+    which are otherwise ignored - and entries that have no effect.
+    """
+
+    SECTIONS = ["utility", "summary", "usage", "positional_params",
+                "supported_options", "subcommands", "details", "examples",
+                "addendum"]
+    """The top-level entries of a spec"""
+
+    UTILITY_KEYS = ["name", "require_args", "env_prefix"]
+    """The entries of the 'utility' section"""
+
+    POSITIONAL_PARAMS_KEYS = ["params", "text", "stdin", "stdin_delimiter"]
+    """The entries of the 'positional_params' section"""
+
+    SUBCOMMAND_KEYS = ["name", "summary", "cmdline"]
+    """The entries of a subcommand"""
+
+    OPTION_KEYS = ["name", "short", "long", "hint", "opt", "required", "internal",
+                   "default", "default_call", "datatype", "multi_type", "count",
+                   "help", "env"]
+    """The entries of an option"""
+
+    @staticmethod
+    def lint(cmdline):
+        """
+        :param cmdline: a CmdLine subclass. (See Completion.load_cmdline)
+
+        :return: a list of messages describing the problems in the spec. Empty if
+        there are none
+        """
+        try:
+            parsed = cmdline._load_spec()
+        except CmdLineException as e:
+            return [e.args[0]]
+        if not isinstance(parsed, dict):
+            return ["The spec must be a mapping of sections"]
+        problems = Lint._unknown_keys("Unknown section", parsed, Lint.SECTIONS)
+        utility = parsed.get("utility")
+        if isinstance(utility, dict):
+            problems += Lint._unknown_keys("Unknown utility entry", utility,
+                                           Lint.UTILITY_KEYS)
+        positional_params = parsed.get("positional_params")
+        if isinstance(positional_params, dict):
+            problems += Lint._unknown_keys("Unknown positional_params entry",
+                                           positional_params,
+                                           Lint.POSITIONAL_PARAMS_KEYS)
+            delimiter = positional_params.get("stdin_delimiter")
+            if delimiter is not None \
+                    and delimiter not in PositionalParams.STDIN_DELIMITERS:
+                problems.append("Unknown stdin_delimiter: '{}'".format(delimiter))
+        env_prefix = utility.get("env_prefix") if isinstance(utility, dict) \
+            else None
+        options = []
+        for category in parsed.get("supported_options") or []:
+            if not isinstance(category, dict) \
+                    or not isinstance(category.get("options"), list):
+                problems.append("A category must have a list of options: {}"
+                                .format(category))
+                continue
+            for opt_dict in category.get("options"):
+                problems += Lint._lint_option(opt_dict, env_prefix, cmdline, options)
+        problems += CmdLine._check_options(
+            [(option.opt_name, option.short_key, option.long_key)
+             for option in options])
+        env_names = set()
+        for option in options:
+            if option.env_name in env_names:
+                problems.append("Env name '{}' is used by more than one option"
+                                .format(option.env_name))
+            elif option.env_name:
+                env_names.add(option.env_name)
+        if parsed.get("subcommands") is not None:
+            problems += Lint._lint_subcommands(parsed, cmdline)
+        return problems
+
+    @staticmethod
+    def _lint_subcommands(parsed, cmdline):
+        """
+        Checks the subcommands section. The subcommands' CmdLine subclasses are
+        resolved - so misspelled names are found - but their specs aren't checked.
+        (Lint each subclass for that.)
+
+        :param parsed: the spec, as loaded by the yaml parser
+        :param cmdline: the CmdLine subclass
+
+        :return: a list of messages describing the problems with the subcommands
+        """
+        subcommands = parsed.get("subcommands")
+        if not isinstance(subcommands, list):
+            return ["The subcommands section must be a list of subcommands"]
+        problems = []
+        if parsed.get("positional_params"):
+            problems.append("A spec can't define both positional_params and "
+                            "subcommands")
+        names = set()
+        for sub_dict in subcommands:
+            if isinstance(sub_dict, dict):
+                problems += Lint._unknown_keys(
+                    "Subcommand '{}': unknown entry".format(sub_dict.get("name")),
+                    sub_dict, Lint.SUBCOMMAND_KEYS)
+            try:
+                subcommand = Subcommand(sub_dict, cmdline)
+                # checks the class can be found - without loading its spec
+                subcommand._resolve()
+            except CmdLineException as e:
+                problems.append(e.args[0])
+                continue
+            if subcommand.name in names:
+                problems.append("Subcommand '{}' is defined more than once"
+                                .format(subcommand.name))
+            names.add(subcommand.name)
+        return problems
+
+    @staticmethod
+    def _lint_option(opt_dict, env_prefix, cmdline, options):
+        """
+        Checks an option's entries, and builds the option
+
+        :param opt_dict: the option, as loaded by the yaml parser
+        :param env_prefix: the utility 'env_prefix' entry
+        :param cmdline: the CmdLine subclass
+        :param options: a list. The option is appended to it, if it can be built
+
+        :return: a list of messages describing the problems with the option
+        """
+        if not isinstance(opt_dict, dict):
+            return ["An option must be a mapping of entries: {}".format(opt_dict)]
+        label = next((opt_dict.get(key) for key in ["name", "long", "short"]
+                      if opt_dict.get(key)), "?")
+        problems = Lint._unknown_keys("Option '{}': unknown entry".format(label),
+                                      opt_dict, Lint.OPTION_KEYS)
+        try:
+            option = OptFactory.create_option(opt_dict, env_prefix, cmdline)
+        except CmdLineException as e:
+            return problems + ["Option '{}': {}".format(label, e.args[0])]
+        except Exception as e:
+            return problems + ["Option '{}': invalid: {}".format(label, e)]
+        options.append(option)
+        if option.required and (opt_dict.get("default") is not None
+                                or opt_dict.get("default_call")):
+            problems.append("Option '{}': a required option's default is ignored"
+                            .format(label))
+        if opt_dict.get("default_call") and not option.required:
+            # checks the callable can be found - without calling it
+            try:
+                DefaultCall(opt_dict.get("default_call"), cmdline)._resolve()
+            except CmdLineException as e:
+                problems.append("Option '{}': {}".format(label, e.args[0]))
+        return problems
+
+    @staticmethod
+    def _unknown_keys(message, entries, known):
+        """
+        :return: a message for each key in 'entries' that isn't in 'known'
+        """
+        return ["{}: '{}'".format(message, key) for key in entries
+                if key not in known]
+
+
+class LintCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: python -m pycmdparse lint
+      require_args: true
+
+    summary: >
+      Checks the specs of utilities that use pycmdparse for problems, and lists
+      them. Exits with status 1 if a spec has problems.
+
+    usage: >
+      python -m pycmdparse lint SPEC...
+
+    positional_params:
+      params: SPEC...
+      text: >
+        A SPEC is a utility script that defines a CmdLine subclass - like the
+        scripts in the pycmdparse 'example' directory - or a yaml file holding
+        the utility's spec.
+
+    supported_options:
+      - category:
+        options:
+        - name      : quiet
+          short     : q
+          long      : quiet
+          opt       : bool
+          help: >
+            Only list problems - don't list specs that have none.
+    '''
+
+    quiet = None
+
+
+def main(argv):
+    parse_result = LintCmdLine.parse(argv)
+    if parse_result.value != ParseResultEnum.SUCCESS.value:
+        LintCmdLine.display_info(parse_result)
+        return 1
+    status = 0
+    for spec in LintCmdLine.positional_params:
+        try:
+            problems = Lint.lint(Completion.load_cmdline(spec))
+        except (OSError, CmdLineException) as e:
+            problems = [str(e)]
+        for problem in problems:
+            sys.stdout.write("{}: {}\n".format(spec, problem))
+        if problems:
+            status = 1
+        elif not LintCmdLine.quiet:
+            sys.stdout.write("{}: ok\n".format(spec))
+    return status
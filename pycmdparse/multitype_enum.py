@@ -20,11 +20,12 @@ class MultiTypeEnum(Enum):
     def fromstr(enum_str):
         if not enum_str:
             return MultiTypeEnum.EXACTLY
-        elif enum_str.lower() == "exactly":
+        lowered = enum_str.lower()
+        if lowered == "exactly":
             return MultiTypeEnum.EXACTLY
-        elif enum_str.lower() == "at-most":
+        elif lowered == "at-most":
             return MultiTypeEnum.AT_MOST
-        elif enum_str.lower() == "no-limit":
+        elif lowered == "no-limit":
             return MultiTypeEnum.NO_LIMIT
         else:
             raise CmdLineException("Unknown param type: {}".format(enum_str))
@@ -5,9 +5,23 @@ class OptCategory:
     then no category prints in the usage instructions. Otherwise the options are
     grouped in the usage instructions using the supplied category.
     """
-    def __init__(self, category):
+
+    __slots__ = ("_category", "_options", "_table", "_indices")
+
+    def __init__(self, category, table=None, indices=None):
+        """
+        Initializes the instance
+
+        :param category: the category description, or None
+        :param table: Optional. An OptTable holding the category's options, which
+        are then only created when 'options' is first read. If None, then options
+        are appended to 'options'
+        :param indices: the indices in the table of the category's options
+        """
         self._category = category
         self._options = []
+        self._table = table
+        self._indices = indices
 
     @property
     def category(self):
@@ -15,4 +29,7 @@ class OptCategory:
 
     @property
     def options(self):
+        if self._table is not None:
+            self._options = [self._table.option(index) for index in self._indices]
+            self._table = None
         return self._options
@@ -1,6 +1,7 @@
 from pycmdparse.bool_opt import BoolOpt
 from pycmdparse.cmdline_exception import CmdLineException
 from pycmdparse.datatype_enum import DataTypeEnum
+from pycmdparse.default_call import DefaultCall
 from pycmdparse.multitype_enum import MultiTypeEnum
 from pycmdparse.param_opt import ParamOpt
 
@@ -27,13 +28,17 @@ class OptFactory:
     """
 
     @staticmethod
-    def create_option(opt_dict):
+    def create_option(opt_dict, env_prefix=None, cmdline=None):
         """
         Creates a specific sub-class of 'AbstractOpt' based on the "opt" dictionary
         value in the passed dictionary
 
         :param opt_dict: A dictionary provided by the yaml parser, representing the
         spec for an option
+        :param env_prefix: Optional. Prepended to the name of the option's
+        environment variable, if it has one. (See '_env_name')
+        :param cmdline: the CmdLine subclass defining the option - in which a
+        'default_call' entry can name a class method
 
         :return: a subclass of 'AbstractOpt' based on the passed dictionary "opt" entry
         value. If the dictionary doesn't contain an opt entry, then a PARAM type is
@@ -44,17 +49,54 @@ class OptFactory:
         value that is not a known option type. (See OptFactory.KNOWN_OPTION_TYPES)
         """
 
+        return OptFactory._new_option(OptFactory.check_spec(opt_dict), opt_dict,
+                                      env_prefix, cmdline)
+
+    @staticmethod
+    def check_spec(opt_dict):
+        """
+        Does the checks of an option spec that don't need the option to be created:
+        the option type, and its default entries
+
+        :param opt_dict: A dictionary provided by the yaml parser, representing the
+        spec for an option
+
+        :return: the option type. (See 'option_type')
+
+        :raises: CmdLineException if the option type is unknown, or the default
+        entries conflict
+        """
+        option_type = OptFactory.option_type(opt_dict)
+        default_call = opt_dict.get("default_call")
+        if default_call is not None:
+            if option_type == OptFactory.BOOL_OPT:
+                raise CmdLineException("Bool options can't have a default_call")
+            if opt_dict.get("default"):
+                raise CmdLineException("Option can't have both a default and a "
+                                       "default_call: {}".format(default_call))
+        return option_type
+
+    @staticmethod
+    def option_type(opt_dict):
+        """
+        :param opt_dict: A dictionary provided by the yaml parser, representing the
+        spec for an option
+
+        :return: the option type - the "opt" dictionary value, or PARAM_OPT if the
+        dictionary doesn't contain an opt entry
+
+        :raises: CmdLineException if the "opt" entry value is not a known option type
+        """
         option_type = opt_dict.get(OptFactory.OPT_KEY)
         if not option_type:
             option_type = OptFactory.PARAM_OPT
-        if option_type in OptFactory.KNOWN_OPTION_TYPES:
-            return OptFactory._new_option(option_type, opt_dict)
-        else:
+        if option_type not in OptFactory.KNOWN_OPTION_TYPES:
             raise CmdLineException("Unknown option type: {}".format(
                 option_type))
+        return option_type
 
     @staticmethod
-    def _new_option(opt_type, opt_dict):
+    def _new_option(opt_type, opt_dict, env_prefix=None, cmdline=None):
         """
         Actually creates an 'AbstractOpt' subclass object
 
@@ -63,6 +105,8 @@ class OptFactory:
         is performed by the caller. :param opt_dict: a dictionary from the yaml parser,
         built from the yaml defining an option. Missing entries are passed to the
         subclass constructor as None.
+        :param env_prefix: see 'create_option'
+        :param cmdline: see 'create_option'
 
         :return: the created object
         """
@@ -76,18 +120,56 @@ class OptFactory:
         default = opt_dict.get("default")
         data_type = DataTypeEnum.fromstr(opt_dict.get("datatype"))
         help_text = opt_dict.get("help")
+        env_name = OptFactory._env_name(opt_dict, env_prefix)
+
+        default_call = DefaultCall(opt_dict.get("default_call"), cmdline) \
+            if opt_dict.get("default_call") is not None else None
 
         if opt_type == OptFactory.BOOL_OPT:
             return BoolOpt(opt_name, short_key, long_key, opt_hint, required,
-                           is_internal, help_text)
+                           is_internal, help_text, env_name)
         else:  # param
-            multi_type = MultiTypeEnum.fromstr(opt_dict.get("multi_type"))
-            if not multi_type:
-                multi_type = MultiTypeEnum.EXACTLY
-            count = opt_dict.get("count")
-            if not count and multi_type in [MultiTypeEnum.EXACTLY,
-                                            MultiTypeEnum.AT_MOST]:
-                count = 1
+            multi_type, count = OptFactory._multi_type_and_count(opt_dict)
             return ParamOpt(opt_name, short_key, long_key, opt_hint, required,
                             is_internal, default, multi_type, count, data_type,
-                            help_text)
+                            help_text, env_name, default_call)
+
+    @staticmethod
+    def _multi_type_and_count(opt_dict):
+        """
+        :param opt_dict: a dictionary from the yaml parser, defining a param option
+
+        :return: a tuple of the option's MultiTypeEnum - EXACTLY if not specified -
+        and its count - one if not specified, for EXACTLY and AT_MOST
+        """
+        multi_type = MultiTypeEnum.fromstr(opt_dict.get("multi_type"))
+        if not multi_type:
+            multi_type = MultiTypeEnum.EXACTLY
+        count = opt_dict.get("count")
+        if not count and multi_type in [MultiTypeEnum.EXACTLY,
+                                        MultiTypeEnum.AT_MOST]:
+            count = 1
+        return multi_type, count
+
+    @staticmethod
+    def _env_name(opt_dict, env_prefix):
+        """
+        Gets the name of the environment variable for an option, from its "env"
+        entry. If the entry is true, then the name is derived from the option name -
+        like the injected field name, but upper case. E.g. for option '--log-level',
+        "LOG_LEVEL"
+
+        :param opt_dict: a dictionary from the yaml parser, defining an option
+        :param env_prefix: prepended to the name, if not None
+
+        :return: the name, or None if the option doesn't have an "env" entry
+        """
+        env = opt_dict.get("env")
+        if not env:
+            return None
+        if env is True:
+            env = next((opt_dict.get(key) for key in ["name", "long", "short"]
+                        if opt_dict.get(key)), "").replace("-", "_").upper()
+        elif not isinstance(env, str):
+            raise CmdLineException("Invalid env name: {}".format(env))
+        return (env_prefix if env_prefix else "") + env
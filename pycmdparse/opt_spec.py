@@ -0,0 +1,84 @@
+from pycmdparse.abstract_opt import AbstractOpt
+
+
+class OptSpec:
+    """
+    The raw spec for an option, as defined in the yaml, holding only what is needed
+    to render the option in usage instructions. Unlike the AbstractOpt subclasses
+    that OptFactory creates to parse the command line, creating an OptSpec doesn't
+    validate the option's default value, or convert it to the option's data type -
+    so usage instructions can be rendered without building the options.
+    """
+
+    __slots__ = ("_opt_name", "_short_key", "_long_key", "_opt_hint", "_help_text",
+                 "_required", "_is_internal", "_keys_and_hint", "_usage_help")
+
+    def __init__(self, opt_dict):
+        """
+        Initializes the instance
+
+        :param opt_dict: A dictionary provided by the yaml parser, representing the
+        spec for an option - or, a dictionary returned by 'to_dict'
+        """
+        opt_name = next((opt_dict.get(key) for key in ["name", "long", "short"]
+                         if opt_dict.get(key)), None)
+        self._opt_name = opt_name.replace('-', '_') if opt_name else None
+        self._short_key = opt_dict.get("short")
+        self._long_key = opt_dict.get("long")
+        self._opt_hint = opt_dict.get("hint")
+        self._help_text = opt_dict.get("help")
+        self._required = opt_dict.get("required")
+        self._is_internal = opt_dict.get("internal")
+        self._keys_and_hint = AbstractOpt._format_keys_and_hint(
+            self._short_key, self._long_key, self._opt_hint)
+        self._usage_help = AbstractOpt._prepend_required(self._help_text,
+                                                         self._required)
+
+    @property
+    def opt_name(self):
+        return self._opt_name
+
+    @property
+    def short_key(self):
+        return self._short_key
+
+    @property
+    def long_key(self):
+        return self._long_key
+
+    @property
+    def opt_hint(self):
+        return self._opt_hint
+
+    @property
+    def help_text(self):
+        return self._help_text
+
+    @property
+    def is_internal(self):
+        return self._is_internal
+
+    @property
+    def keys_and_hint(self):
+        """
+        See AbstractOpt.keys_and_hint
+        """
+        return self._keys_and_hint
+
+    @property
+    def usage_help(self):
+        """
+        See AbstractOpt.usage_help
+        """
+        return self._usage_help
+
+    def to_dict(self):
+        """
+        :return: the spec as a dictionary of plain values - so it can be persisted
+        as JSON. The dictionary can be passed to the initializer to re-create the
+        spec
+        """
+        return {"name": self._opt_name, "short": self._short_key,
+                "long": self._long_key, "hint": self._opt_hint,
+                "help": self._help_text, "required": self._required,
+                "internal": self._is_internal}
@@ -0,0 +1,208 @@
+import re
+
+from pycmdparse.abstract_opt import AbstractOpt
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.lazy_field import LazyField
+from pycmdparse.multitype_enum import MultiTypeEnum
+from pycmdparse.opt_factory import OptFactory
+
+
+class OptTable:
+    """
+    The options of a spec, kept as the dictionaries loaded by the yaml parser until
+    they're referenced. Auto-generated specs can define thousands of options, of
+    which an invocation uses a few - so rather than creating every option, and
+    validating and converting every default, when the spec is built, an option is
+    created the first time it's needed: when its key is on the command line, when
+    it's supplied by the environment or a config file, when it's required, or when
+    the result of a parse needs its default. Until then, the table only holds what's
+    needed to find the option: indexes of the options by key, by name, and by
+    environment variable. So indexing an option and dispatching a token each cost
+    a dictionary operation, and parse cost scales with the options used rather
+    than the options defined.
+
+    Only the checks that don't need the option to be created are done when the
+    table is built: the option type, the keys, and the default entries. (See
+    OptFactory.check_spec.) Other problems with an option - e.g. a default that
+    doesn't match its data type - are found when it's created: so for a default,
+    only once a parse gets as far as the result. ('python -m pycmdparse lint'
+    creates every option.)
+    """
+
+    KEY_PATTERN = re.compile("-{1,2}\\w")
+    """A token that can be an option key. (Triple-dash is ignored)"""
+
+    _CREATE = object()
+    """The unset value of an option that must be created to get its value"""
+
+    _EMPTY_LIST = object()
+    """The unset value of an option whose value is an empty list"""
+
+    __slots__ = ("_opt_dicts", "_env_prefix", "_cmdline", "_options", "_created",
+                 "_keys", "_by_key", "_by_name", "_env_options", "_required",
+                 "_unset")
+
+    def __init__(self, opt_dicts, env_prefix=None, cmdline=None):
+        """
+        Initializes the instance, indexing the options
+
+        :param opt_dicts: a list of dictionaries provided by the yaml parser, each
+        representing the spec for an option
+        :param env_prefix: see OptFactory.create_option
+        :param cmdline: see OptFactory.create_option
+
+        :raises: CmdLineException if an option has an unknown type, invalid keys,
+        or conflicting default entries - or if options have the same env name
+        """
+        self._opt_dicts = opt_dicts
+        self._env_prefix = env_prefix
+        self._cmdline = cmdline
+        self._options = [None] * len(opt_dicts)
+        self._created = []
+        self._keys = []
+        self._by_key = {}
+        self._by_name = {}
+        self._env_options = {}
+        self._required = []
+        self._unset = []
+        """
+        For each option, its value if it isn't supplied and has no default - or
+        _CREATE if it has a default, so it must be created to convert the default
+        """
+        for index, opt_dict in enumerate(opt_dicts):
+            option_type = OptFactory.check_spec(opt_dict)
+            short_key = opt_dict.get("short")
+            long_key = opt_dict.get("long")
+            AbstractOpt._check_keys(short_key, long_key)
+            opt_name = AbstractOpt._option_name(opt_dict.get("name"), long_key,
+                                                short_key)
+            self._keys.append((opt_name, short_key, long_key))
+            # the first option with a key gets it - as when the options were offered
+            # each token in order
+            for key in [short_key, long_key]:
+                if key:
+                    self._by_key.setdefault(key, index)
+            self._by_name.setdefault(opt_name, index)
+            env_name = OptFactory._env_name(opt_dict, env_prefix)
+            if env_name:
+                if env_name in self._env_options:
+                    raise CmdLineException(
+                        "Options '{}' and '{}' have the same env name: {}".format(
+                            self._keys[self._env_options[env_name]][0], opt_name,
+                            env_name))
+                self._env_options[env_name] = index
+            required = opt_dict.get("required")
+            if required:
+                self._required.append(index)
+            if option_type == OptFactory.BOOL_OPT:
+                self._unset.append(False)
+            elif not required and (opt_dict.get("default")
+                                   or opt_dict.get("default_call")):
+                # like ParamOpt - a default that is false isn't a default
+                self._unset.append(OptTable._CREATE)
+            else:
+                multi_type, count = OptFactory._multi_type_and_count(opt_dict)
+                self._unset.append(None if multi_type is MultiTypeEnum.EXACTLY
+                                   and count == 1 else OptTable._EMPTY_LIST)
+
+    def __len__(self):
+        return len(self._opt_dicts)
+
+    @property
+    def keys(self):
+        """
+        :return: a (name, short key, long key) tuple for each option, in spec order
+        """
+        return self._keys
+
+    @property
+    def env_options(self):
+        """
+        :return: the options that have an environment variable: a dictionary of
+        option indexes, keyed by variable name
+        """
+        return self._env_options
+
+    @property
+    def required(self):
+        """
+        :return: the indexes of the required options
+        """
+        return self._required
+
+    def option(self, index):
+        """
+        Gets an option - creating it, if it hasn't been created
+
+        :param index: the index of the option in the spec
+
+        :return: the option - an AbstractOpt subclass
+
+        :raises: CmdLineException if the option can't be created. (See OptFactory)
+        """
+        option = self._options[index]
+        if option is None:
+            option = OptFactory.create_option(self._opt_dicts[index],
+                                              self._env_prefix, self._cmdline)
+            self._options[index] = option
+            self._created.append(index)
+        return option
+
+    def lookup(self, token):
+        """
+        :param token: a token from the command line
+
+        :return: the option having the token as its short or long key, prefixed with
+        a dash or double dash - or None if no option has the key
+        """
+        if not OptTable.KEY_PATTERN.match(token):
+            return None
+        index = self._by_key.get(token.lstrip("-"))
+        return self.option(index) if index is not None else None
+
+    def get(self, opt_name):
+        """
+        :param opt_name: the name of an option
+
+        :return: the option, or None if there's no option with the name
+        """
+        index = self._by_name.get(opt_name)
+        return self.option(index) if index is not None else None
+
+    def created(self):
+        """
+        :return: the options that have been created, in spec order
+        """
+        return [self._options[index] for index in sorted(self._created)]
+
+    def options(self):
+        """
+        :return: all the options, in spec order - creating any that haven't been
+        created
+        """
+        return [self.option(index) for index in range(len(self._opt_dicts))]
+
+    def fields(self):
+        """
+        Gets the values of the options, to inject into the CmdLine subclass. An
+        option that hasn't been created wasn't supplied: if it has a default, it's
+        created to convert the default. Otherwise its value is known from its spec,
+        so it isn't created. (See AbstractOpt.value)
+
+        :return: a (name, value) tuple for each option, in spec order. If a value is
+        a default computed by a callable, then it's a LazyField - so the callable
+        is only called if the value is read
+        """
+        fields = []
+        unset = self._unset
+        for index, option in enumerate(self._options):
+            if option is None:
+                value = unset[index]
+                if value is not OptTable._CREATE:
+                    fields.append((self._keys[index][0], [] if value
+                                   is OptTable._EMPTY_LIST else value))
+                    continue
+                option = self.option(index)
+            fields.append((option.opt_name, LazyField(option)
+                           if option.default_pending else option.value))
+        return fields
@@ -0,0 +1,158 @@
+from pycmdparse.bool_opt import BoolOpt
+from pycmdparse.datatype_enum import DataTypeEnum
+from pycmdparse.lazy_field import LazyField
+from pycmdparse.multitype_enum import MultiTypeEnum
+
+
+class OptionValues:
+    """
+    The base of the classes generated to hold the option values of a parse - one
+    class per spec, with a slot per option. The values are read from the options
+    once, when the object is created, so reading a field is a plain slot read -
+    rather than a class attribute lookup, which checks the type of the class and
+    then each class in its MRO, or the default-vs-command line logic of an option's
+    'value'. The exception is an option whose default is computed by a callable
+    (see DefaultCall): its field is a property that computes the value the first
+    time it's read. The objects are read-only, like a named tuple.
+
+    Usage:
+
+        if MyCmdLine.parse(sys.argv) is ParseResultEnum.SUCCESS:
+            options = MyCmdLine.parse_info.result
+            for item in items:
+                if options.verbose:
+                    ...
+    """
+
+    __slots__ = ("_lazy", "_lazy_values")
+
+    _classes = {}
+    """The generated classes, keyed by (class name, field names, lazy field names)"""
+
+    TYPES = {DataTypeEnum.INT: "int", DataTypeEnum.DECIMAL: "float",
+             DataTypeEnum.DATE: "datetime.date", DataTypeEnum.BOOL: "bool"}
+    """The type of a param value, by data type, for typing stubs"""
+
+    def __init__(self, fields):
+        """
+        Initializes the instance
+
+        :param fields: (name, value) tuples - matching the fields of the class. A
+        value that is a LazyField is only read when the field is read
+        """
+        lazy = None
+        for name, value in fields:
+            if isinstance(value, LazyField):
+                if lazy is None:
+                    lazy = {}
+                lazy[name] = value
+            else:
+                object.__setattr__(self, name, value)
+        object.__setattr__(self, "_lazy", lazy)
+        object.__setattr__(self, "_lazy_values", {} if lazy else None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Option values are read-only")
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, ", ".join(
+            "{}={}".format(name, repr(getattr(self, name))) for name in self._fields))
+
+    def _asdict(self):
+        """
+        :return: the values as a dictionary, keyed by option name
+        """
+        return {name: getattr(self, name) for name in self._fields}
+
+    @staticmethod
+    def create(class_name, fields):
+        """
+        Creates an object holding the passed option values
+
+        :param class_name: the name of the generated class
+        :param fields: a (name, value) tuple per option - as returned by
+        OptTable.fields. One field is generated per tuple
+
+        :return: the object
+        """
+        return OptionValues.class_for(
+            class_name, [name for name, ignore in fields],
+            [name for name, value in fields if isinstance(value, LazyField)]
+        )(fields)
+
+    @staticmethod
+    def class_for(class_name, field_names, lazy_names=()):
+        """
+        Gets the generated class with the passed name and fields - or generates it
+
+        :param class_name: the name of the class
+        :param field_names: the names of the fields
+        :param lazy_names: the names of the fields whose values are computed when
+        first read. These are properties rather than slots - so the other fields
+        are read without calling any Python code
+
+        :return: a subclass of OptionValues with a slot per field
+        """
+        key = class_name, tuple(field_names), tuple(lazy_names)
+        generated = OptionValues._classes.get(key)
+        if generated is None:
+            namespace = {"__slots__": tuple(name for name in field_names
+                                            if name not in lazy_names),
+                         "_fields": key[1]}
+            for name in lazy_names:
+                namespace[name] = property(OptionValues._lazy_getter(name))
+            generated = type(class_name, (OptionValues,), namespace)
+            OptionValues._classes[key] = generated
+        return generated
+
+    @staticmethod
+    def _lazy_getter(name):
+        """
+        :return: a function that gets the value of the named lazy field - computing
+        it on the first call
+        """
+        def get(self):
+            values = self._lazy_values
+            try:
+                return values[name]
+            except KeyError:
+                value = values[name] = self._lazy[name].value
+                return value
+        return get
+
+    @staticmethod
+    def stub(class_name, options):
+        """
+        Generates a typing stub for the class generated for the passed options -
+        so IDEs and type checkers know the fields and their types
+
+        :param class_name: the name of the generated class
+        :param options: the options
+
+        :return: the stub - Python source defining a class with an annotated field
+        per option
+        """
+        types = [(option.opt_name, OptionValues._type(option)) for option in options]
+        imports = ["from typing import List, Optional"]
+        if any("datetime" in field_type for ignore, field_type in types):
+            imports.insert(0, "import datetime")
+        lines = ["# Generated by pycmdparse. The option values of a parse", ""]
+        lines += imports + ["", "", "class {}:".format(class_name)]
+        lines += ["    {}: {}".format(name, field_type) for name, field_type in types]
+        if not types:
+            lines.append("    pass")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _type(option):
+        """
+        :return: the type of an option's value, as an annotation
+        """
+        if isinstance(option, BoolOpt):
+            return "bool"
+        value_type = OptionValues.TYPES.get(option.data_type, "str")
+        if option.multi_type is MultiTypeEnum.EXACTLY and option.count == 1:
+            # None if not supplied, and there's no default
+            always_set = option.required or option.has_default
+            return value_type if always_set else "Optional[{}]".format(value_type)
+        return "List[{}]".format(value_type)
@@ -1,3 +1,5 @@
+import shlex
+
 from pycmdparse.abstract_opt import AbstractOpt
 from pycmdparse.cmdline_exception import CmdLineException
 from pycmdparse.multitype_enum import MultiTypeEnum
@@ -67,6 +69,8 @@ class ParamOpt(AbstractOpt):
     value: ['A','B','C']
     """
 
+    __slots__ = ("_multi_type", "_count", "_default_call")
+
     @property
     def multi_type(self):
         return self._multi_type
@@ -76,24 +80,69 @@ class ParamOpt(AbstractOpt):
         return self._count
 
     def __init__(self, opt_name, short_key, long_key, opt_hint, required, is_internal,
-                 default_value, multi_type, count, data_type, help_text):
+                 default_value, multi_type, count, data_type, help_text,
+                 env_name=None, default_call=None):
+        """
+        See AbstractOpt. In addition:
+
+        :param default_call: Optional. A DefaultCall that computes the default
+        value, in place of 'default_value'. It's only called when the default value
+        is read - e.g. if the utility reads the value of an option that wasn't
+        supplied
+        """
+        if default_call and default_value:
+            raise CmdLineException("Option can't have both a default and a "
+                                   "default_call: {}".format(default_call.name))
         # enforce the default value to be stored internally as a list
         if default_value and not isinstance(default_value, list):
             default_value = [default_value]
         super().__init__(opt_name, short_key, long_key, opt_hint, required,
-                         is_internal, default_value, data_type, help_text)
+                         is_internal, default_value, data_type, help_text, env_name)
         self._multi_type = multi_type if multi_type else MultiTypeEnum.EXACTLY
         self._count = 1 if not multi_type or not count else count
         self._value = []
-        # validate defaults against instance data type
-        if not self._ensure_data_type(self._default_value):
-            raise CmdLineException("Data type does not match specification: {}"
-                                   .format(self._default_value))
-        if self._default_value and \
-            self._multi_type in [MultiTypeEnum.AT_MOST, MultiTypeEnum.EXACTLY] \
-            and len(self._default_value) > self._count:
-            raise CmdLineException("Invalid defaults supplied: {}"
-                                   .format(self._default_value))
+        self._default_call = default_call if not required else None
+        if self._default_call:
+            # validated when it's called
+            self._initialized = True
+            return
+        self._validate_default(self._default_value)
+
+    @property
+    def default_value(self):
+        """
+        :return: the default value - a list - or None. If the default is computed
+        by a callable, then calls it the first time
+        """
+        if self._default_call:
+            default_value = self._default_call()
+            if default_value is not None and not isinstance(default_value, list):
+                default_value = [default_value]
+            # a copy, since the result of the callable is shared, and gets converted
+            default_value = list(default_value) if default_value else None
+            # the callable is kept until its result is valid - so every read of an
+            # invalid result raises
+            self._validate_default(default_value)
+            self._default_value = default_value
+            self._default_call = None
+        return self._default_value
+
+    @property
+    def has_default(self):
+        """
+        :return: True if the option has a default value - or a callable that
+        computes it. Doesn't call the callable
+        """
+        return self._default_call is not None or bool(self._default_value)
+
+    @property
+    def default_pending(self):
+        """
+        :return: True if the option value is the default, and the default is
+        computed by a callable that hasn't been called yet
+        """
+        return self._default_call is not None \
+            and not (self._initialized and self._from_cmdline)
 
     @property
     def value(self):
@@ -105,11 +154,29 @@ class ParamOpt(AbstractOpt):
         values - which could be empty.
         """
         to_return = self._value if self._initialized and self._from_cmdline \
-            else self._default_value
+            else self.default_value
         if self._multi_type is MultiTypeEnum.EXACTLY and self._count == 1:
             return to_return[0] if to_return and len(to_return) == 1 else None
         return [] if not to_return else to_return
 
+    def _validate_default(self, default_value):
+        """
+        Validates a default value against the data type, and the count - and
+        converts it to the data type
+
+        :param default_value: a list of default values, or None. Converted in place
+
+        :raises: CmdLineException if the default value is invalid
+        """
+        if not self._ensure_data_type(default_value):
+            raise CmdLineException("Data type does not match specification: {}"
+                                   .format(default_value))
+        if default_value and \
+            self._multi_type in [MultiTypeEnum.AT_MOST, MultiTypeEnum.EXACTLY] \
+            and len(default_value) > self._count:
+            raise CmdLineException("Invalid defaults supplied: {}"
+                                   .format(default_value))
+
     def _do_accept(self, stack):
         """
         Based on the multi-type, pull tokens from the command line to initialize
@@ -119,16 +186,17 @@ class ParamOpt(AbstractOpt):
         command line arg matching this option
 
         :return: A tuple. Element zero is OptAcceptResultEnum.ACCEPTED if no parse
-        errors, else OptAcceptResultEnum.ERROR. Element one is an error message if
-        element zero is ERROR
+        errors, else OptAcceptResultEnum.ERROR. Element one is an error message
+        format string if element zero is ERROR, and the remaining elements are the
+        format arguments
         """
-        if stack.size() < 2:
+        if not stack.at_least(2):
             return OptAcceptResultEnum.ERROR, "{}: requires a value, which "\
-                                              "was not supplied"\
-                .format(self._opt_name)
+                                              "was not supplied", self._opt_name
         self._supplied_key = stack.pop()
-        while stack.size() > 0:
-            if stack.peek().startswith("-")\
+        while not stack.is_empty():
+            token = stack.peek()
+            if token.startswith("-") and token != "-"\
                     and self._multi_type is not MultiTypeEnum.EXACTLY:
                 # next option terminates param collection unless it's an
                 # exact count param
@@ -140,6 +208,65 @@ class ParamOpt(AbstractOpt):
             self._value.append(stack.pop())
         return OptAcceptResultEnum.ACCEPTED,
 
+    def accept_env(self, value):
+        """
+        Takes the params from the option's environment variable. An option taking
+        one param takes the value as is. Otherwise the value is split like a command
+        line - e.g. "a 'b c'" is two params. The params are then validated and
+        converted by 'do_final_validate', like params from the command line.
+
+        :param value: the value of the variable
+
+        :return: OptAcceptResultEnum.ACCEPTED, or OptAcceptResultEnum.ERROR if the
+        value can't be split, or has more params than the option takes
+        """
+        return self._accept_params("$" + self._env_name, value)
+
+    def accept_config(self, value, path):
+        """
+        Takes the params from a config file. A list supplies one param per element.
+        A string is taken like the value of an environment variable. (See
+        'accept_env'.) Numbers, dates, etc. are converted by 'do_final_validate' -
+        or to strings, if the option has no data type.
+
+        :param value: the value in the file
+        :param path: the path of the config file
+
+        :return: see 'accept_env'
+        """
+        return self._accept_params("{} in {}".format(self._opt_name, path), value)
+
+    def _accept_params(self, supplied_key, value):
+        """
+        Takes the params supplied other than on the command line
+
+        :param supplied_key: describes where the params were supplied, for errors
+        :param value: a list of params, or a single value - which is split if it's
+        a string and the option can take more than one param
+
+        :return: see 'accept_env'
+        """
+        self._supplied_key = supplied_key
+        if isinstance(value, list):
+            params = list(value)
+        elif not isinstance(value, str) \
+                or self._multi_type is MultiTypeEnum.EXACTLY and self._count == 1:
+            params = [value]
+        else:
+            try:
+                params = shlex.split(value)
+            except ValueError as e:
+                return OptAcceptResultEnum.ERROR, "{}: {}", supplied_key, e.args[0]
+        if self._multi_type is MultiTypeEnum.AT_MOST and len(params) > self._count:
+            return OptAcceptResultEnum.ERROR, \
+                "{}: expected at most {} parameter(s) but found {}", \
+                supplied_key, self._count, len(params)
+        if not self._data_type:
+            params = [param if isinstance(param, str) else str(param)
+                      for param in params]
+        self._value = params
+        return OptAcceptResultEnum.ACCEPTED,
+
     def _ensure_data_type(self, values):
         """
         Ensures that the values in the passed list conform to the object's data
@@ -170,7 +297,9 @@ class ParamOpt(AbstractOpt):
         same as "-f A B C"
 
         :return: a tuple: element zero is an OptAcceptResultEnum value, element
-        one is an error message if element zero is OptAcceptResultEnum.ERROR
+        one is an error message format string if element zero is
+        OptAcceptResultEnum.ERROR, and the remaining elements are the format
+        arguments
         """
 
         if len(self._value) == 0:
@@ -180,13 +309,13 @@ class ParamOpt(AbstractOpt):
         if self._multi_type is MultiTypeEnum.EXACTLY \
                 and len(self._value) != self._count:
             return OptAcceptResultEnum.ERROR,\
-                   "{}: expected {} parameter(s) but found {}".format(
-                       self._supplied_key, self._count, len(self._value))
+                   "{}: expected {} parameter(s) but found {}", \
+                   self._supplied_key, self._count, len(self._value)
 
         if not self._ensure_data_type(self._value):
             return OptAcceptResultEnum.ERROR,\
-                   "{}: {} has incorrect data type. Expected {}".format(
-                       self._supplied_key, self._value, self._data_type.tostr())
+                   "{}: {} has incorrect data type. Expected {}", \
+                   self._supplied_key, list(self._value), self._data_type.tostr()
 
         self._initialized = True
         self._from_cmdline = True
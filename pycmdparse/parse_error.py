@@ -0,0 +1,63 @@
+class ParseError:
+    """
+    A single problem found while parsing the command line. Errors are recorded
+    in structured form, and the message text is only formatted when it is first
+    requested - e.g. by ShowInfo.show_errors, or by the utility via the 'message'
+    property or str(). So a batch validation that only inspects the 'kind' of each
+    error never pays for the string formatting.
+    """
+
+    __slots__ = ("_kind", "_message", "_args", "_option", "_token_index")
+
+    def __init__(self, kind, message, *args, option=None, token_index=None):
+        """
+        Initializes the instance
+
+        :param kind: an ErrorKindEnum value classifying the error
+        :param message: the error message. If 'args' are supplied, then this is a
+        format string, and the message is produced by message.format(*args) the
+        first time it is needed. If no args are supplied, then the message is used
+        as-is. (So a message returned by a validator can safely contain braces.)
+        :param args: optional format arguments for 'message'
+        :param option: the AbstractOpt object the error relates to, or None if the
+        error doesn't relate to a specific option
+        :param token_index: the index of the offending token in the tokenized
+        command line, counting the utility name as token zero, or None if the error
+        isn't related to a specific token (e.g. a missing mandatory option)
+        """
+        self._kind = kind
+        self._message = message
+        self._args = args
+        self._option = option
+        self._token_index = token_index
+
+    def __repr__(self):
+        s = "kind: {}; option: {}; token_index: {}; message: {}"
+        return s.format(self._kind, self._option.opt_name if self._option else None,
+                        self._token_index, self.message)
+
+    def __str__(self):
+        return self.message
+
+    @property
+    def kind(self):
+        return self._kind
+
+    @property
+    def option(self):
+        return self._option
+
+    @property
+    def token_index(self):
+        return self._token_index
+
+    @property
+    def message(self):
+        """
+        :return: the formatted error message. Formatting occurs once, on first
+        access
+        """
+        if self._args:
+            self._message = self._message.format(*self._args)
+            self._args = None
+        return self._message
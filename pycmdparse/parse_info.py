@@ -0,0 +1,71 @@
+class ParseInfo:
+    """
+    What the last parse of a CmdLine subclass found, beyond the option fields
+    injected into the subclass: the errors, the option values as one object, the
+    subcommand, and the args passed through. Read through the 'parse_info' class
+    property of the subclass. E.g.:
+
+        if MyCmdLine.parse(sys.argv) is ParseResultEnum.SUCCESS:
+            options = MyCmdLine.parse_info.result
+
+    They're held in one object, rather than in class properties of their own, so
+    they don't take names an option could have. The object reads the class fields
+    of the subclass as they are, so it reflects the latest parse.
+    """
+
+    __slots__ = ("_cmdline",)
+
+    def __init__(self, cmdline):
+        """
+        Initializes the instance
+
+        :param cmdline: the CmdLine subclass
+        """
+        self._cmdline = cmdline
+
+    @property
+    def errors(self):
+        """
+        :return:  the parse errors as a list of ParseError objects. Could be
+        empty. Never None
+        """
+        return self._cmdline._parse_errors if self._cmdline._parse_errors else []
+
+    @property
+    def result(self):
+        """
+        :return: the option values of the last successful parse, as an object with
+        a field per option - like the fields injected into the class, but read as
+        plain slots. (See OptionValues.) None if the last parse failed
+        """
+        return self._cmdline._result
+
+    @property
+    def subcommand(self):
+        """
+        :return: the name of the subcommand on the command line - e.g. "deploy" - or
+        None if the spec doesn't define subcommands, or the parse didn't reach one
+        """
+        subcommand = self._cmdline._subcommand
+        return subcommand.name if subcommand else None
+
+    @property
+    def subcommand_cmdline(self):
+        """
+        :return: the CmdLine subclass that parsed the subcommand's args - holding
+        their values - or None. (See 'subcommand')
+        """
+        subcommand = self._cmdline._subcommand
+        return subcommand.cmdline if subcommand else None
+
+    @property
+    def passthrough(self):
+        """
+        :return: the args on the command line that the last 'parse_known' didn't
+        recognize, in order, as they are on the command line - e.g. '-abc' or
+        '--x=y' rather than the tokens they're split into. A list. Could be empty.
+        Never None. If a subcommand was parsed, then followed by the args its parse
+        didn't recognize
+        """
+        passthrough = self._cmdline._passthrough
+        return passthrough if passthrough else []
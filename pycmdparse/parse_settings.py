@@ -0,0 +1,98 @@
+from pycmdparse.splitter import Splitter
+
+
+class ParseSettings:
+    """
+    Settings that tune how a CmdLine subclass parses its command line and shows its
+    usage instructions. Assigned to the 'parse_settings' class field of the
+    subclass. E.g.:
+
+        class MyCmdLine(CmdLine):
+            yaml_def = ...
+            parse_settings = ParseSettings(collect_errors=True,
+                                           cache_dir="~/.cache/my-util")
+
+    The settings are held in one object, rather than in class fields of their own,
+    since the parser injects a field into the subclass for each option - so the
+    settings don't take names an option could have. The object is read-only, since
+    the default one is shared by all subclasses: use 'replace' to derive changed
+    settings.
+    """
+
+    __slots__ = ("collect_errors", "stats", "cache_dir", "use_pager",
+                 "arg_file_prefix", "arg_file_delimiter", "arg_file_nesting",
+                 "config_files", "config_option", "plugin_group")
+
+    def __init__(self, collect_errors=False, stats=None, cache_dir=None,
+                 use_pager=False, arg_file_prefix=None, arg_file_delimiter="\n",
+                 arg_file_nesting=Splitter.ARG_FILE_NESTING, config_files=None,
+                 config_option=None, plugin_group=None):
+        """
+        Initializes the instance
+
+        :param collect_errors: If False (the default) then parsing stops at the
+        first error. If True, then the parser keeps going past recoverable errors
+        (unsupported options, bad option params, failed validations) so that every
+        problem on the command line is reported in one pass
+        :param stats: Optional instrumentation. If set to a ParseStats object, then
+        each parse records the time spent in each parse phase, and counts of
+        tokens, option lookups, conversions, and errors into that object
+        :param cache_dir: Optional. A directory in which pycmdparse persists derived
+        data - e.g. rendered usage instructions - so later invocations of the
+        utility can reuse it. If None, then derived data is only cached in memory
+        :param use_pager: If True, and stdout is a terminal, then usage instructions
+        that don't fit on one screen are displayed in a pager: the one in the PAGER
+        environment variable, or 'less -R'
+        :param arg_file_prefix: Optional. If set - e.g. to "@" - then an arg
+        starting with the prefix names an arg file, and is replaced by the args in
+        the file. E.g. 'my-util @paths.txt'. Arg files are memory-mapped, and their
+        args read as parsing reaches them
+        :param arg_file_delimiter: Separates the args in arg files: newline, for one
+        arg per line, or "\\0" for NUL-separated args - as written by e.g.
+        'find -print0'
+        :param arg_file_nesting: How deep arg files can name other arg files. If 1,
+        they can't
+        :param config_files: Optional. The default config files - e.g.
+        ["/etc/my-util.yaml", "~/.config/my-util.yaml"]. A config file supplies
+        values for the options not on the command line or in the environment, keyed
+        by option name. The files that exist are layered in order: a later file
+        overrides an earlier one. (See ConfigCache)
+        :param config_option: Optional. The name of an option - e.g. "config" -
+        whose value names a config file. It is layered over the default config
+        files
+        :param plugin_group: Optional. An entry point group - e.g.
+        "my_tool.subcommands" - through which separately installed packages add
+        subcommands. Each entry point names a subcommand, and the CmdLine subclass
+        that parses its args. (See PluginIndex.) A subcommand in the spec takes
+        precedence over a plugin with the same name
+        """
+        object.__setattr__(self, "collect_errors", collect_errors)
+        object.__setattr__(self, "stats", stats)
+        object.__setattr__(self, "cache_dir", cache_dir)
+        object.__setattr__(self, "use_pager", use_pager)
+        object.__setattr__(self, "arg_file_prefix", arg_file_prefix)
+        object.__setattr__(self, "arg_file_delimiter", arg_file_delimiter)
+        object.__setattr__(self, "arg_file_nesting", arg_file_nesting)
+        object.__setattr__(self, "config_files", config_files)
+        object.__setattr__(self, "config_option", config_option)
+        object.__setattr__(self, "plugin_group", plugin_group)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Parse settings are read-only - see 'replace'")
+
+    def __repr__(self):
+        return "ParseSettings({})".format(", ".join(
+            "{}={}".format(name, repr(getattr(self, name)))
+            for name in ParseSettings.__slots__))
+
+    def replace(self, **changes):
+        """
+        :param changes: the settings to change, as keyword args. E.g.
+        'use_pager=True'
+
+        :return: a new ParseSettings object, with the passed settings changed, and
+        the others as in this one
+        """
+        settings = {name: getattr(self, name) for name in ParseSettings.__slots__}
+        settings.update(changes)
+        return ParseSettings(**settings)
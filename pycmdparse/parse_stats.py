@@ -0,0 +1,157 @@
+import os
+import time
+
+
+class ParseStats:
+    """
+    Optional instrumentation for the parser. Pass an instance as the 'stats'
+    setting of a CmdLine subclass (see ParseSettings), and each call to 'parse'
+    accumulates the wall-clock time spent in each parse phase, and counts of the
+    work done. When the 'stats' setting is None (the default) the parser skips all
+    of this.
+
+    E.g.:
+
+    stats = ParseStats()
+    MyCmdLine.parse_settings = ParseSettings(stats=stats)
+    MyCmdLine.parse(sys.argv)
+    stats.write_textfile("/var/lib/node_exporter/my-util.prom")
+    """
+
+    SPEC_LOAD = "spec_load"
+    """Parsing the yaml and building the options (CmdLine._init_from_yaml)"""
+
+    TOKENIZE = "tokenize"
+    """
+    Splitting the command line into tokens (Splitter.) Arg files are read as parsing
+    reaches them - so that's part of DISPATCH
+    """
+
+    DISPATCH = "dispatch"
+    """Offering the tokens to the options, and handling positional params"""
+
+    FINAL_VALIDATE = "final_validate"
+    """Option final validation, and the check for missing mandatory options"""
+
+    VALIDATOR = "validator"
+    """The validator callback in the CmdLine subclass, if defined"""
+
+    ADD_FIELDS = "add_fields"
+    """Injecting the option values into the CmdLine subclass"""
+
+    PHASES = [SPEC_LOAD, TOKENIZE, DISPATCH, FINAL_VALIDATE, VALIDATOR, ADD_FIELDS]
+    """All phases, in the order in which they occur"""
+
+    def __init__(self, callback=None):
+        """
+        Initializes the instance
+
+        :param callback: optional. If provided, called with this object as its only
+        argument at the end of each parse
+        """
+        self._callback = callback
+        self.reset()
+
+    def __repr__(self):
+        s = "parses: {}; tokens: {}; option_lookups: {}; conversions: {}; " \
+            "errors: {}; phases: {}"
+        return s.format(self.parses, self.tokens, self.option_lookups,
+                        self.conversions, self.errors, self.phases)
+
+    def reset(self):
+        """
+        Zeroes all timings and counters
+        """
+        self.phases = {phase: 0.0 for phase in ParseStats.PHASES}
+        """Accumulated seconds spent in each phase, keyed by phase name"""
+        self.parses = 0
+        """Number of calls to 'parse'"""
+        self.tokens = 0
+        """
+        Number of command line tokens parsed - including the utility name, which is
+        token zero (see ParseError.token_index)
+        """
+        self.option_lookups = 0
+        """
+        Number of times an option was looked up for a token - one per token that
+        can be an option key
+        """
+        self.conversions = 0
+        """Number of option params converted to a data type"""
+        self.errors = 0
+        """Number of parse errors"""
+
+    @staticmethod
+    def now():
+        """
+        :return: the current value of the clock used for timing phases
+        """
+        return time.perf_counter()
+
+    def lap(self, phase, start):
+        """
+        Adds the time elapsed since 'start' to the passed phase
+
+        :param phase: one of the phase names in ParseStats.PHASES
+        :param start: a value previously obtained from 'now' or 'lap'
+
+        :return: the current clock value, so the next phase can be timed from it
+        """
+        end = time.perf_counter()
+        self.phases[phase] += end - start
+        return end
+
+    def parse_done(self, errors):
+        """
+        Called by the parser at the end of each parse
+
+        :param errors: the list of errors from the parse, or None
+        """
+        self.parses += 1
+        if errors:
+            self.errors += len(errors)
+        if self._callback:
+            self._callback(self)
+
+    def to_textfile(self, prefix="pycmdparse", labels=None):
+        """
+        Formats the timings and counters in the Prometheus text exposition format,
+        as read by the node exporter textfile collector.
+
+        :param prefix: prefix for the metric names
+        :param labels: optional dictionary of labels to add to every metric. E.g.:
+        {"utility": "my-util"}
+
+        :return: the formatted metrics, as a string
+        """
+        base = ",".join('{}="{}"'.format(k, str(v).replace('"', '\\"'))
+                        for k, v in sorted((labels or {}).items()))
+        lines = ["# HELP {}_phase_seconds_total Wall-clock time spent in each "
+                 "parse phase".format(prefix),
+                 "# TYPE {}_phase_seconds_total counter".format(prefix)]
+        for phase in ParseStats.PHASES:
+            lbls = (base + "," if base else "") + 'phase="{}"'.format(phase)
+            lines.append("{}_phase_seconds_total{{{}}} {:.9f}".format(
+                prefix, lbls, self.phases[phase]))
+        for counter in ["parses", "tokens", "option_lookups", "conversions",
+                        "errors"]:
+            name = "{}_{}_total".format(prefix, counter)
+            lines.append("# TYPE {} counter".format(name))
+            lines.append("{}{} {}".format(name, "{" + base + "}" if base else "",
+                                          getattr(self, counter)))
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path, prefix="pycmdparse", labels=None):
+        """
+        Writes the metrics produced by 'to_textfile' to the passed path. The file
+        is written to a temporary file in the same directory and then renamed, so
+        a collector never reads a partially written file.
+
+        :param path: the file to write
+        :param prefix: see 'to_textfile'
+        :param labels: see 'to_textfile'
+        """
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp_path, "w") as f:
+            f.write(self.to_textfile(prefix, labels))
+        os.replace(tmp_path, path)
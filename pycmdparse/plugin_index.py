@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import sys
+
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.util import Util
+
+
+class PluginIndex:
+    """
+    Discovers the subcommands that separately installed packages add to a utility
+    - through an entry point group, e.g.:
+
+        setup(..., entry_points={"my_tool.subcommands": [
+            "audit = my_tool_audit.cmdline:AuditCmdLine"]})
+
+    Each entry point names a subcommand, and the CmdLine subclass that parses its
+    args. Scanning the installed packages' entry points is slow in a large
+    environment, so the index - subcommand name to the dotted path of its class -
+    is memoized, keyed by the modification times of the directories on sys.path:
+    installing or removing a package changes the modification time of the
+    directory holding its metadata. So while the environment is unchanged, loading
+    the index costs a 'stat' call per directory. The index is held in memory for the
+    life of the process and, if a cache directory is supplied, is also persisted
+    there. The plugins' modules aren't imported. (See Subcommand.)
+    """
+
+    _cache = {}
+    """(key, index) tuples, keyed by entry point group"""
+
+    @staticmethod
+    def load(group, cache_dir=None):
+        """
+        Gets the index of the subcommands registered in an entry point group - from
+        the cache if the environment is unchanged, else by scanning the entry points
+
+        :param group: the entry point group
+        :param cache_dir: a directory in which the index is persisted, or None to
+        only use the in-memory cache
+
+        :return: a dictionary of the dotted paths of the subcommands' CmdLine
+        subclasses - e.g. "my_tool_audit.cmdline.AuditCmdLine" - keyed by
+        subcommand name
+
+        :raises: CmdLineException if the entry points can't be read
+        """
+        key = PluginIndex._key()
+        entry = PluginIndex._cache.get(group)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        index = PluginIndex._get_persisted(group, key, cache_dir) if cache_dir \
+            else None
+        if index is None:
+            index = PluginIndex._scan(group)
+            if cache_dir:
+                Util.write_cache_file(PluginIndex._path(group, cache_dir),
+                                      json.dumps({"group": group, "key": key,
+                                                  "index": index}))
+        PluginIndex._cache[group] = key, index
+        return index
+
+    @staticmethod
+    def clear():
+        """
+        Empties the in-memory cache. (Persisted indexes are not removed.)
+        """
+        PluginIndex._cache.clear()
+
+    @staticmethod
+    def _key():
+        """
+        :return: a [path, modification time] list for each directory on sys.path.
+        The current directory - an empty entry - is skipped, since it would make
+        the key depend on where the utility is run
+        """
+        key = []
+        for path in sys.path:
+            if not path:
+                continue
+            try:
+                key.append([path, os.stat(path).st_mtime_ns])
+            except OSError:
+                pass
+        return key
+
+    @staticmethod
+    def _get_persisted(group, key, cache_dir):
+        """
+        :return: the index persisted in the cache directory for the group, or None
+        if it isn't persisted - or was built in a different environment
+        """
+        try:
+            with open(PluginIndex._path(group, cache_dir), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("group") != group \
+                or entry.get("key") != key or not isinstance(entry.get("index"), dict):
+            return None
+        return entry.get("index")
+
+    @staticmethod
+    def _scan(group):
+        """
+        Reads the entry points in a group from the installed packages' metadata -
+        with the standard library in Python 3.8 and later, or else the
+        'importlib_metadata' package, if installed. If two entry points have the
+        same name, the first is used
+
+        :param group: the entry point group
+
+        :return: the index. (See 'load')
+        """
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            try:
+                from importlib_metadata import entry_points
+            except ImportError:
+                raise CmdLineException("Plugin subcommands require Python 3.8 or "
+                                       "later, or the 'importlib_metadata' package")
+        found = entry_points()
+        if hasattr(found, "select"):
+            found = found.select(group=group)
+        else:
+            # before Python 3.10: a dictionary of entry points, keyed by group
+            found = found.get(group, [])
+        index = {}
+        for entry_point in found:
+            # "module:attr [extra]" -> "module.attr"
+            value = entry_point.value.split("[")[0].strip().replace(":", ".")
+            index.setdefault(entry_point.name, value)
+        return index
+
+    @staticmethod
+    def _path(group, cache_dir):
+        """
+        :return: the path of the file that persists the index of a group. Named for
+        the environment too, so environments sharing a cache directory don't
+        overwrite each other's index
+        """
+        digest = hashlib.sha1("{}\0{}".format(group, sys.prefix).encode(
+            "utf-8", "surrogateescape")).hexdigest()
+        return os.path.join(cache_dir, "plugins-{}.json".format(digest))
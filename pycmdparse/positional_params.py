@@ -1,3 +1,9 @@
+import sys
+
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.token_reader import TokenReader
+
+
 class PositionalParams:
     """
     Provides a container to hold positional parameter values and associated
@@ -13,6 +19,12 @@ class PositionalParams:
     Note: in order for positional param parsing to occur, the yaml must define
     a positional params dictionary entry.
     """
+
+    __slots__ = ("_params", "_param_text", "_help_text", "_stdin", "_stdin_delimiter")
+
+    STDIN_DELIMITERS = {"newline": "\n", "nul": "\0"}
+    """The values of the 'stdin_delimiter' spec entry"""
+
     def __init__(self, params_dict):
         """
         Initializes the instance from a positional params spec in the yaml. A
@@ -22,6 +34,8 @@ class PositionalParams:
           params: Free-form text
           text: >
             Free-form text
+          stdin: true
+          stdin_delimiter: nul
 
         The "params" and "text" entries are displayed in usage instructions, and have
         no other effect. In other words - its just documentation. When the command
@@ -30,8 +44,20 @@ class PositionalParams:
         is provided to the validator so the utility can validate the parameter
         values. (See the CmdLine class for more info on validation.)
 
+        The "stdin" and "stdin_delimiter" entries are optional. If "stdin" is true,
+        then when the command line supplies no positional params - or just a lone
+        dash - the params are read from stdin, one per line. Or, if
+        "stdin_delimiter" is "nul", separated by NUL characters - as written by
+        e.g. 'find -print0'. The params are then an iterator rather than a list,
+        which yields each param as it arrives. So the utility can start processing
+        before the producer has finished, and the params are never all held in
+        memory.
+
         :param params_dict: a yaml-sourced dictionary representing the positional
         params spec
+
+        :raises: CmdLineException if "stdin_delimiter" isn't one of
+        PositionalParams.STDIN_DELIMITERS
         """
 
         self._params = []
@@ -40,15 +66,37 @@ class PositionalParams:
         supplied on the command line
         """
 
+        self._stdin = False
         if not params_dict:
             return
         self._param_text = params_dict.get("params")
         self._help_text = params_dict.get("text")
+        self._stdin = params_dict.get("stdin") is True
+        delimiter = params_dict.get("stdin_delimiter")
+        if delimiter is not None \
+                and delimiter not in PositionalParams.STDIN_DELIMITERS:
+            raise CmdLineException("Unknown stdin_delimiter: '{}'".format(delimiter))
+        self._stdin_delimiter = PositionalParams.STDIN_DELIMITERS.get(delimiter, "\n")
 
     @property
     def params(self):
+        """
+        :return: the positional params - a list. If the params are read from stdin
+        then an iterator, which reads stdin as it is advanced. (See 'from_stdin'.)
+        """
+        if self.from_stdin:
+            self._params = TokenReader.stream(sys.stdin.buffer, self._stdin_delimiter)
         return self._params
 
+    @property
+    def from_stdin(self):
+        """
+        :return: True if the spec enables reading the params from stdin, and the
+        command line supplied none - or just a lone dash
+        """
+        return self._stdin and isinstance(self._params, list) \
+            and (not self._params or self._params == ["-"])
+
     @params.setter
     def params(self, params):
         self._params = params
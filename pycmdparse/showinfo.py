@@ -1,4 +1,8 @@
+import os
+import shlex
 import shutil
+import subprocess
+import sys
 
 from pycmdparse.util import Util
 
@@ -12,8 +16,8 @@ class ShowInfo:
         """
         Displays all passed errors to the console.
 
-        :param parse_errors: a List of strings, each of which is ostensibly an
-        error message
+        :param parse_errors: a List of ParseError objects (or strings), each of
+        which is formatted into its error message as it is displayed
         :param utility_name: the name of the program utilizing the pycmdparse package
         """
         print("\nError{}:\n".format("(s)" if len(parse_errors) > 1 else ""))
@@ -24,12 +28,15 @@ class ShowInfo:
                   .format(utility_name))
 
     @staticmethod
-    def show_usage(utility_name, summary, usage, supported_options, details,
-                   examples, positional_params, addendum):
+    def usage_lines(utility_name, summary, usage, supported_options, details,
+                    examples, positional_params, addendum, max_len,
+                    subcommands=None):
         """
-        Displays comprehensive usage instructions, as defined by the function
+        Renders comprehensive usage instructions, as defined by the function
         arguments. Only those components that are provided as non-empty are
-        displayed. Others are ignored.
+        rendered. Others are ignored. This is a generator, so each section is only
+        word-wrapped as the lines are consumed - e.g. a pager can show the first
+        screen before the later sections are rendered.
 
         :param utility_name: the program name
         :param summary: a summary description of what the program does
@@ -42,73 +49,178 @@ class ShowInfo:
         Instance of PositionalParams class
         :param addendum: A free-form string of supplemental information the
         utility author would like to convey
-        """
-        max_len, ignore = shutil.get_terminal_size()
+        :param max_len: the console width to wrap the text to
+        :param subcommands: a list of Subcommand objects, listed by name and
+        summary
 
+        :return: yields the lines of the usage instructions, without line endings.
+        (A line can contain embedded newlines)
+        """
         if utility_name:
-            print("\n" + utility_name + "\n" + "=" * len(utility_name))
+            yield "\n" + utility_name + "\n" + "=" * len(utility_name)
 
         if summary:
-            for line in Util.split_string(summary, max_len):
-                print(line)
+            yield from Util.split_string(summary, max_len)
 
         # if not explicitly defined in the yaml, then auto-generated here
         if usage:
-            print("Usage:\n")
-            for line in Util.split_string(usage, max_len):
-                print(line)
+            yield "Usage:\n"
+            yield from Util.split_string(usage, max_len)
         else:
-            ShowInfo._generate_usage(utility_name, supported_options,
-                                     positional_params, max_len)
+            yield from ShowInfo._generate_usage(utility_name, supported_options,
+                                                positional_params, max_len,
+                                                subcommands)
 
         if positional_params and positional_params.help_text:
-            for line in Util.split_string(positional_params.help_text, max_len):
-                print(line)
+            yield from Util.split_string(positional_params.help_text, max_len)
+
+        if subcommands:
+            yield "Subcommands:\n"
+            yield from ShowInfo._subcommand_lines(subcommands, max_len)
 
         if supported_options:
-            print("Options and parameters:")
-            left_len = ShowInfo._calc_left_len(supported_options)
-            for category in supported_options:
-                if category.category and len(category.category.strip()) > 0:
-                    print("\n{}:\n".format(category.category))
-                for line in ShowInfo._get_option_help(category.options, max_len,
-                                                      left_len):
-                    print(line)
+            yield "Options and parameters:"
+            yield from ShowInfo._option_lines(supported_options, max_len)
 
         if details:
-            print("Additional detail:\n")
-            for line in Util.split_string(details, max_len):
-                print(line)
+            yield "Additional detail:\n"
+            yield from Util.split_string(details, max_len)
 
         if examples:
-            print("Examples:\n")
+            yield "Examples:\n"
             for example in examples:
-                print(example.example + "\n")
-                for line in Util.split_string(example.explanation, max_len):
-                    print(line)
+                yield example.example + "\n"
+                yield from Util.split_string(example.explanation, max_len)
 
         if addendum:
-            print("Supplemental:\n")
-            for line in Util.split_string(addendum, max_len):
-                print(line)
+            yield "Supplemental:\n"
+            yield from Util.split_string(addendum, max_len)
+
+    @staticmethod
+    def option_lines(heading, supported_options, max_len):
+        """
+        Renders the help for a selection of options - e.g. those matching a search
+        term - in the same layout as the options section of the usage instructions.
+
+        :param heading: the first line of the rendered text
+        :param supported_options: a list of OptCategory objects holding the options
+        to render
+        :param max_len: the console width to wrap the text to
+
+        :return: yields the lines, without line endings
+        """
+        yield "\n" + heading
+        yield from ShowInfo._option_lines(supported_options, max_len)
+
+    @staticmethod
+    def show_lines(lines, use_pager=False):
+        """
+        Displays the passed lines. If 'use_pager' is True, and stdout is a terminal,
+        and the lines don't fit on one screen, then the lines are piped to the pager
+        in the PAGER environment variable - or 'less -R'. Lines are passed to the
+        pager as they're consumed, so the pager shows the first screen right away.
+        Otherwise, the lines are written to stdout in a single write.
+
+        :param lines: an iterable of lines, without line endings - e.g. as yielded
+        by 'usage_lines'
+        :param use_pager: True to display long text in a pager
+
+        :return: the text displayed - the lines joined with line endings - or None
+        if the user quit the pager before all the lines were consumed
+        """
+        if not use_pager or not sys.stdout.isatty():
+            text = "".join(line + "\n" for line in lines)
+            ShowInfo.write(text)
+            return text
+        max_rows = shutil.get_terminal_size().lines - 1  # leave room for a prompt
+        first_screen = []
+        rows = 0
+        lines = iter(lines)
+        for line in lines:
+            first_screen.append(line + "\n")
+            rows += line.count("\n") + 1
+            if rows > max_rows:
+                return ShowInfo._page(first_screen, lines)
+        text = "".join(first_screen)
+        ShowInfo.write(text)
+        return text
+
+    @staticmethod
+    def terminal_width():
+        """
+        :return: the width of the console, which the usage instructions are wrapped
+        to
+        """
+        max_len, ignore = shutil.get_terminal_size()
+        return max_len
+
+    @staticmethod
+    def write(text):
+        """
+        Writes the passed text to stdout in a single write, rather than a write
+        per line
+
+        :param text: the text to write
+        """
+        if text:
+            sys.stdout.write(text)
+
+    @staticmethod
+    def _page(first_screen, lines):
+        """
+        Pipes text to the pager. If the pager can't be started, then writes the text
+        to stdout.
+
+        :param first_screen: a list of the first lines of the text, with line
+        endings
+        :param lines: an iterator of the remaining lines, without line endings
+
+        :return: see 'show_lines'
+        """
+        pager = shlex.split(os.environ.get("PAGER") or "less -R")
+        sys.stdout.flush()
+        try:
+            process = subprocess.Popen(pager, stdin=subprocess.PIPE,
+                                       universal_newlines=True)
+        except OSError:
+            text = "".join(first_screen) + "".join(line + "\n" for line in lines)
+            ShowInfo.write(text)
+            return text
+        written = first_screen
+        try:
+            process.stdin.write("".join(first_screen))
+            process.stdin.flush()
+            for line in lines:
+                written.append(line + "\n")
+                process.stdin.write(written[-1])
+            process.stdin.close()
+        except BrokenPipeError:
+            # the user quit the pager
+            written = None
+        process.wait()
+        return "".join(written) if written is not None else None
 
     @staticmethod
     def _generate_usage(utility_name, supported_options, positional_params,
-                        max_len):
+                        max_len, subcommands=None):
         """
         Generates abbreviated usage by listing all the options, then the positional
-        params 'text' field.
+        params 'text' field - or, if there are subcommands, a placeholder for the
+        subcommand and its args.
 
         :param utility_name: the utility name using pycmdparse
         :param supported_options: the defined options and parameters from the yaml
         :param positional_params: " positional params
         :param max_len: max console width
+        :param subcommands: the subcommands from the yaml
+
+        :return: yields the lines of the usage
         """
         if not utility_name and not supported_options \
-                and not positional_params:
+                and not positional_params and not subcommands:
             return
 
-        print("Usage:\n")
+        yield "Usage:\n"
         utility_name = utility_name + " " if utility_name else ""
         line = utility_name
 
@@ -117,20 +229,64 @@ class ShowInfo:
                 for option in category.options:
                     k = "[" + option.keys_and_hint + "]"
                     if len(line) + len(k) > max_len:
-                        print(line)
+                        yield line
                         line = ShowInfo._fixed(" ", len(utility_name))
                     line += k + " "
 
-        if positional_params:
-            param_text = positional_params.param_text
+        if positional_params or subcommands:
+            param_text = positional_params.param_text if positional_params \
+                else "SUBCOMMAND [ARGS...]"
             for word in param_text.split():
                 if len(line) + len(word) > max_len:
-                    print(line)
+                    yield line
                     line = ShowInfo._fixed(" ", len(utility_name))
                 line += word + " "
         if len(line.strip()) > 0:
-            print(line)
-        print()
+            yield line
+        yield ""
+
+    @staticmethod
+    def _option_lines(supported_options, max_len):
+        """
+        Renders the options in each passed category, vertically aligned, under the
+        category name (if any)
+
+        :param supported_options: a list of OptCategory objects
+        :param max_len: max console width
+
+        :return: yields the lines
+        """
+        left_len = ShowInfo._calc_left_len(supported_options)
+        for category in supported_options:
+            if category.category and len(category.category.strip()) > 0:
+                yield "\n{}:\n".format(category.category)
+            yield from ShowInfo._get_option_help(category.options, max_len, left_len)
+
+    @staticmethod
+    def _subcommand_lines(subcommands, max_len):
+        """
+        Renders the subcommands, with their summaries vertically aligned. E.g.:
+
+        deploy  Deploys a build to an environment
+        logs    Shows the logs of an environment
+
+        :param subcommands: a list of Subcommand objects
+        :param max_len: max console width
+
+        :return: yields the lines
+        """
+        left_len = max(len(subcommand.name) for subcommand in subcommands)
+        if max_len <= left_len:
+            # safety - make width big enough so the math works
+            max_len = left_len + 10
+        for subcommand in subcommands:
+            summaries = Util.split_string(subcommand.summary or "",
+                                          max_len - left_len - 2) or [""]
+            yield (ShowInfo._fixed(subcommand.name, left_len) + "  "
+                   + summaries[0]).rstrip()
+            for summary in summaries[1:]:
+                yield ShowInfo._fixed(" ", left_len) + "  " + summary
+        yield ""
 
     @staticmethod
     def _calc_left_len(supported_options):
@@ -146,8 +302,7 @@ class ShowInfo:
         left_len = 0
         for category in supported_options:
             for option in category.options:
-                left_len = len(option.keys_and_hint) \
-                    if len(option.keys_and_hint) > left_len else left_len
+                left_len = max(left_len, len(option.keys_and_hint))
         return left_len
 
     @staticmethod
@@ -174,15 +329,15 @@ class ShowInfo:
         for opt in supported_options:
             if opt.is_internal:
                 continue
-            help_text = ShowInfo._prepend_required(opt.help_text, opt.required)
-            opt_helps = Util.split_string(help_text, max_len - left_len - 1)
+            keys_and_hint = opt.keys_and_hint
+            opt_helps = Util.split_string(opt.usage_help, max_len - left_len - 1)
             help_lines = len(opt_helps)
             cur_line = 0
             is_new = True
             for opt_help in opt_helps:
                 cur_line += 1
                 if is_new:
-                    to_return.append(ShowInfo._fixed(opt.keys_and_hint,
+                    to_return.append(ShowInfo._fixed(keys_and_hint,
                                                      left_len) + " " + opt_help)
                     is_new = False
                 else:
@@ -191,24 +346,6 @@ class ShowInfo:
                     to_return.append(ShowInfo._fixed(" ", left_len) + " " + opt_help)
         return to_return
 
-    @staticmethod
-    def _prepend_required(help_text, required):
-        """
-        Returns the passed help text prepended with "Optional. " or "Mandatory. ",
-        based on the value of the passed 'required' param. If the passed help text
-        is 'None' or blank, then returns the help text as is.
-
-        :param help_text: Text to perhaps prepend
-        :param required:  True if the option is required, else False - the
-        option is not required to be provided on the command line
-
-        :return: The value of 'help_text', potentially prepended as described.
-        """
-        if not help_text or len(help_text.strip()) == 0:
-            return help_text
-        else:
-            return ("Mandatory. " if required else "Optional. ") + help_text
-
     @staticmethod
     def _fixed(val, width):
         """
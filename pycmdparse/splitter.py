@@ -1,7 +1,10 @@
+import itertools
 import shlex
 
+from pycmdparse.arg_file_exception import ArgFileException
 from pycmdparse.cmdline_exception import CmdLineException
 from pycmdparse.stack import Stack
+from pycmdparse.token_reader import TokenReader
 
 
 class Splitter:
@@ -9,8 +12,12 @@ class Splitter:
     Splits a command line into tokens.
     """
 
+    ARG_FILE_NESTING = 4
+    """The default for how deep arg files can name other arg files"""
+
     @staticmethod
-    def split_str(cmdline_str, has_options):
+    def split_str(cmdline_str, has_options, arg_file_prefix=None,
+                  arg_file_delimiter="\n", arg_file_nesting=ARG_FILE_NESTING):
         """
         Splits a string, like "-f filename -ctv --foo=bar". First, the passed string
         is split with the shlex split function - which splits on all whitespace,
@@ -21,15 +28,21 @@ class Splitter:
         :param cmdline_str: a string, such as one provided on a command line
         :param has_options: True if the arg parse spec indicates that options are
         defined, else false (all args in this case are positional params)
+        :param arg_file_prefix: see 'split_list'
+        :param arg_file_delimiter: see 'split_list'
+        :param arg_file_nesting: see 'split_list'
 
         :return: a Stack. In the above example, would return a stack:
         '["-f", "filename", "-c", "-t", "-v", "--foo", "bar"]' with left at top and
         right at bottom. (First pop yields "-f".)
         """
-        return Splitter.split_list(shlex.split(cmdline_str), has_options)
+        return Splitter.split_list(shlex.split(cmdline_str), has_options,
+                                   arg_file_prefix, arg_file_delimiter,
+                                   arg_file_nesting)
 
     @staticmethod
-    def split_list(cmdline, has_options):
+    def split_list(cmdline, has_options, arg_file_prefix=None,
+                   arg_file_delimiter="\n", arg_file_nesting=ARG_FILE_NESTING):
         """
         Splits a command line, like one provided by the Python interpreter. Splits
         concatenated single-char options into separate options. Splits "X=Y" into
@@ -40,28 +53,143 @@ class Splitter:
 
         The result is a list of tokens for subsequent left-to-right parsing.
 
+        If an arg prefix is supplied, then an arg starting with it names an arg
+        file, and is replaced by the args in the file. (See TokenReader.) In that
+        case, the args are read and split as the stack is popped - so a large arg
+        file is never held in memory as a whole, unless the consumer of the args
+        needs them all at once.
+
         :param cmdline: a List. E.g.: '["-f", "filename", "-ctv", "--foo=bar"]'
         :param has_options: True if the arg parse spec indicates that options are
         defined, else false (all args in this case are positional params)
+        :param arg_file_prefix: if not None, then args starting with this prefix -
+        e.g. "@" - name arg files. Args in arg files can name other arg files
+        :param arg_file_delimiter: separates the args in arg files. One of
+        TokenReader.DELIMITERS
+        :param arg_file_nesting: how deep arg files can name other arg files. If 1,
+        then arg files can't name arg files
 
         :return: a Stack. In the above example, would return a stack:
         '["-f", "filename", "-c", "-t", "-v", "--foo", "bar"]' with left at top and
         right at bottom. (First pop yields "-f".)
         """
+        if arg_file_prefix and any(arg.startswith(arg_file_prefix)
+                                   for arg in cmdline):
+            # each arg file is opened when the stack reaches it - so a missing file
+            # raises an ArgFileException from the stack, rather than from here
+            args = itertools.chain.from_iterable(
+                Splitter._expand(TokenReader(arg[len(arg_file_prefix):],
+                                             arg_file_delimiter),
+                                 arg_file_prefix, arg_file_delimiter,
+                                 arg_file_nesting, 1)
+                if Splitter._is_arg_file(arg, arg_file_prefix) else [arg]
+                for arg in cmdline)
+            return Stack(Splitter._split_lazily(args, has_options))
         token_list = []
         in_positional_params = False if has_options else True
         for token in cmdline:
             if in_positional_params or token == "--":
                 token_list.append(token)
                 in_positional_params = True
-            elif token[0] != '-':  # then it is a value
+            elif token[0:1] != '-' or token == "-":  # then it is a value
                 token_list.append(token)
-            elif token.startswith("--"):
-                token_list.extend(Splitter._handle_long_form(token))
             else:
-                token_list.extend(Splitter._handle_short_form(token))
+                token_list.extend(Splitter.split_arg(token))
         return Stack(token_list)
 
+    @staticmethod
+    def arg_indices(cmdline, has_options):
+        """
+        Maps the tokens split from a command line by 'split_list' to the args they
+        came from - e.g. so the args following a subcommand can be passed on as
+        they were on the command line. Arg files are not expanded
+
+        :param cmdline: the list passed to 'split_list'
+        :param has_options: as passed to 'split_list'
+
+        :return: a list holding, for each token, the index in 'cmdline' of the arg
+        the token came from. E.g. given '["util", "-cv", "--foo=bar", "x"]',
+        returns '[0, 1, 1, 2, 2, 3]'
+        """
+        indices = []
+        in_positional_params = False if has_options else True
+        for index, arg in enumerate(cmdline):
+            if in_positional_params or arg == "--":
+                indices.append(index)
+                in_positional_params = True
+            elif arg[0:1] != '-' or arg == "-":  # then it is a value
+                indices.append(index)
+            else:
+                indices.extend([index] * len(Splitter.split_arg(arg)))
+        return indices
+
+    @staticmethod
+    def _split_lazily(args, has_options):
+        """
+        A generator that splits each of the passed args as it's reached. (See
+        'split_list'.)
+        """
+        args = iter(args)
+        if has_options:
+            for arg in args:
+                if arg == "--":
+                    yield arg
+                    break
+                elif arg[0:1] != '-' or arg == "-":  # then it is a value
+                    yield arg
+                else:
+                    yield from Splitter.split_arg(arg)
+        # the positional params
+        yield from args
+
+    @staticmethod
+    def _expand(reader, prefix, delimiter, nesting, depth):
+        """
+        A generator of the args in an arg file, with the arg files it names
+        replaced by their args
+
+        :param reader: a TokenReader for the arg file
+        :param prefix: the arg file prefix
+        :param delimiter: the arg file delimiter
+        :param nesting: how deep arg files can name other arg files
+        :param depth: how deep the arg file is. An arg file named on the command
+        line is at depth 1
+
+        :raises: ArgFileException if an arg file can't be read, or is nested more
+        than 'nesting' deep
+        """
+        for arg in reader:
+            if not arg.startswith(prefix) or len(arg) == len(prefix):
+                yield arg
+            elif depth >= nesting:
+                raise ArgFileException("Arg files nested more than {} deep at: {}"
+                                       .format(nesting, reader.path))
+            else:
+                yield from Splitter._expand(TokenReader(arg[len(prefix):],
+                                                        delimiter),
+                                            prefix, delimiter, nesting, depth + 1)
+
+    @staticmethod
+    def _is_arg_file(arg, prefix):
+        return len(arg) > len(prefix) and arg.startswith(prefix)
+
+    @staticmethod
+    def split_arg(arg):
+        """
+        Splits one arg that precedes the positional params. (See 'split_list')
+
+        :param arg: an arg from the command line. E.g. '-ctv', or '--foo=bar'
+
+        :return: a list of tokens. E.g. ['-c', '-t', '-v'], or ['--foo', 'bar']. A
+        value - including a lone dash, which conventionally stands for stdin - is
+        returned as is, in a list
+        """
+        if arg[0:1] != '-' or arg == "-":  # then it is a value
+            return [arg]
+        elif arg.startswith("--"):
+            return Splitter._handle_long_form(arg)
+        return Splitter._handle_short_form(arg)
+
     @staticmethod
     def _handle_short_form(element):
         """
@@ -1,49 +1,139 @@
+import itertools
+
+
 class Stack:
     """
     A simple stack with some additional functionality that supports command-line
-    parsing. A stack provides an intuitive way to parse the command line.
+    parsing. A stack provides an intuitive way to parse the command line. The
+    items can be supplied lazily - e.g. the args in an arg file (see TokenReader) -
+    in which case they are only read as parsing reaches them.
     """
+    READ_AHEAD = 1024
+    """The minimum number of lazily supplied items read at a time"""
+
     def __init__(self, items):
         """
         Initializes the stack from the passed List such that the left-most list
         item is the top of the stack, and the right-most list item is the bottom of the
         stack
 
-        :param items: the List to initialize the stack from. If None, then the stack
-        is initialized to be empty
+        :param items: the List to initialize the stack from. Can also be any other
+        iterable, which is read as items are needed. If None, then the stack is
+        initialized to be empty
         """
-        self._items = []
-        self._items.extend(reversed(items if items else []))
+        if items is None or isinstance(items, list):
+            self._items = list(items) if items else []
+            self._rest = None
+        else:
+            self._items = []
+            self._rest = iter(items)
+        # items are popped by advancing the head, rather than by removing them
+        self._head = 0
+        self._position = 0
 
     def __repr__(self):
-        return str([item for item in reversed(self._items)])
+        self._read()
+        return str(self._items[self._head:])
 
     def is_empty(self):
-        return self._items == []
+        return self._head >= len(self._items) and not self._read(1)
+
+    def at_least(self, count):
+        """
+        :return: True if the stack holds at least 'count' items. Only reads that
+        many lazily supplied items
+        """
+        return len(self._items) - self._head >= count or self._read(count)
 
     def push(self, item):
-        self._items.append(item)
+        if self._head > 0:
+            self._head -= 1
+            self._items[self._head] = item
+        else:
+            self._items.insert(0, item)
+        self._position -= 1
 
     def pop(self):
-        return self._items.pop()
+        if self._head >= len(self._items) and not self._read(1):
+            raise IndexError("pop from empty stack")
+        item = self._items[self._head]
+        self._head += 1
+        self._position += 1
+        if self._rest is not None and self._head > Stack.READ_AHEAD:
+            # when streaming, don't hold on to the popped items
+            del self._items[0:self._head]
+            self._head = 0
+        return item
 
     def peek(self):
-        return self._items[len(self._items) - 1]
+        if self._head >= len(self._items) and not self._read(1):
+            raise IndexError("peek at empty stack")
+        return self._items[self._head]
 
     def size(self):
-        return len(self._items)
+        """
+        :return: the number of items in the stack. Reads all lazily supplied items
+        """
+        self._read()
+        return len(self._items) - self._head
+
+    def position(self):
+        """
+        :return: the number of tokens popped so far. This is the index, in the
+        original list, of the token at the top of the stack
+        """
+        return self._position
 
     def pop_all(self):
-        to_return = list(reversed(self._items))
+        """
+        :return: the items in the stack, top first, as a list. Lazily supplied items
+        are read straight into the returned list, rather than being copied
+        """
+        self._read()
+        del self._items[0:self._head]
+        to_return = self._items
         self._items = []
+        self._head = 0
+        self._position += len(to_return)
         return to_return
 
     def has_options(self):
         """
         Checks to see if the stack contains any more options (i.e.
-        tokens that start with dash or double dash.)
+        tokens that start with dash or double dash - other than a lone dash, which
+        is a value.) Only reads lazily supplied items up to the first option
 
         :return: True if the stack contains any more options, else False
         """
-        remaining_opts = [item for item in self._items if item.startswith("-")]
-        return len(remaining_opts) != 0
+        checked = self._head
+        while True:
+            if any(item.startswith("-") and item != "-"
+                   for item in itertools.islice(self._items, checked, None)):
+                return True
+            checked = len(self._items)
+            # read the next window - if there is one
+            if not self._read(checked - self._head + 1):
+                return False
+
+    def _read(self, count=None):
+        """
+        Reads lazily supplied items into the stack
+
+        :param count: the number of items the stack should hold. If None, then all
+        the items are read
+
+        :return: True if the stack holds at least 'count' items
+        """
+        if self._rest is not None:
+            if count is None:
+                self._items.extend(self._rest)
+                self._rest = None
+            else:
+                needed = count - (len(self._items) - self._head)
+                if needed > 0:
+                    # read ahead a little, rather than one item at a time
+                    self._items.extend(itertools.islice(
+                        self._rest, max(needed, Stack.READ_AHEAD)))
+                    if len(self._items) - self._head < count:
+                        self._rest = None
+        return count is None or len(self._items) - self._head >= count
@@ -0,0 +1,42 @@
+import sys
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.completion import Completion
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+
+class StubCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: python -m pycmdparse stub
+      require_args: true
+
+    summary: >
+      Generates a typing stub for the option values of a utility that uses
+      pycmdparse - the class of the CmdLine 'result' object - and writes it to the
+      console.
+
+    usage: >
+      python -m pycmdparse stub SPEC
+
+    positional_params:
+      params: SPEC
+      text: >
+        SPEC is a utility script that defines a CmdLine subclass - like the
+        scripts in the pycmdparse 'example' directory - or a yaml file holding
+        the utility's spec.
+    '''
+
+
+def main(argv):
+    parse_result = StubCmdLine.parse(argv)
+    if parse_result.value != ParseResultEnum.SUCCESS.value:
+        StubCmdLine.display_info(parse_result)
+        return 1
+    params = StubCmdLine.positional_params
+    if len(params) != 1:
+        print("A SPEC is required")
+        return 1
+    cmdline = Completion.load_cmdline(params[0])
+    sys.stdout.write(cmdline.result_stub())
+    return 0
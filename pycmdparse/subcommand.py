@@ -0,0 +1,86 @@
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.util import Util
+
+
+class Subcommand:
+    """
+    A subcommand of a git-style utility - e.g. 'deploy' in 'tool -v deploy --force'.
+    The root spec lists the subcommands in its 'subcommands' section, and each entry
+    holds just enough to list the subcommand in the root's usage instructions: its
+    name and summary. The entry names the CmdLine subclass that parses the
+    subcommand's args - a class nested in the root CmdLine subclass, or a dotted
+    path. The class is only resolved - so its module is only imported, and its spec
+    only parsed - when the subcommand is on the command line.
+    """
+
+    __slots__ = ("_name", "_summary", "_cmdline_name", "_root", "_cmdline")
+
+    def __init__(self, sub_dict, root=None):
+        """
+        Initializes the instance from a subcommand entry in the yaml. E.g.:
+
+        subcommands:
+          - name: deploy
+            summary: Deploys a build to an environment
+            cmdline: DeployCmdLine
+          - name: logs
+            summary: Shows the logs of an environment
+            cmdline: my_tool.logs.LogsCmdLine
+
+        :param sub_dict: the entry, as loaded by the yaml parser
+        :param root: the CmdLine subclass whose spec lists the subcommand. A
+        'cmdline' without a dot names an attribute of this class
+
+        :raises: CmdLineException if the entry is missing its name or cmdline
+        """
+        if not isinstance(sub_dict, dict):
+            raise CmdLineException("A subcommand must be a mapping of entries: {}"
+                                   .format(sub_dict))
+        self._name = sub_dict.get("name")
+        if not isinstance(self._name, str) or not self._name \
+                or self._name.startswith("-"):
+            raise CmdLineException("Invalid subcommand name: {}".format(self._name))
+        self._cmdline_name = sub_dict.get("cmdline")
+        if not isinstance(self._cmdline_name, str) or not self._cmdline_name:
+            raise CmdLineException("Subcommand '{}' must name its cmdline"
+                                   .format(self._name))
+        self._summary = sub_dict.get("summary")
+        self._root = root
+        self._cmdline = None
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def summary(self):
+        return self._summary
+
+    @property
+    def cmdline_name(self):
+        return self._cmdline_name
+
+    @property
+    def cmdline(self):
+        """
+        :return: the CmdLine subclass that parses the subcommand's args - resolved
+        the first time it's needed
+
+        :raises: CmdLineException if the class can't be found
+        """
+        if self._cmdline is None:
+            self._cmdline = self._resolve()
+        return self._cmdline
+
+    def _resolve(self):
+        """
+        :return: the CmdLine subclass named by the 'cmdline' entry. (See
+        Util.find_object)
+        """
+        # imported here, since CmdLine imports this module
+        from pycmdparse.cmdline import CmdLine
+        found = Util.find_object(self._cmdline_name, self._root)
+        if not isinstance(found, type) or not issubclass(found, CmdLine):
+            raise CmdLineException("Unable to find the cmdline of subcommand '{}': {}"
+                                   .format(self._name, self._cmdline_name))
+        return found
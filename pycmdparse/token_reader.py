@@ -0,0 +1,128 @@
+import mmap
+import os
+
+from pycmdparse.arg_file_exception import ArgFileException
+from pycmdparse.cmdline_exception import CmdLineException
+
+
+class TokenReader:
+    """
+    Reads the args in an arg file - e.g. a list of paths too long to pass on the
+    command line. The file is memory-mapped, and each arg is decoded only when the
+    iterator reaches it - so the args can stream into the consumer without the
+    file being read into memory, or split into a list, first. Args can also be read
+    from a stream, like stdin. (See 'stream'.)
+    """
+
+    __slots__ = ("_path", "_delimiter")
+
+    DELIMITERS = ["\n", "\0"]
+    """
+    The supported delimiters: newline, for a file with one arg per line, or NUL -
+    as written by e.g. 'find -print0' - for args that can contain newlines
+    """
+
+    CHUNK_SIZE = 1 << 20
+    """The number of bytes of the file decoded at a time"""
+
+    def __init__(self, path, delimiter="\n"):
+        """
+        Initializes the instance
+
+        :param path: the path of the arg file
+        :param delimiter: one of TokenReader.DELIMITERS
+
+        :raises: ArgFileException if there is no such file
+        """
+        if delimiter not in TokenReader.DELIMITERS:
+            raise CmdLineException("Unsupported arg file delimiter: {}"
+                                   .format(repr(delimiter)))
+        if not os.path.isfile(path):
+            raise ArgFileException("Unable to read arg file: {}".format(path))
+        self._path = path
+        self._delimiter = delimiter.encode()
+
+    @property
+    def path(self):
+        return self._path
+
+    def __iter__(self):
+        """
+        :return: an iterator over the args in the file. Empty args - e.g. blank
+        lines - are skipped. With the newline delimiter, a trailing carriage return
+        is removed from each arg. Args are decoded like the args in sys.argv
+
+        :raises: ArgFileException if the file can't be read
+        """
+        try:
+            f = open(self._path, "rb")
+        except OSError as e:
+            raise ArgFileException("Unable to read arg file: {}: {}"
+                                   .format(self._path, e.strerror))
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                # an empty file can't be mapped
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = 0
+                while start < size:
+                    # decode and split a chunk of whole args at a time, so only the
+                    # chunk is ever copied out of the map
+                    end = mm.rfind(self._delimiter, start,
+                                   start + TokenReader.CHUNK_SIZE)
+                    if end == -1:
+                        end = mm.find(self._delimiter, start)
+                        if end == -1:
+                            end = size
+                    chunk = mm[start:end]
+                    start = end + 1
+                    yield from TokenReader._split(chunk, self._delimiter)
+
+    @staticmethod
+    def stream(stream, delimiter="\n"):
+        """
+        A generator of the args read from a stream - e.g. a list of paths piped to
+        stdin. Each read returns the data available so far, so args are yielded as
+        the producer writes them, and only the data read but not yet yielded is
+        held in memory.
+
+        :param stream: a binary stream. E.g. sys.stdin.buffer
+        :param delimiter: one of TokenReader.DELIMITERS
+
+        :return: the args - as for an arg file. (See '__iter__')
+        """
+        if delimiter not in TokenReader.DELIMITERS:
+            raise CmdLineException("Unsupported delimiter: {}".format(repr(delimiter)))
+        delimiter = delimiter.encode()
+        read = getattr(stream, "read1", None) or stream.read
+        pending = b""
+        while True:
+            data = read(TokenReader.CHUNK_SIZE)
+            if not data:
+                break
+            end = data.rfind(delimiter)
+            if end == -1:
+                pending += data
+                continue
+            chunk = pending + data[0:end]
+            pending = data[end + 1:]
+            yield from TokenReader._split(chunk, delimiter)
+        yield from TokenReader._split(pending, delimiter)
+
+    @staticmethod
+    def _split(chunk, delimiter):
+        """
+        :param chunk: bytes holding whole args
+        :param delimiter: the delimiter, as bytes
+
+        :return: the non-empty args in the chunk, decoded like the args in
+        sys.argv. With the newline delimiter, carriage returns ending args are
+        removed
+        """
+        text = os.fsdecode(chunk)
+        if delimiter == b"\n" and "\r" in text:
+            text = text.replace("\r\n", "\n")
+            if text.endswith("\r"):
+                text = text[0:-1]
+        return filter(None, text.split(delimiter.decode()))
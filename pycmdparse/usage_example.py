@@ -8,6 +8,9 @@ class UsageExample:
 
     There's no functionality here - its just help for the end user.
     """
+
+    __slots__ = ("_example", "_explanation")
+
     def __init__(self, example):
         """
         Initializes the instance from the passed dictionary. The dictionary is expected
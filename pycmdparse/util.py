@@ -1,7 +1,68 @@
+import importlib
+import os
+
+from pycmdparse.cmdline_exception import CmdLineException
+
+
 class Util:
     """
     Utility functions
     """
+    @staticmethod
+    def find_object(name, owner=None):
+        """
+        Finds an object named in a spec - e.g. a default_call callable
+
+        :param name: a dotted path - e.g. "my_util.defaults.cpu_count" - or the name
+        of an attribute of 'owner'. A dotted path is resolved by importing the
+        longest module prefix of the path, then getting the remaining attributes -
+        so the object can be in a module, or an attribute of a class in a module
+        :param owner: the object whose attributes are named without a dot - e.g.
+        a CmdLine subclass
+
+        :return: the object, or None if it can't be found
+
+        :raises: CmdLineException if a module on the path is found, but fails to
+        import - e.g. because it imports a module that isn't installed
+        """
+        if "." not in name:
+            return getattr(owner, name, None)
+        parts = name.split(".")
+        for i in range(len(parts) - 1, 0, -1):
+            module_name = ".".join(parts[0:i])
+            try:
+                found = importlib.import_module(module_name)
+            except ImportError as e:
+                if e.name and (module_name == e.name
+                               or module_name.startswith(e.name + ".")):
+                    # the prefix isn't a module - try a shorter one
+                    continue
+                raise CmdLineException("Unable to import {}: {}"
+                                       .format(module_name, e))
+            for part in parts[i:]:
+                found = getattr(found, part, None)
+            return found
+        return None
+
+    @staticmethod
+    def write_cache_file(path, text):
+        """
+        Writes a file in a cache directory - via a temporary file, so a concurrent
+        reader never reads a partially written file. Creates the directory if need
+        be. Failure is ignored, since anything cached can be built again.
+
+        :param path: the path of the file
+        :param text: the text to write
+        """
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
     @staticmethod
     def split_string(text_block, max_segment_len):
         """
@@ -28,26 +89,29 @@ class Util:
         of all spaces is passed, then an empty List is returned.
         """
         segments = []
-        if not text_block or len(text_block.strip()) == 0:
+        if not text_block or text_block.isspace():
             return segments
-        lines = text_block.split('\n')
-        for line in lines:
-            if len(line.strip()) == 0:
+        for line in text_block.split('\n'):
+            if not line or line.isspace():
                 segments.append("")
                 continue
+            line_len = len(line)
             cur = 0
             while True:
                 end = cur + max_segment_len
-                if end >= len(line):
-                    if len(line[cur:].strip()) > 0:
+                if end >= line_len:
+                    if cur < line_len:
                         # don't add an empty segment at the end
                         segments.append(line[cur:])
                     break
-                for i in range(end, cur - 1, -1):
-                    if line[i] == ' ':
-                        end = i
-                        break
+                # break on the last space in the segment, or the space just past
+                # it. If there isn't one, chop the segment at 'end'
+                space = line.rfind(' ', cur, end + 1)
+                if space != -1:
+                    end = space
                 segments.append(line[cur: end].rstrip())
                 # advance, ignoring leading spaces
-                cur = end + len(line[end:]) - len(line[end:].lstrip())
+                cur = end
+                while cur < line_len and line[cur].isspace():
+                    cur += 1
         return segments
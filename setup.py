@@ -38,7 +38,7 @@ setup(
         "Topic :: Software Development :: Libraries :: Python Modules",
     ],
     keywords="command line arg argument parse usage instructions console",
-    packages=['pycmdparse'],
+    packages=['pycmdparse', 'pycmdparse.bench'],
     install_requires=['PyYAML==5.1b3'],
     python_requires='~=3.6',
 )
@@ -0,0 +1,148 @@
+"""
+Tests expanding arg files - args like '@paths.txt' - and reading args lazily
+"""
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.errorkind_enum import ErrorKindEnum
+from pycmdparse.parse_settings import ParseSettings
+from pycmdparse.parseresult_enum import ParseResultEnum
+from pycmdparse.stack import Stack
+from pycmdparse.token_reader import TokenReader
+
+
+class ArgFileCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: tool
+    positional_params:
+      params: PATH...
+      text: The paths to process
+    supported_options:
+      - category:
+        options:
+        - name      : verbose
+          short     : v
+          opt       : bool
+        - name      : quiet
+          short     : q
+          opt       : bool
+        - name      : name
+          long      : name
+          opt       : param
+        - name      : files
+          long      : files
+          opt       : param
+          multi_type: no-limit
+    '''
+    parse_settings = ParseSettings(arg_file_prefix="@")
+    verbose = None
+    quiet = None
+    name = None
+    files = None
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+    ArgFileCmdLine.reset()
+
+
+def test_positional_params(tmp_path):
+    paths = tmp_path / "paths.txt"
+    paths.write_text("a\r\nb c\n\nd\n", encoding="utf-8")
+    parse_result = ArgFileCmdLine.parse(["tool", "-v", "@" + str(paths), "e"])
+    assert parse_result is ParseResultEnum.SUCCESS
+    assert ArgFileCmdLine.verbose
+    assert ArgFileCmdLine.positional_params == ["a", "b c", "d", "e"]
+
+
+def test_options_in_file(tmp_path):
+    args = tmp_path / "args"
+    args.write_text("-vq\n--name=foo\n--files\nx\ny\n--\n-z\n", encoding="utf-8")
+    assert ArgFileCmdLine.parse("tool @" + str(args)) is ParseResultEnum.SUCCESS
+    assert ArgFileCmdLine.verbose and ArgFileCmdLine.quiet
+    assert ArgFileCmdLine.name == "foo"
+    assert ArgFileCmdLine.files == ["x", "y"]
+    assert ArgFileCmdLine.positional_params == ["-z"]
+
+
+def test_nul_delimited(tmp_path, monkeypatch):
+    paths = tmp_path / "paths"
+    paths.write_bytes(b"one\ntwo\0three\0")
+    monkeypatch.setattr(ArgFileCmdLine, "parse_settings", ArgFileCmdLine
+                        .parse_settings.replace(arg_file_delimiter="\0"))
+    ArgFileCmdLine.parse(["tool", "--files", "@" + str(paths)])
+    assert ArgFileCmdLine.files == ["one\ntwo", "three"]
+
+
+def test_nesting(tmp_path, monkeypatch):
+    inner = tmp_path / "inner"
+    inner.write_text("b\n", encoding="utf-8")
+    outer = tmp_path / "outer"
+    outer.write_text("a\n@{}\n".format(inner), encoding="utf-8")
+    ArgFileCmdLine.parse(["tool", "@" + str(outer)])
+    assert ArgFileCmdLine.positional_params == ["a", "b"]
+    ArgFileCmdLine.reset()
+    monkeypatch.setattr(ArgFileCmdLine, "parse_settings", ArgFileCmdLine
+                        .parse_settings.replace(arg_file_nesting=1))
+    assert ArgFileCmdLine.parse(["tool", "@" + str(outer)]) \
+        is ParseResultEnum.PARSE_ERROR
+    assert ArgFileCmdLine.parse_info.errors[0].kind is ErrorKindEnum.ARG_FILE
+    assert ArgFileCmdLine.parse_errors == [
+        "Arg files nested more than 1 deep at: {}".format(outer)]
+
+
+def test_missing_file(capsys):
+    assert ArgFileCmdLine.parse(["tool", "-v", "@no-such-file"]) \
+        is ParseResultEnum.PARSE_ERROR
+    assert ArgFileCmdLine.parse_info.errors[0].kind is ErrorKindEnum.ARG_FILE
+    assert ArgFileCmdLine.parse_errors == ["Unable to read arg file: no-such-file"]
+    ArgFileCmdLine.display_info(ParseResultEnum.PARSE_ERROR)
+    assert "Unable to read arg file: no-such-file" in capsys.readouterr().out
+
+
+def test_large_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(TokenReader, "CHUNK_SIZE", 64)
+    paths = ["/data/file-{:05}".format(i) for i in range(5000)]
+    path = tmp_path / "paths"
+    path.write_text("\n".join(paths), encoding="utf-8")
+    assert list(TokenReader(str(path))) == paths
+    ArgFileCmdLine.parse(["tool", "--files", "@" + str(path)])
+    assert ArgFileCmdLine.files == paths
+
+
+def test_lazy_stack():
+    read = []
+
+    def items():
+        for i in range(5000):
+            read.append(i)
+            yield str(i)
+    stack = Stack(items())
+    assert stack.peek() == "0"
+    assert stack.at_least(2)
+    assert len(read) < 5000
+    stack.pop()
+    assert stack.position() == 1
+    assert not stack.has_options()
+    assert stack.size() == 4999
+    assert stack.pop_all() == [str(i) for i in range(1, 5000)]
+    assert stack.is_empty() and stack.position() == 5000
+
+
+def test_has_options_reads_ahead():
+    read = []
+
+    def items():
+        for i in range(5000):
+            read.append(i)
+            yield "-x" if i == 1500 else str(i)
+    stack = Stack(items())
+    assert stack.has_options()
+    # only reads the windows up to the option
+    assert len(read) == 2 * Stack.READ_AHEAD
+    for _ in range(1500):
+        stack.pop()
+    assert stack.peek() == "-x"
+    stack.pop()
+    assert not stack.has_options()
+    assert stack.size() == 3499
@@ -0,0 +1,103 @@
+"""
+Smoke tests for the benchmark suite. Doesn't measure anything - just makes sure
+the generated specs and command lines parse, and the suite runs end to end.
+"""
+import json
+
+from pycmdparse.bench.__main__ import main
+from pycmdparse.bench.cold_start import ColdStart
+from pycmdparse.bench.compare_bench import CompareBench
+from pycmdparse.bench.micro_bench import MicroBench
+from pycmdparse.bench.spec_generator import SpecGenerator
+from pycmdparse.cmdline import CmdLine
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+
+
+def test_option_args_token_count():
+    args = SpecGenerator.option_args(10, 100)
+    assert args[0] == "bench"
+    assert 95 <= len(args) - 1 <= 100
+
+
+def test_run_case():
+    for scenario in MicroBench.SCENARIOS:
+        result = MicroBench.run_case(scenario, 10, 50, min_time=0)
+        assert result["iterations"] >= 1
+        assert result["ops_per_sec"] > 0
+        assert result["alloc_peak_bytes"] > 0
+
+
+def test_compare():
+    baseline = MicroBench.run([4], [10], ["options"], 0, False)
+    current = json.loads(json.dumps(baseline))
+    current["results"][0]["ops_per_sec"] /= 2
+    comparison = MicroBench.compare(baseline, current, 0.1)
+    assert len(comparison) == 1
+    assert comparison[0]["regression"]
+
+
+def test_main(tmp_path):
+    output = str(tmp_path / "bench.json")
+    assert main(["bench", "-o", "4", "-t", "10", "-m", "0.001", "--no-alloc",
+                 "--output", output]) == 0
+    with open(output) as f:
+        assert len(json.load(f)["results"]) == 2
+
+
+def test_cold_start(tmp_path):
+    script = tmp_path / "util.py"
+    script.write_text('''
+from pycmdparse.cmdline import CmdLine
+
+
+class UtilCmdLine(CmdLine):
+    yaml_def = """
+    supported_options:
+      - category:
+        options:
+        - long: verbose
+          opt : bool
+    """
+''')
+    results = ColdStart.run(str(script), ["--verbose"], runs=2)
+    assert set(results["variants"]) == set(ColdStart.VARIANTS)
+    for summary in results["variants"].values():
+        assert summary["total"]["median"] >= summary["import"]["median"]
+
+
+def test_argparse_equivalent():
+    """The generated argparse parser gets the same values as pycmdparse"""
+    class TestCmdLine(CmdLine):
+        yaml_def = SpecGenerator.yaml_spec(8)
+
+    args = SpecGenerator.option_args(8, 40)
+    TestCmdLine.parse(args)
+    namespace = CompareBench.to_argparse(TestCmdLine).parse_args(args[1:])
+    for i in range(8):
+        name = "opt{}".format(i)
+        assert getattr(namespace, name) == getattr(TestCmdLine, name)
+    short_opts, long_opts = CompareBench.to_getopt(TestCmdLine)
+    assert "opt0" in long_opts and "opt1=" in long_opts
+
+
+def test_compare_bench():
+    results = CompareBench.run(SpecGenerator.yaml_spec(4),
+                               [SpecGenerator.option_args(4, 10)], 0.01, 1)
+    for name in ["pycmdparse", "argparse", "getopt"]:
+        assert results[name]["parses_per_sec"] > 0
+
+
+def test_option_memory():
+    result = MicroBench.option_memory(8)
+    assert result["options"] == 8
+    assert result["bytes_per_option"] > 0
+
+
+def test_wrap():
+    result = MicroBench.wrap(10000, 40, 0.001)
+    assert result["bytes"] >= 10000
+    assert result["segments"] > 10000 / 40
@@ -0,0 +1,129 @@
+"""
+Tests the 'collect_errors' parse mode, in which the parser keeps going past
+recoverable errors and reports every problem in one pass, and the structured
+ParseError objects the parser records.
+"""
+from pycmdparse.abstract_opt import AbstractOpt
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.errorkind_enum import ErrorKindEnum
+from pycmdparse.opt_acceptresult_enum import OptAcceptResultEnum
+from pycmdparse.parse_error import ParseError
+from pycmdparse.parse_settings import ParseSettings
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+
+
+SPEC = '''
+    supported_options:
+      - category:
+        options:
+        - name    : a_opt
+          short   : a
+          opt     : bool
+        - name    : b_opt
+          short   : b
+          opt     : param
+          datatype: int
+        - name    : c_opt
+          short   : c
+          opt     : param
+          required: true
+        - name    : d_opt
+          short   : d
+          opt     : param
+    '''
+
+
+def test_stops_at_first_error():
+    class TestCmdLine(CmdLine):
+        yaml_def = SPEC
+
+    args = "util-name -x -b notanint -a -a"
+    parse_result = TestCmdLine.parse(args)
+    assert parse_result.value == ParseResultEnum.PARSE_ERROR.value
+    assert TestCmdLine.parse_errors == ["Unsupported option: '-x'"]
+
+
+def test_collects_all_errors():
+    class TestCmdLine(CmdLine):
+        yaml_def = SPEC
+        parse_settings = ParseSettings(collect_errors=True)
+
+        @classmethod
+        def validator(cls, to_validate):
+            if isinstance(to_validate, AbstractOpt) \
+                    and to_validate.opt_name == "d_opt" \
+                    and to_validate.value == "REJECTED":
+                return OptAcceptResultEnum.ERROR, "{rejected}"
+            return None,
+
+    args = "util-name -x -b notanint -a -a -d REJECTED"
+    parse_result = TestCmdLine.parse(args)
+    assert parse_result.value == ParseResultEnum.PARSE_ERROR.value
+    kinds = [error.kind for error in TestCmdLine.parse_info.errors]
+    assert kinds == [ErrorKindEnum.UNSUPPORTED_OPTION, ErrorKindEnum.OPTION_ERROR,
+                     ErrorKindEnum.INVALID_VALUE, ErrorKindEnum.MISSING_MANDATORY,
+                     ErrorKindEnum.VALIDATOR]
+    assert TestCmdLine.parse_info.errors[0].token_index == 1
+    assert TestCmdLine.parse_info.errors[1].option.opt_name == "a_opt"
+    assert TestCmdLine.parse_info.errors[1].token_index == 5
+    assert TestCmdLine.parse_info.errors[2].option.opt_name == "b_opt"
+    assert TestCmdLine.parse_errors == [
+        "Unsupported option: '-x'",
+        "Option -a already specified once",
+        "-b: ['notanint'] has incorrect data type. Expected int",
+        "Mandatory option(s) not provided: ['-c']",
+        "{rejected}"]
+    TestCmdLine.display_info(parse_result)  # for coverage
+
+
+def test_collect_missing_mandatory_only():
+    class TestCmdLine(CmdLine):
+        yaml_def = SPEC
+        parse_settings = ParseSettings(collect_errors=True)
+
+    parse_result = TestCmdLine.parse("util-name -a")
+    assert parse_result.value == ParseResultEnum.MISSING_MANDATORY_ARG.value
+    assert len(TestCmdLine.parse_info.errors) == 1
+
+
+def test_collect_success():
+    class TestCmdLine(CmdLine):
+        yaml_def = SPEC
+        parse_settings = ParseSettings(collect_errors=True)
+
+    parse_result = TestCmdLine.parse("util-name -a -b 1 -c X")
+    assert parse_result.value == ParseResultEnum.SUCCESS.value
+    assert TestCmdLine.parse_info.errors == []
+    assert TestCmdLine.b_opt == 1
+
+
+def test_errors_not_kept_between_parses():
+    class TestCmdLine(CmdLine):
+        yaml_def = SPEC
+
+    assert TestCmdLine.parse("util-name -x -c X") is ParseResultEnum.PARSE_ERROR
+    assert TestCmdLine.parse("util-name -a -c X") is ParseResultEnum.SUCCESS
+    assert TestCmdLine.parse_info.errors == []
+    assert TestCmdLine.parse("util-name -a") is ParseResultEnum.MISSING_MANDATORY_ARG
+    assert len(TestCmdLine.parse_info.errors) == 1
+
+
+def test_message_formatted_lazily():
+    class Counting:
+        calls = 0
+
+        def __format__(self, format_spec):
+            Counting.calls += 1
+            return "X"
+
+    error = ParseError(ErrorKindEnum.UNSUPPORTED_OPTION, "bad: {}", Counting())
+    assert Counting.calls == 0
+    assert str(error) == "bad: X"
+    assert error.message == "bad: X"
+    assert Counting.calls == 1
+    repr(error)  # for coverage
@@ -0,0 +1,151 @@
+"""
+Tests generating shell completion scripts, and answering completion requests
+from a completion index
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.completer import Completer
+from pycmdparse.completion import Completion
+
+ROOT = Path(__file__).parent.parent
+EXAMPLE = str(ROOT / "example" / "example.py")
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+
+
+class CompletionTestCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: mover
+    supported_options:
+      - category: Common options
+        options:
+        - name    : verbose
+          short   : v
+          long    : verbose
+          opt     : bool
+          help    : Causes verbose output. Can be repeated.
+        - name    : direction
+          short   : d
+          long    : direction
+          hint    : upload|download
+          opt     : param
+          help    : The direction to move files
+        - name    : target
+          long    : target
+          hint    : dir
+          opt     : param
+      - category: Internal
+        options:
+        - name    : trace
+          long    : trace
+          opt     : bool
+          internal: true
+    '''
+    verbose = None
+    direction = None
+    target = None
+    trace = None
+
+
+def completer():
+    return Completion.completer(Completion.entries(CompletionTestCmdLine))
+
+
+def test_entries():
+    entries = Completion.entries(CompletionTestCmdLine)
+    assert [(short_key, long_key, takes_param, choices)
+            for short_key, long_key, takes_param, choices, ignore in entries] == [
+        ("v", "verbose", False, []), ("d", "direction", True, ["upload", "download"]),
+        ("", "target", True, []), ("h", "help", False, []),
+        ("", "help-category", True, ["Common options"])]
+    assert entries[0][4] == "Causes verbose output"
+
+
+@pytest.mark.parametrize("words, expected", [
+    (["mover", "--d"], ["--direction"]),
+    (["mover", "-"], ["--verbose", "--direction", "--target", "--help",
+                      "--help-category", "-v", "-d", "-h"]),
+    (["mover", "-d", "up"], ["upload"]),
+    (["mover", "--direction="], ["--direction=upload", "--direction=download"]),
+    (["mover", "--target", ""], [Completer.FILES]),
+    (["mover", "-v", ""], [Completer.FILES]),
+    (["mover", "--", "--v"], [Completer.FILES]),
+    (["mover", "--verbose=x"], []),
+])
+def test_complete(words, expected):
+    assert completer().complete(len(words) - 1, words) == expected
+
+
+def test_complete_past_end():
+    assert completer().complete(2, ["mover", "-d"]) == ["upload", "download"]
+
+
+def test_index_round_trip(tmp_path):
+    index = tmp_path / "index"
+    index.write_text(completer().to_text(), encoding="utf-8")
+    assert Completer.load(str(index)).options == completer().options
+    index.write_text("not an index\n", encoding="utf-8")
+    assert Completer.load(str(index)) is None
+
+
+@pytest.mark.parametrize("shell", Completion.SHELLS)
+def test_static_script(shell):
+    script = Completion.script(shell, "mover", Completion.entries(
+        CompletionTestCmdLine))
+    assert "--direction" in script or "'direction'" in script
+    assert "download" in script
+    assert "trace" not in script
+    assert "completer.py" not in script
+
+
+@pytest.mark.parametrize("shell", Completion.SHELLS)
+def test_dynamic_script(shell, tmp_path):
+    script = Completion.script(shell, "mover", Completion.entries(
+        CompletionTestCmdLine), str(tmp_path / "index"))
+    assert "completer.py" in script
+    assert "download" not in script
+
+
+def test_zsh_compdef_first():
+    script = Completion.script("zsh", "mover", Completion.entries(
+        CompletionTestCmdLine))
+    assert script.startswith("#compdef mover\n")
+
+
+def test_command_line(tmp_path):
+    index = tmp_path / "index"
+    result = subprocess.run([sys.executable, "-m", "pycmdparse", "completion",
+                             "--index", str(index), "bash", EXAMPLE],
+                            stdout=subprocess.PIPE, universal_newlines=True,
+                            check=True, cwd=str(ROOT))
+    assert "complete -o default -F _foo_utility_complete foo-utility" in \
+        result.stdout
+    result = subprocess.run([sys.executable, "-m", "pycmdparse", "__complete",
+                             str(index), "1", "foo-utility", "--dep"],
+                            stdout=subprocess.PIPE, universal_newlines=True,
+                            check=True, cwd=str(ROOT))
+    assert result.stdout == "--depth\n"
+
+
+def test_responder_imports(tmp_path):
+    index = tmp_path / "index"
+    index.write_text(completer().to_text(), encoding="utf-8")
+    completer_py = str(ROOT / "pycmdparse" / "completer.py")
+    code = "import runpy, sys; sys.argv = {!r}; runpy.run_path(sys.argv[0], " \
+           "run_name='__main__')".format([completer_py, str(index), "1", "mover",
+                                          "--dir"])
+    result = subprocess.run([sys.executable, "-S", "-E", "-X", "importtime", "-c",
+                             code], stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, universal_newlines=True)
+    assert result.stdout == "--direction\n"
+    assert "yaml" not in result.stderr
+    assert "pycmdparse" not in result.stderr
@@ -0,0 +1,163 @@
+"""
+Tests options supplied by config files, and caching the loaded configs
+"""
+import os
+
+import pytest
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.config_cache import ConfigCache
+from pycmdparse.errorkind_enum import ErrorKindEnum
+from pycmdparse.parse_settings import ParseSettings
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+
+class ConfigCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: tool
+    supported_options:
+      - category:
+        options:
+        - name      : verbose
+          short     : v
+          opt       : bool
+        - name      : config
+          long      : config
+          opt       : param
+        - name      : depth
+          long      : depth
+          opt       : param
+          datatype  : int
+          default   : 1
+        - name      : size
+          long      : size
+          opt       : param
+          multi_type: exactly
+          count     : 2
+          datatype  : int
+        - name      : exclude
+          long      : exclude
+          opt       : param
+          multi_type: no-limit
+        - name      : user
+          long      : user
+          opt       : param
+          env       : TOOL_USER
+    '''
+    parse_settings = ParseSettings(config_option="config")
+    verbose = None
+    config = None
+    depth = None
+    size = None
+    exclude = None
+    user = None
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+    ConfigCmdLine.reset()
+    ConfigCache.clear()
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_formats(tmp_path):
+    configs = [
+        write(tmp_path / "a.yaml", "verbose: true\ndepth: 3\nsize: [4, 5]\n"
+                                   "exclude: [x, 'y z']\nuser: 42\n"),
+        write(tmp_path / "a.toml", "verbose = true\ndepth = 3\nsize = [4, 5]\n"
+                                   "exclude = ['x', 'y z']\nuser = 42\n"),
+        write(tmp_path / "a.ini", "[tool]\nverbose = yes\ndepth = 3\nsize = 4 5\n"
+                                  "exclude = x 'y z'\nuser = 42\n")]
+    for config in configs:
+        ConfigCmdLine.reset()
+        assert ConfigCmdLine.parse(["tool", "--config", config]) \
+            is ParseResultEnum.SUCCESS, config
+        assert ConfigCmdLine.verbose is True
+        assert ConfigCmdLine.depth == 3
+        assert ConfigCmdLine.size == [4, 5]
+        assert ConfigCmdLine.exclude == ["x", "y z"]
+        assert ConfigCmdLine.user == "42"
+
+
+def test_layering(tmp_path, monkeypatch):
+    system = write(tmp_path / "system.yaml", "depth: 2\nuser: root\nexclude: [a]\n")
+    user = write(tmp_path / "user.yaml", "depth: 3\n")
+    explicit = write(tmp_path / "explicit.yml", "exclude: [b]\n")
+    monkeypatch.setattr(ConfigCmdLine, "parse_settings", ParseSettings(
+        config_option="config",
+        config_files=[system, str(tmp_path / "missing.yaml"), user]))
+    assert ConfigCmdLine.parse(["tool"]) is ParseResultEnum.SUCCESS
+    assert ConfigCmdLine.depth == 3
+    assert ConfigCmdLine.user == "root"
+    assert ConfigCmdLine.exclude == ["a"]
+    ConfigCmdLine.reset()
+    monkeypatch.setenv("TOOL_USER", "admin")
+    assert ConfigCmdLine.parse(["tool", "--config", explicit, "--depth", "9"]) \
+        is ParseResultEnum.SUCCESS
+    # command line, then environment, then config files - the explicit one last
+    assert ConfigCmdLine.depth == 9
+    assert ConfigCmdLine.user == "admin"
+    assert ConfigCmdLine.exclude == ["b"]
+
+
+@pytest.mark.parametrize("text, kind, message", [
+    ("size: [1]\n", ErrorKindEnum.INVALID_VALUE,
+     "size in {}: expected 2 parameter(s) but found 1"),
+    ("depth: deep\n", ErrorKindEnum.INVALID_VALUE,
+     "depth in {}: ['deep'] has incorrect data type. Expected int"),
+    ("verbose: maybe\n", ErrorKindEnum.INVALID_VALUE,
+     "verbose in {}: expected true or false but found 'maybe'"),
+    ("colour: red\n", ErrorKindEnum.CONFIG_ERROR,
+     "{}: unsupported option: 'colour'"),
+    ("- depth\n", ErrorKindEnum.CONFIG_ERROR,
+     "Config file must hold a mapping of option names to values: {}")])
+def test_invalid(tmp_path, text, kind, message):
+    config = write(tmp_path / "bad.yaml", text)
+    assert ConfigCmdLine.parse(["tool", "--config", config]) \
+        is ParseResultEnum.PARSE_ERROR
+    assert ConfigCmdLine.parse_info.errors[0].kind is kind
+    assert ConfigCmdLine.parse_errors == [message.format(config)]
+
+
+def test_missing_config():
+    assert ConfigCmdLine.parse(["tool", "--config", "no-such.yaml"]) \
+        is ParseResultEnum.PARSE_ERROR
+    assert ConfigCmdLine.parse_errors == ["Config file not found: no-such.yaml"]
+
+
+def test_cache(tmp_path, monkeypatch):
+    config = write(tmp_path / "a.yaml", "depth: 3\n")
+    cache_dir = str(tmp_path / "cache")
+    assert ConfigCache.load(config, cache_dir) == {"depth": 3}
+    parsed = []
+    parse = ConfigCache._parse
+
+    def counting(path):
+        parsed.append(path)
+        return parse(path)
+    monkeypatch.setattr(ConfigCache, "_parse", staticmethod(counting))
+    stats = []
+    stat = os.stat
+
+    def counting_stat(path, *args, **kwargs):
+        stats.append(path)
+        return stat(path, *args, **kwargs)
+    monkeypatch.setattr(os, "stat", counting_stat)
+    assert ConfigCache.load(config, cache_dir) == {"depth": 3}
+    assert len(stats) == 1
+    # a new process reads the values persisted in the cache directory
+    ConfigCache.clear()
+    assert ConfigCache.load(config, cache_dir) == {"depth": 3}
+    assert parsed == []
+    # a changed config is parsed again
+    write(tmp_path / "a.yaml", "depth: 40\n")
+    assert ConfigCache.load(config, cache_dir) == {"depth": 40}
+    ConfigCache.clear()
+    assert ConfigCache.load(config, cache_dir) == {"depth": 40}
+    assert parsed == [os.path.abspath(config)]
@@ -0,0 +1,126 @@
+"""
+Tests defaults computed by callables
+"""
+import pytest
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.default_call import DefaultCall
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+calls = []
+
+
+def newest_snapshot():
+    calls.append("newest_snapshot")
+    return "snap-3"
+
+
+class DefaultCallCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: tool
+    supported_options:
+      - category:
+        options:
+        - name        : jobs
+          long        : jobs
+          opt         : param
+          datatype    : int
+          default_call: cpu_count
+        - name        : snapshot
+          long        : snapshot
+          opt         : param
+          default_call: MODULE.newest_snapshot
+        - name        : sizes
+          long        : sizes
+          opt         : param
+          multi_type  : at-most
+          count       : 2
+          datatype    : int
+          default_call: default_sizes
+    '''.replace("MODULE", __name__)
+    jobs = None
+    snapshot = None
+    sizes = None
+
+    @classmethod
+    def cpu_count(cls):
+        calls.append("cpu_count")
+        return "4"
+
+    @classmethod
+    def default_sizes(cls):
+        calls.append("sizes")
+        return ["1", "2", "3"]
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+    DefaultCallCmdLine.reset()
+    DefaultCall.clear()
+    calls.clear()
+
+
+def test_called_when_read():
+    assert DefaultCallCmdLine.parse(["tool"]) is ParseResultEnum.SUCCESS
+    assert calls == []
+    assert DefaultCallCmdLine.jobs == 4
+    assert DefaultCallCmdLine.jobs == 4
+    assert calls == ["cpu_count"]
+    assert DefaultCallCmdLine.snapshot == "snap-3"
+    assert calls == ["cpu_count", "newest_snapshot"]
+
+
+def test_not_called_when_supplied():
+    assert DefaultCallCmdLine.parse(["tool", "--jobs", "2", "--snapshot", "s"]) \
+        is ParseResultEnum.SUCCESS
+    assert DefaultCallCmdLine.jobs == 2
+    assert DefaultCallCmdLine.snapshot == "s"
+    assert calls == []
+
+
+def test_cached_for_process():
+    for i in range(3):
+        DefaultCallCmdLine.reset()
+        DefaultCallCmdLine.parse(["tool"])
+        assert DefaultCallCmdLine.jobs == 4
+        assert DefaultCallCmdLine.get_option("jobs").value == 4
+    assert calls == ["cpu_count"]
+
+
+def test_invalid_result():
+    DefaultCallCmdLine.parse(["tool"])
+    with pytest.raises(CmdLineException, match="Invalid defaults supplied"):
+        print(DefaultCallCmdLine.sizes)
+
+
+def test_invalid_result_raises_on_every_read(monkeypatch):
+    monkeypatch.setattr(DefaultCallCmdLine, "cpu_count", classmethod(
+        lambda cls: "notint"))
+    assert DefaultCallCmdLine.parse(["tool"]) is ParseResultEnum.SUCCESS
+    for i in range(2):
+        with pytest.raises(CmdLineException, match="Data type does not match"):
+            print(DefaultCallCmdLine.jobs)
+        with pytest.raises(CmdLineException, match="Data type does not match"):
+            print(DefaultCallCmdLine.parse_info.result.jobs)
+
+
+@pytest.mark.parametrize("entry, message", [
+    (__name__ + ".missing", "Unable to find default_call"),
+    ("no_such_method", "Unable to find default_call")])
+def test_not_found(monkeypatch, entry, message):
+    monkeypatch.setattr(DefaultCallCmdLine, "yaml_def",
+                        DefaultCallCmdLine.yaml_def.replace("cpu_count", entry))
+    DefaultCallCmdLine.parse(["tool"])
+    with pytest.raises(CmdLineException, match=message):
+        print(DefaultCallCmdLine.jobs)
+
+
+def test_default_and_default_call(monkeypatch):
+    monkeypatch.setattr(DefaultCallCmdLine, "yaml_def", DefaultCallCmdLine.yaml_def
+                        .replace("default_call: cpu_count",
+                                 "default_call: cpu_count\n          default: 1"))
+    with pytest.raises(CmdLineException, match="both a default and a default_call"):
+        DefaultCallCmdLine.parse(["tool"])
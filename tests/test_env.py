@@ -0,0 +1,128 @@
+"""
+Tests options supplied by environment variables
+"""
+import pytest
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.errorkind_enum import ErrorKindEnum
+from pycmdparse.incremental_parser import IncrementalParser
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+
+class EnvCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: tool
+      env_prefix: TOOL_
+    supported_options:
+      - category:
+        options:
+        - name      : verbose
+          short     : v
+          opt       : bool
+          env       : true
+        - name      : log_level
+          long      : log-level
+          opt       : param
+          default   : info
+          env       : true
+        - name      : threads
+          long      : threads
+          opt       : param
+          datatype  : int
+          env       : NUM_THREADS
+        - name      : tags
+          long      : tags
+          opt       : param
+          multi_type: at-most
+          count     : 2
+          env       : TAGS
+        - name      : user
+          long      : user
+          opt       : param
+    '''
+    verbose = None
+    log_level = None
+    threads = None
+    tags = None
+    user = None
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+    EnvCmdLine.reset()
+
+
+def test_env_names():
+    EnvCmdLine.parse(["tool"])
+    assert sorted(EnvCmdLine._env_options) == ["TOOL_LOG_LEVEL", "TOOL_NUM_THREADS",
+                                               "TOOL_TAGS", "TOOL_VERBOSE"]
+    assert EnvCmdLine.get_option("user").env_name is None
+
+
+def test_precedence(monkeypatch):
+    assert EnvCmdLine.parse(["tool"]) is ParseResultEnum.SUCCESS
+    assert EnvCmdLine.log_level == "info" and not EnvCmdLine.verbose
+    EnvCmdLine.reset()
+    monkeypatch.setenv("TOOL_LOG_LEVEL", "debug")
+    monkeypatch.setenv("TOOL_VERBOSE", "Yes")
+    assert EnvCmdLine.parse(["tool"]) is ParseResultEnum.SUCCESS
+    assert EnvCmdLine.log_level == "debug" and EnvCmdLine.verbose
+    verbose = EnvCmdLine.get_option("verbose")
+    assert verbose.supplied_key == "$TOOL_VERBOSE" and not verbose.from_cmdline
+    EnvCmdLine.reset()
+    assert EnvCmdLine.parse(["tool", "--log-level", "warn"]) \
+        is ParseResultEnum.SUCCESS
+    assert EnvCmdLine.log_level == "warn"
+    EnvCmdLine.reset()
+    monkeypatch.setenv("TOOL_LOG_LEVEL", "")
+    monkeypatch.setenv("TOOL_VERBOSE", "off")
+    assert EnvCmdLine.parse(["tool"]) is ParseResultEnum.SUCCESS
+    assert EnvCmdLine.log_level == "info" and EnvCmdLine.verbose is False
+    verbose = EnvCmdLine.get_option("verbose")
+    assert verbose.supplied_key == "$TOOL_VERBOSE" and not verbose.from_cmdline
+    EnvCmdLine.reset()
+    assert EnvCmdLine.parse(["tool", "-v"]) is ParseResultEnum.SUCCESS
+    assert EnvCmdLine.get_option("verbose").from_cmdline
+
+
+def test_conversion(monkeypatch):
+    monkeypatch.setenv("TOOL_NUM_THREADS", "8")
+    monkeypatch.setenv("TOOL_TAGS", "a 'b c'")
+    assert EnvCmdLine.parse(["tool"]) is ParseResultEnum.SUCCESS
+    assert EnvCmdLine.threads == 8
+    assert EnvCmdLine.tags == ["a", "b c"]
+
+
+@pytest.mark.parametrize("name, value, message", [
+    ("TOOL_NUM_THREADS", "many", "$TOOL_NUM_THREADS: ['many'] has incorrect data "
+                                 "type. Expected int"),
+    ("TOOL_TAGS", "a b c", "$TOOL_TAGS: expected at most 2 parameter(s) but "
+                           "found 3"),
+    ("TOOL_VERBOSE", "maybe", "$TOOL_VERBOSE: expected true or false but found "
+                              "'maybe'")])
+def test_invalid(monkeypatch, name, value, message):
+    monkeypatch.setenv(name, value)
+    assert EnvCmdLine.parse(["tool"]) is ParseResultEnum.PARSE_ERROR
+    assert EnvCmdLine.parse_info.errors[0].kind is ErrorKindEnum.INVALID_VALUE
+    assert EnvCmdLine.parse_errors == [message]
+
+
+def test_duplicate_env_name(monkeypatch):
+    monkeypatch.setattr(EnvCmdLine, "yaml_def", EnvCmdLine.yaml_def.replace(
+        "NUM_THREADS", "TAGS"))
+    with pytest.raises(CmdLineException, match="same env name: TOOL_TAGS"):
+        EnvCmdLine.parse(["tool"])
+
+
+def test_incremental(monkeypatch):
+    monkeypatch.setenv("TOOL_TAGS", "x")
+    parser = IncrementalParser(EnvCmdLine)
+    assert parser.update("tool -v") is ParseResultEnum.SUCCESS
+    assert EnvCmdLine.tags == ["x"]
+    assert parser.update("tool -v --tags y") is ParseResultEnum.SUCCESS
+    assert EnvCmdLine.tags == ["y"]
+    assert parser.update("tool") is ParseResultEnum.SUCCESS
+    assert EnvCmdLine.tags == ["x"]
@@ -0,0 +1,83 @@
+"""
+Tests that usage instructions are rendered once per spec and console width, and
+can be persisted to, and reused from, a cache directory.
+"""
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.help_cache import HelpCache
+from pycmdparse.parse_settings import ParseSettings
+from pycmdparse.showinfo import ShowInfo
+
+YAML = '''
+utility:
+  name: util-name
+summary: >
+  A summary
+supported_options:
+  - category:
+    options:
+    - name  : verbose
+      short : v
+      long  : verbose
+      help  : >
+        Verbose output.
+'''
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+    HelpCache.clear()
+
+
+def new_cmdline():
+    class TestCmdLine(CmdLine):
+        yaml_def = YAML
+        verbose = None
+    return TestCmdLine
+
+
+def test_rendered_once(capsys, monkeypatch):
+    cmdline = new_cmdline()
+    cmdline.parse("util-name")
+    cmdline.show_usage()
+    first = capsys.readouterr().out
+    assert "-v,--verbose" in first
+
+    def fail(*args):
+        raise AssertionError("rendered twice")
+    monkeypatch.setattr(ShowInfo, "usage_lines", fail)
+    cmdline.show_usage()
+    assert capsys.readouterr().out == first
+
+
+def test_keyed_by_width():
+    spec_hash = HelpCache.spec_hash(YAML)
+    HelpCache.put(spec_hash, 80, "80 wide", True)
+    assert HelpCache.get(spec_hash, 80) == ("80 wide", True)
+    assert HelpCache.get(spec_hash, 100) is None
+    assert HelpCache.get(HelpCache.spec_hash(YAML + " "), 80) is None
+
+
+def test_cache_dir(capsys, tmp_path):
+    cmdline = new_cmdline()
+    cmdline.parse_settings = ParseSettings(cache_dir=str(tmp_path))
+    cmdline.parse("util-name")
+    cmdline.show_usage()
+    rendered = capsys.readouterr().out
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # a new process starts with an empty in-memory cache
+    HelpCache.clear()
+    spec_hash = HelpCache.spec_hash(YAML)
+    assert HelpCache.get(spec_hash, ShowInfo.terminal_width(),
+                         str(tmp_path)) == (rendered, True)
+
+
+def test_unwritable_cache_dir(capsys, tmp_path):
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+    cmdline = new_cmdline()
+    cmdline.parse_settings = ParseSettings(cache_dir=str(not_a_dir))
+    cmdline.parse("util-name")
+    cmdline.show_usage()
+    assert "util-name" in capsys.readouterr().out
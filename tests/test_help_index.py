@@ -0,0 +1,161 @@
+"""
+Tests searching the options with '--help=<term>', and selecting a category of
+options with '--help-category <name>'
+"""
+import yaml
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.help_cache import HelpCache
+from pycmdparse.help_index import HelpIndex
+from pycmdparse.parse_settings import ParseSettings
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+YAML = '''
+utility:
+  name: util-name
+supported_options:
+  - category: Common options
+    options:
+    - name  : verbose
+      short : v
+      long  : verbose
+      opt   : bool
+      help  : >
+        Causes verbose output.
+    - name  : file_name
+      short : f
+      long  : file-name
+      hint  : path
+      help  : >
+        The file to read.
+  - category: Less common options
+    options:
+    - name  : depth
+      short : d
+      long  : depth
+      hint  : n
+      help  : >
+        The recursion level of the search.
+    - name    : secret
+      long    : secret
+      internal: true
+      help    : >
+        A verbose internal option.
+'''
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+    HelpCache.clear()
+
+
+def new_cmdline(yaml_def=YAML):
+    class TestCmdLine(CmdLine):
+        pass
+    TestCmdLine.yaml_def = yaml_def
+    return TestCmdLine
+
+
+def names(selected):
+    return [opt.opt_name for category in selected for opt in category.options]
+
+
+def test_search():
+    index = HelpIndex.from_spec(yaml.load(YAML, Loader=yaml.FullLoader))
+    assert names(index.search("verbose")) == ["verbose"]
+    assert names(index.search("RECURS")) == ["depth"]
+    assert names(index.search("--file-name")) == ["file_name"]
+    assert names(index.search("the")) == ["file_name", "depth"]
+    assert names(index.search("the file")) == ["file_name"]
+    assert index.search("nothing") == []
+    assert index.search("--") == []
+
+
+def test_category():
+    index = HelpIndex.from_spec(yaml.load(YAML, Loader=yaml.FullLoader))
+    assert names(index.category(" less COMMON options ")) == ["depth"]
+    assert index.category("nope") == []
+    assert index.category_names == ["Common options", "Less common options"]
+
+
+def test_internal_category():
+    # a category of only internal options isn't listed
+    index = HelpIndex.from_spec(yaml.load(YAML + '''
+  - category: Internal options
+    options:
+    - name    : trace
+      long    : trace
+      internal: true
+''', Loader=yaml.FullLoader))
+    assert index.category_names == ["Common options", "Less common options"]
+    assert index.category("internal options") == []
+
+
+def test_round_trip():
+    index = HelpIndex.from_spec(yaml.load(YAML, Loader=yaml.FullLoader))
+    copy = HelpIndex.from_dict(index.to_dict())
+    assert names(copy.search("the")) == names(index.search("the"))
+    assert copy.category_names == index.category_names
+
+
+def test_help_term(capsys):
+    cmdline = new_cmdline()
+    for cmd_line in ["util-name --help=recursion", "util-name -h=recursion",
+                     ["util-name", "--help=recursion", "--verbose"]]:
+        cmdline.reset()
+        parse_result = cmdline.parse(cmd_line)
+        assert parse_result is ParseResultEnum.SHOW_USAGE
+        cmdline.display_info(parse_result)
+        out = capsys.readouterr().out
+        assert "Options matching 'recursion'" in out
+        assert "--depth" in out
+        assert "--verbose" not in out
+
+
+def test_help_arg_shows_usage(capsys):
+    # only '--help=<term>' searches - an arg following '-h' doesn't
+    cmdline = new_cmdline()
+    for cmd_line in ["util-name -h recursion", "util-name --help recursion"]:
+        cmdline.reset()
+        parse_result = cmdline.parse(cmd_line)
+        assert parse_result is ParseResultEnum.SHOW_USAGE
+        cmdline.display_info(parse_result)
+        out = capsys.readouterr().out
+        assert "Options matching" not in out
+        assert "--depth" in out and "--verbose" in out
+
+
+def test_help_category(capsys, tmp_path):
+    cmdline = new_cmdline()
+    cmdline.parse_settings = ParseSettings(cache_dir=str(tmp_path))
+    parse_result = cmdline.parse("util-name --help-category 'less common options'")
+    assert parse_result is ParseResultEnum.SHOW_USAGE
+    cmdline.display_info(parse_result)
+    out = capsys.readouterr().out
+    assert "--depth" in out
+    assert "--verbose" not in out
+    assert "--secret" not in out
+    assert (tmp_path / "index-{}.json".format(
+        HelpCache.spec_hash(cmdline.yaml_def))).exists()
+
+    # in a new process, the persisted index is used
+    HelpCache.clear()
+    cmdline.reset()
+    parse_result = cmdline.parse("util-name --help-category nope")
+    cmdline.display_info(parse_result)
+    out = capsys.readouterr().out
+    assert "Unknown help category: 'nope'" in out
+    assert "Less common options" in out
+
+
+def test_help_category_option_defined():
+    # if the spec defines --help-category, then it's not a request for help
+    cmdline = new_cmdline('''
+    supported_options:
+      - category:
+        options:
+        - long : help-category
+    ''')
+    assert cmdline.parse("util-name --help-category X") is ParseResultEnum.SUCCESS
+    assert cmdline.help_category == "X"
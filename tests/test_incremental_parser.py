@@ -0,0 +1,148 @@
+"""
+Tests re-parsing a command line incrementally as it is edited
+"""
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.errorkind_enum import ErrorKindEnum
+from pycmdparse.incremental_parser import IncrementalParser
+from pycmdparse.parse_settings import ParseSettings
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+
+
+class IncrementalCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: mover
+    positional_params:
+      params: FILE...
+      text: The files to move
+    supported_options:
+      - category:
+        options:
+        - name      : verbose
+          short     : v
+          long      : verbose
+          opt       : bool
+        - name      : action
+          short     : a
+          long      : action
+          opt       : param
+        - name      : size
+          short     : s
+          long      : size
+          opt       : param
+          multi_type: exactly
+          count     : 2
+          datatype  : int
+        - name      : tags
+          long      : tags
+          opt       : param
+          multi_type: no-limit
+        - name      : trace
+          long      : trace
+          opt       : bool
+          internal  : true
+    '''
+    parse_settings = ParseSettings(collect_errors=True)
+
+
+def count_steps(monkeypatch):
+    """
+    :return: a list that gets one element per token parsed
+    """
+    steps = []
+    parse_token = CmdLine._parse_token.__func__
+
+    def counting(cls, *args):
+        steps.append(args[0].peek())
+        return parse_token(cls, *args)
+    monkeypatch.setattr(CmdLine, "_parse_token", classmethod(counting))
+    return steps
+
+
+def test_same_as_parse():
+    parser = IncrementalParser(IncrementalCmdLine)
+    for line in ["mover -v", "mover -v -a up", "mover -v -a up -s 1", "mover -v -a",
+                 "mover -v -a up -s 1 2 f1 f2", "mover -v -a up -s 1 x",
+                 "mover --tags a b -- f1"]:
+        parse_result = parser.update(line)
+        errors = [(e.kind, e.message, e.token_index) for e in parser.errors]
+        values = [IncrementalCmdLine.verbose, IncrementalCmdLine.action,
+                  IncrementalCmdLine.size, IncrementalCmdLine.tags,
+                  IncrementalCmdLine.positional_params] \
+            if parse_result is ParseResultEnum.SUCCESS else None
+
+        class FreshCmdLine(CmdLine):
+            yaml_def = IncrementalCmdLine.yaml_def
+            parse_settings = ParseSettings(collect_errors=True)
+        assert FreshCmdLine.parse(line) is parse_result, line
+        assert [(e.kind, e.message, e.token_index)
+                for e in FreshCmdLine.parse_info.errors] == errors, line
+        if values:
+            assert [FreshCmdLine.verbose, FreshCmdLine.action, FreshCmdLine.size,
+                    FreshCmdLine.tags, FreshCmdLine.positional_params] == values
+
+
+def test_prefix_reused(monkeypatch):
+    parser = IncrementalParser(IncrementalCmdLine)
+    parser.update("mover -v -a up --tags x")
+    steps = count_steps(monkeypatch)
+    assert parser.update("mover -v -a up --tags x y") is ParseResultEnum.SUCCESS
+    # -v and -a are reused. --tags looked at the end of the line, so it's redone
+    assert steps == ["--tags"]
+    assert IncrementalCmdLine.tags == ["x", "y"]
+
+
+def test_edit_restores_options(monkeypatch):
+    parser = IncrementalParser(IncrementalCmdLine)
+    parser.update("mover -v -a up -s 1 2")
+    assert IncrementalCmdLine.size == [1, 2]
+    steps = count_steps(monkeypatch)
+    assert parser.update("mover -v -a down -s 3 4") is ParseResultEnum.SUCCESS
+    assert steps == ["-a", "-s"]
+    assert IncrementalCmdLine.action == "down"
+    assert IncrementalCmdLine.size == [3, 4]
+    assert parser.update("mover -v") is ParseResultEnum.SUCCESS
+    assert IncrementalCmdLine.action is None
+    assert IncrementalCmdLine.size == []
+
+
+def test_error_span():
+    parser = IncrementalParser(IncrementalCmdLine)
+    line = "mover -v --bogus=1 -a up"
+    assert parser.update(line) is ParseResultEnum.PARSE_ERROR
+    error = parser.errors[0]
+    assert error.kind is ErrorKindEnum.UNSUPPORTED_OPTION
+    start, end = parser.token_span(error.token_index)
+    assert line[start:end] == "--bogus=1"
+    assert parser.token_span(None) is None
+
+
+def test_expected_next():
+    parser = IncrementalParser(IncrementalCmdLine)
+    parser.update("mover -v")
+    assert parser.pending_param() is None
+    assert [opt.opt_name for opt in parser.valid_options()] == ["action", "size",
+                                                                "tags"]
+    parser.update("mover -v -s 1")
+    option, remaining = parser.pending_param()
+    assert option.opt_name == "size" and remaining == 1
+    assert parser.valid_options() == []
+    parser.update("mover -v --tags a")
+    option, remaining = parser.pending_param()
+    assert option.opt_name == "tags" and remaining is None
+    assert len(parser.valid_options()) == 3
+    parser.update("mover -v -- f1")
+    assert parser.valid_options() == []
+
+
+def test_unclosed_quote():
+    parser = IncrementalParser(IncrementalCmdLine)
+    assert parser.update('mover -a "up and') is ParseResultEnum.SUCCESS
+    assert IncrementalCmdLine.action == "up and"
+    assert parser.update('mover -a "up and away" f1') is ParseResultEnum.SUCCESS
+    assert IncrementalCmdLine.positional_params == ["f1"]
@@ -0,0 +1,76 @@
+"""
+Tests checking specs - when the options are built, and with the linter
+"""
+import pytest
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.lint import Lint, main
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+
+
+def spec_cmdline(options, extra=""):
+    class SpecCmdLine(CmdLine):
+        yaml_def = '''
+        utility:
+          name: tool
+        {}
+        supported_options:
+          - category:
+            options:
+        '''.format(extra) + "".join(
+            "\n            - " + "\n              ".join(option.split(";"))
+            for option in options)
+    return SpecCmdLine
+
+
+@pytest.mark.parametrize("options, message", [
+    (["short: v;opt: bool", "name: verbose;short: v;opt: bool"],
+     "Short key '-v' is used by more than one option"),
+    (["long: depth", "name: level;long: depth"],
+     "Long key '--depth' is used by more than one option"),
+    (["long: dry-run;opt: bool", "name: dry_run;short: n;opt: bool"],
+     "Specified option name 'dry_run' is used by more than one option"),
+    (["long: reset;opt: bool"], "Specified option name 'reset' clashes"),
+    (["name: 2fast;long: fast"],
+     "Specified option name '2fast' must be a valid Python identifier")])
+def test_checked_when_built(options, message):
+    cmdline = spec_cmdline(options)
+    with pytest.raises(CmdLineException) as e:
+        cmdline.parse(["tool"])
+    assert e.value.args[0] == message
+    assert Lint.lint(cmdline) == [message]
+
+
+def test_lint():
+    cmdline = spec_cmdline([
+        "short: v;opt: bool;hlep: typo", "long: depth;required: true;default: 1",
+        "long: jobs;default_call: no_such_method", "long: size;datatype: int;"
+        "default: big", "long: user;env: TOOL_USER", "long: name;env: TOOL_USER",
+        "long: mode;opt: toggle"], "envprefix: X_")
+    assert Lint.lint(cmdline) == [
+        "Unknown section: 'envprefix'",
+        "Option 'v': unknown entry: 'hlep'",
+        "Option 'depth': a required option's default is ignored",
+        "Option 'jobs': Unable to find default_call: no_such_method",
+        "Option 'size': Data type does not match specification: ['big']",
+        "Option 'mode': Unknown option type: toggle",
+        "Env name 'TOOL_USER' is used by more than one option"]
+    assert Lint.lint(spec_cmdline(["short: v;opt: bool"])) == []
+
+
+def test_main(tmp_path, capsys):
+    good = tmp_path / "good.yaml"
+    good.write_text("supported_options:\n  - category:\n    options:\n"
+                    "    - long: depth\n", encoding="utf-8")
+    bad = tmp_path / "bad.yaml"
+    bad.write_text("summary: [\n", encoding="utf-8")
+    assert main(["lint", str(good)]) == 0
+    assert capsys.readouterr().out == "{}: ok\n".format(good)
+    assert main(["lint", "-q", str(good), str(bad)]) == 1
+    out = capsys.readouterr().out
+    assert out.startswith("{}: Error parsing the yaml".format(bad))
@@ -267,6 +267,26 @@ def test_name_clash():
         assert e.args[0] == "Specified option name '_supported_options' clashes"
 
 
+def test_settings_names_not_reserved():
+    # the settings and the parse info are held in one object each, so options can
+    # have the names of their fields
+    names = ["collect_errors", "stats", "cache_dir", "use_pager", "arg_file_prefix",
+             "config_files", "plugin_group", "errors", "result", "subcommand",
+             "passthrough"]
+
+    class TestCmdLine(CmdLine):
+        yaml_def = "supported_options:\n  - category:\n    options:\n" + "".join(
+            "    - name: {}\n      long: {}\n      opt: bool\n"
+            .format(name, name.replace("_", "-")) for name in names)
+
+    args = ["util-name"] + ["--" + name.replace("_", "-") for name in names]
+    assert TestCmdLine.parse(args) is ParseResultEnum.SUCCESS
+    for name in names:
+        assert getattr(TestCmdLine, name) is True
+        assert getattr(TestCmdLine.parse_info.result, name) is True
+    assert TestCmdLine.parse_info.errors == []
+
+
 def test_no_param():
     class TestCmdLine(CmdLine):
         yaml_def = '''
@@ -349,3 +369,28 @@ def test_full_usage():
     parse_result = TestCmdLine.parse(args)
     assert parse_result.value == ParseResultEnum.SHOW_USAGE.value
     TestCmdLine.display_info(parse_result)  # for coverage
+
+
+def test_slots():
+    """Spec objects don't carry a per-instance __dict__"""
+    class TestCmdLine(CmdLine):
+        yaml_def = '''
+        positional_params:
+          params: X
+          text: X
+        supported_options:
+          - category:
+            options:
+            - long : a-opt
+              opt  : bool
+            - long : b-opt
+        examples:
+          - example: X
+            explanation: X
+        '''
+    TestCmdLine.parse("util-name")
+    objects = [TestCmdLine._positional_params, TestCmdLine._examples[0],
+               TestCmdLine._supported_options[0]]
+    objects.extend(TestCmdLine._supported_options[0].options)
+    for obj in objects:
+        assert not hasattr(obj, "__dict__")
@@ -0,0 +1,175 @@
+"""
+Tests creating options only when they're referenced (OptTable)
+"""
+import pytest
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.parse_settings import ParseSettings
+from pycmdparse.parse_stats import ParseStats
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+
+class TableCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: tool
+      env_prefix: TOOL_
+    supported_options:
+      - category: first
+        options:
+        - name      : verbose
+          short     : v
+          opt       : bool
+        - name      : level
+          long      : level
+          opt       : param
+          env       : true
+        - name      : tags
+          long      : tags
+          opt       : param
+          multi_type: no-limit
+      - category: second
+        options:
+        - name      : depth
+          long      : depth
+          opt       : param
+          datatype  : int
+          default   : 3
+        - name      : start
+          long      : start
+          opt       : param
+          datatype  : date
+          default   : 2020-01-02
+        - name      : user
+          long      : user
+          opt       : param
+          required  : true
+        - name      : jobs
+          long      : jobs
+          opt       : param
+          datatype  : int
+          default_call: cpu_count
+    '''
+    verbose = None
+    level = None
+    tags = None
+    depth = None
+    start = None
+    user = None
+    jobs = None
+
+    calls = 0
+
+    @classmethod
+    def cpu_count(cls):
+        cls.calls += 1
+        return 8
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+    TableCmdLine.reset()
+    TableCmdLine.calls = 0
+
+
+def created(cmdline):
+    return [option.opt_name for option in cmdline._opt_table.created()]
+
+
+def test_only_used_options_created():
+    assert TableCmdLine.parse("tool -v --user me") is ParseResultEnum.SUCCESS
+    # the required option is created to check it was supplied, and the options
+    # having defaults to convert them
+    assert created(TableCmdLine) == ["verbose", "depth", "start", "user", "jobs"]
+    assert TableCmdLine.verbose is True and TableCmdLine.user == "me"
+    assert TableCmdLine.level is None and TableCmdLine.tags == []
+    assert TableCmdLine.depth == 3
+    assert TableCmdLine.calls == 0
+    assert TableCmdLine.jobs == 8 and TableCmdLine.parse_info.result.jobs == 8
+    assert TableCmdLine.parse_info.result.tags == []
+
+
+def test_env_option_created_when_set(monkeypatch):
+    assert TableCmdLine.parse("tool --user me") \
+        is ParseResultEnum.SUCCESS
+    assert "level" not in created(TableCmdLine)
+    TableCmdLine.reset()
+    monkeypatch.setenv("TOOL_LEVEL", "debug")
+    assert TableCmdLine.parse("tool --user me") \
+        is ParseResultEnum.SUCCESS
+    assert TableCmdLine.level == "debug"
+
+
+def test_missing_mandatory():
+    assert TableCmdLine.parse("tool -v") \
+        is ParseResultEnum.MISSING_MANDATORY_ARG
+    assert TableCmdLine.parse_errors == \
+        ["Mandatory option(s) not provided: ['--user']"]
+
+
+def test_keys():
+    # a short key can be given a double dash - but not three dashes
+    assert TableCmdLine.parse("tool --v --user me") is ParseResultEnum.SUCCESS
+    assert TableCmdLine.verbose and TableCmdLine.user == "me"
+    TableCmdLine.reset()
+    assert TableCmdLine.parse("tool ---user me") is ParseResultEnum.PARSE_ERROR
+    assert TableCmdLine.parse_errors == ["Unsupported option: '---user'"]
+
+
+def test_first_option_gets_key():
+    class TestCmdLine(CmdLine):
+        yaml_def = '''
+        supported_options:
+          - category:
+            options:
+            - long : x
+              opt  : bool
+            - name : extra
+              short: x
+              opt  : bool
+        '''
+    assert TestCmdLine.parse("tool -x") is ParseResultEnum.SUCCESS
+    assert TestCmdLine.x is True and TestCmdLine.extra is False
+
+
+def test_get_option_and_categories():
+    assert TableCmdLine.parse("tool --user me") \
+        is ParseResultEnum.SUCCESS
+    assert "tags" not in created(TableCmdLine)
+    assert TableCmdLine.get_option("tags").multi_type.name == "NO_LIMIT"
+    assert TableCmdLine.get_option("missing") is None
+    # reading a category's options creates them
+    first, second = TableCmdLine._supported_options
+    assert [option.opt_name for option in first.options] == \
+        ["verbose", "level", "tags"]
+    assert len(second.options) == 4
+    assert first.options[2] is TableCmdLine.get_option("tags")
+
+
+def test_spec_errors_found_when_built():
+    class TestCmdLine(CmdLine):
+        yaml_def = '''
+        supported_options:
+          - category:
+            options:
+            - long : ok
+              opt  : bool
+            - name : no_keys
+              opt  : bool
+        '''
+    with pytest.raises(CmdLineException, match="must specify 'short' or 'long'"):
+        TestCmdLine.parse("tool")
+
+
+def test_lookups_scale_with_tokens():
+    class TestCmdLine(CmdLine):
+        yaml_def = "supported_options:\n  - category:\n    options:\n" + "".join(
+            "    - long: opt{}\n      opt: bool\n".format(i) for i in range(500))
+        parse_settings = ParseSettings(stats=ParseStats())
+
+    assert TestCmdLine.parse("tool --opt499 --opt7") is ParseResultEnum.SUCCESS
+    assert TestCmdLine.parse_settings.stats.option_lookups == 2
+    assert created(TestCmdLine) == ["opt7", "opt499"]
+    assert TestCmdLine.opt499 is True and TestCmdLine.opt0 is False
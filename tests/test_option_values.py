@@ -0,0 +1,135 @@
+"""
+Tests the option values object - the 'result' of a parse - and its typing stub
+"""
+import pytest
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.default_call import DefaultCall
+from pycmdparse.option_values import OptionValues
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+
+class ResultCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: tool
+    supported_options:
+      - category:
+        options:
+        - name      : verbose
+          short     : v
+          opt       : bool
+        - name      : depth
+          long      : depth
+          opt       : param
+          datatype  : int
+          default   : 1
+        - name      : user
+          long      : user
+          opt       : param
+        - name      : start
+          long      : start
+          opt       : param
+          datatype  : date
+          required  : true
+        - name      : exclude
+          long      : exclude
+          opt       : param
+          multi_type: no-limit
+        - name      : sizes
+          long      : sizes
+          opt       : param
+          multi_type: exactly
+          count     : 2
+          datatype  : decimal
+          default_call: default_sizes
+    '''
+    verbose = None
+    depth = None
+    user = None
+    start = None
+    exclude = None
+    sizes = None
+
+    calls = 0
+
+    @classmethod
+    def default_sizes(cls):
+        cls.calls += 1
+        return [1.5, 2.5]
+
+
+ARGS = ["tool", "--start", "2020-01-02", "--exclude", "a", "b"]
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+    ResultCmdLine.reset()
+    ResultCmdLine.calls = 0
+    DefaultCall.clear()
+
+
+def test_values():
+    assert ResultCmdLine.parse_info.result is None
+    assert ResultCmdLine.parse(ARGS + ["-v"]) is ParseResultEnum.SUCCESS
+    result = ResultCmdLine.parse_info.result
+    assert type(result).__name__ == "ResultCmdLineOptions"
+    for name in ["verbose", "depth", "user", "start", "exclude"]:
+        assert getattr(result, name) == getattr(ResultCmdLine, name)
+    assert result.verbose is True and result.depth == 1 and result.user is None
+    assert result._asdict()["exclude"] == ["a", "b"]
+    assert not hasattr(result, "__dict__")
+    with pytest.raises(AttributeError, match="read-only"):
+        result.depth = 2
+    with pytest.raises(AttributeError):
+        result.colour
+
+
+def test_lazy_default():
+    assert ResultCmdLine.parse(ARGS) is ParseResultEnum.SUCCESS
+    result = ResultCmdLine.parse_info.result
+    assert ResultCmdLine.calls == 0
+    assert result.sizes == [1.5, 2.5]
+    assert result.sizes == [1.5, 2.5]
+    assert ResultCmdLine.calls == 1
+    # the other fields are slots, and read without calling any Python code
+    assert "sizes" not in type(result).__slots__
+    assert "depth" in type(result).__slots__
+
+
+def test_class_reused():
+    assert ResultCmdLine.parse(ARGS) is ParseResultEnum.SUCCESS
+    first = ResultCmdLine.parse_info.result
+    ResultCmdLine.reset()
+    assert ResultCmdLine.parse(ARGS + ["--depth", "5"]) is ParseResultEnum.SUCCESS
+    assert type(ResultCmdLine.parse_info.result) is type(first)
+    assert first.depth == 1 and ResultCmdLine.parse_info.result.depth == 5
+
+
+def test_failed_parse():
+    assert ResultCmdLine.parse(ARGS) is ParseResultEnum.SUCCESS
+    assert ResultCmdLine.parse(["tool", "--depth", "x"]) \
+        is ParseResultEnum.PARSE_ERROR
+    assert ResultCmdLine.parse_info.result is None
+
+
+def test_stub():
+    stub = ResultCmdLine.result_stub()
+    assert stub.splitlines()[2:] == [
+        "import datetime",
+        "from typing import List, Optional",
+        "",
+        "",
+        "class ResultCmdLineOptions:",
+        "    verbose: bool",
+        "    depth: int",
+        "    user: Optional[str]",
+        "    start: datetime.date",
+        "    exclude: List[str]",
+        "    sizes: List[float]"]
+    compile(stub, "stub", "exec")
+
+
+def test_empty_stub():
+    assert OptionValues.stub("Empty", []).endswith("class Empty:\n    pass\n")
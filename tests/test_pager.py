@@ -0,0 +1,75 @@
+"""
+Tests displaying long usage instructions in a pager
+"""
+import sys
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.help_cache import HelpCache
+from pycmdparse.parse_settings import ParseSettings
+from pycmdparse.showinfo import ShowInfo
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+    HelpCache.clear()
+
+
+def as_terminal(monkeypatch, pager, rows=10):
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+    monkeypatch.setenv("LINES", str(rows))
+    monkeypatch.setenv("PAGER", pager)
+
+
+def test_not_a_terminal(capsys):
+    lines = ["line {}".format(i) for i in range(100)]
+    text = ShowInfo.show_lines(lines, True)
+    assert capsys.readouterr().out == text == "\n".join(lines) + "\n"
+
+
+def test_fits_one_screen(capsys, monkeypatch, tmp_path):
+    as_terminal(monkeypatch, "sh -c 'cat > {}'".format(tmp_path / "paged"))
+    lines = ["line {}".format(i) for i in range(5)]
+    assert ShowInfo.show_lines(lines, True) == capsys.readouterr().out
+    assert not (tmp_path / "paged").exists()
+
+
+def test_paged(capsys, monkeypatch, tmp_path):
+    paged = tmp_path / "paged"
+    as_terminal(monkeypatch, "sh -c 'cat > {}'".format(paged))
+    lines = ["line {}".format(i) for i in range(100)]
+    text = ShowInfo.show_lines(iter(lines), True)
+    assert capsys.readouterr().out == ""
+    assert paged.read_text() == text == "\n".join(lines) + "\n"
+
+
+def test_pager_quit(monkeypatch):
+    as_terminal(monkeypatch, "true")
+    lines = ("line {}".format(i) for i in range(200000))
+    assert ShowInfo.show_lines(lines, True) is None
+
+
+def test_no_pager(capsys, monkeypatch, tmp_path):
+    as_terminal(monkeypatch, str(tmp_path / "no-such-pager"))
+    lines = ["line {}".format(i) for i in range(100)]
+    assert ShowInfo.show_lines(lines, True) == capsys.readouterr().out
+
+
+def test_show_usage_paged(capsys, monkeypatch, tmp_path):
+    class TestCmdLine(CmdLine):
+        yaml_def = '''
+        utility:
+          name: util-name
+        details: >
+        ''' + "\n          line" * 50
+        parse_settings = ParseSettings(use_pager=True)
+    paged = tmp_path / "paged"
+    as_terminal(monkeypatch, "sh -c 'cat > {}'".format(paged))
+    TestCmdLine.show_usage()
+    assert capsys.readouterr().out == ""
+    assert "util-name" in paged.read_text()
+
+    # from the cache
+    paged.unlink()
+    TestCmdLine.show_usage()
+    assert "util-name" in paged.read_text()
@@ -0,0 +1,124 @@
+"""
+Tests parsing known args, and passing through the rest as they are on the command
+line
+"""
+import pytest
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.parse_settings import ParseSettings
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+
+class WrapperCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: wrapper
+    supported_options:
+      - category:
+        options:
+        - name      : verbose
+          short     : v
+          opt       : bool
+        - name      : host
+          long      : host
+          opt       : param
+    subcommands:
+      - name   : exec
+        summary: Runs a command in a container
+        cmdline: ExecCmdLine
+    '''
+    verbose = None
+    host = None
+
+    class ExecCmdLine(CmdLine):
+        yaml_def = '''
+        utility:
+          name: wrapper exec
+        positional_params:
+          params: COMMAND...
+        supported_options:
+          - category:
+            options:
+            - name      : interactive
+              short     : i
+              opt       : bool
+        '''
+        interactive = None
+
+
+class SshCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: wrapper
+    supported_options:
+      - category:
+        options:
+        - name      : verbose
+          short     : v
+          opt       : bool
+        - name      : host
+          long      : host
+          opt       : param
+    '''
+    verbose = None
+    host = None
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+    WrapperCmdLine.reset()
+    WrapperCmdLine.ExecCmdLine.reset()
+    SshCmdLine.reset()
+
+
+@pytest.mark.parametrize("args, host, passthrough", [
+    (["-abc", "--host=h1", "--x=y", "-v", "-p", "2222", "cmd", "-l"], "h1",
+     ["-abc", "--x=y", "-p", "2222", "cmd", "-l"]),
+    (["-vx", "--host", "h1", "--", "ls", "-l"], "h1", ["-x", "ls", "-l"]),
+    (["-xv", "--host", "h1"], "h1", ["-x"]),
+    (["-xyv", "-ab", "--host=h1"], "h1", ["-x", "-y", "-ab"]),
+    (["--host", "h1", "-v"], "h1", []),
+    (["@args.txt", "-v"], None, ["@args.txt"])])
+def test_passthrough(monkeypatch, args, host, passthrough):
+    monkeypatch.setattr(SshCmdLine, "parse_settings",
+                        ParseSettings(arg_file_prefix="@"))
+    assert SshCmdLine.parse_known(["wrapper"] + args) is ParseResultEnum.SUCCESS
+    assert SshCmdLine.verbose is True and SshCmdLine.host == host
+    assert SshCmdLine.parse_info.passthrough == passthrough
+
+
+def test_not_copied():
+    args = ["wrapper", "--x=y", "-v", "-abc"]
+    assert SshCmdLine.parse_known(args) is ParseResultEnum.SUCCESS
+    assert SshCmdLine.parse_info.passthrough[0] is args[1]
+    assert SshCmdLine.parse_info.passthrough[1] is args[3]
+
+
+def test_string():
+    assert SshCmdLine.parse_known("wrapper -v 'a b' -o 'c d'") \
+        is ParseResultEnum.SUCCESS
+    assert SshCmdLine.parse_info.passthrough == ["a b", "-o", "c d"]
+
+
+def test_errors():
+    assert SshCmdLine.parse_known(["wrapper", "-x", "--host"]) \
+        is ParseResultEnum.PARSE_ERROR
+    assert SshCmdLine.parse_errors == ["host: requires a value, which was not "
+                                       "supplied"]
+    SshCmdLine.reset()
+    assert SshCmdLine.parse(["wrapper", "-x"]) is ParseResultEnum.PARSE_ERROR
+    assert SshCmdLine.parse_errors == ["Unsupported option: '-x'"]
+    assert SshCmdLine.parse_info.passthrough == []
+
+
+def test_subcommand():
+    exec_cmdline = WrapperCmdLine.ExecCmdLine
+    assert WrapperCmdLine.parse_known(["wrapper", "-v", "--tty", "exec", "-it",
+                                       "--rm", "sh"]) is ParseResultEnum.SUCCESS
+    assert WrapperCmdLine.verbose is True
+    assert exec_cmdline.interactive is True
+    assert exec_cmdline.positional_params == ["sh"]
+    # the args the root passed through, then those the subcommand passed through
+    assert WrapperCmdLine.parse_info.passthrough == ["--tty", "-t", "--rm"]
+    assert exec_cmdline.parse_info.passthrough == ["-t", "--rm"]
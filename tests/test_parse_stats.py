@@ -0,0 +1,99 @@
+"""
+Tests the optional parse instrumentation provided by the ParseStats class
+"""
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.parse_settings import ParseSettings
+from pycmdparse.parse_stats import ParseStats
+from pycmdparse.parseresult_enum import ParseResultEnum
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+
+
+SPEC = '''
+    supported_options:
+      - category:
+        options:
+        - name    : a_opt
+          short   : a
+          opt     : bool
+        - name    : b_opt
+          short   : b
+          opt     : param
+          datatype: int
+          multi_type: no-limit
+    '''
+
+
+def test_disabled_by_default():
+    class TestCmdLine(CmdLine):
+        yaml_def = SPEC
+
+    parse_result = TestCmdLine.parse("util-name -a")
+    assert parse_result.value == ParseResultEnum.SUCCESS.value
+    assert TestCmdLine.parse_settings.stats is None
+
+
+def test_counts_and_phases():
+    called = []
+
+    class TestCmdLine(CmdLine):
+        yaml_def = SPEC
+        parse_settings = ParseSettings(stats=ParseStats(callback=called.append))
+
+    parse_result = TestCmdLine.parse("util-name -b 1 2 3 -a")
+    assert parse_result.value == ParseResultEnum.SUCCESS.value
+    stats = TestCmdLine.parse_settings.stats
+    assert called == [stats]
+    assert stats.parses == 1
+    # the utility name is counted, like the five tokens following it
+    assert stats.tokens == 6
+    # one lookup each for '-b' and '-a' - however many options there are
+    assert stats.option_lookups == 2
+    assert stats.conversions == 3
+    assert stats.errors == 0
+    for phase in [ParseStats.SPEC_LOAD, ParseStats.TOKENIZE, ParseStats.DISPATCH,
+                  ParseStats.FINAL_VALIDATE, ParseStats.ADD_FIELDS]:
+        assert stats.phases[phase] > 0
+    repr(stats)  # for coverage
+
+
+def test_errors_counted():
+    class TestCmdLine(CmdLine):
+        yaml_def = SPEC
+        parse_settings = ParseSettings(stats=ParseStats(), collect_errors=True)
+
+    parse_result = TestCmdLine.parse("util-name -x -b X")
+    assert parse_result.value == ParseResultEnum.PARSE_ERROR.value
+    assert TestCmdLine.parse_settings.stats.errors == 2
+    assert TestCmdLine.parse_settings.stats.tokens == 4
+    TestCmdLine.parse_settings.stats.reset()
+    assert TestCmdLine.parse_settings.stats.errors == 0
+
+
+def test_errors_counted_once():
+    class TestCmdLine(CmdLine):
+        yaml_def = SPEC
+        parse_settings = ParseSettings(stats=ParseStats())
+
+    assert TestCmdLine.parse("util-name -x") is ParseResultEnum.PARSE_ERROR
+    assert TestCmdLine.parse_settings.stats.errors == 1
+    # the errors of the failed parse aren't counted again
+    assert TestCmdLine.parse("util-name -a") is ParseResultEnum.SUCCESS
+    assert TestCmdLine.parse_settings.stats.errors == 1
+    assert TestCmdLine.parse_settings.stats.parses == 2
+
+
+def test_textfile(tmp_path):
+    stats = ParseStats()
+    stats.tokens = 7
+    text = stats.to_textfile(labels={"utility": "util-name"})
+    assert 'pycmdparse_tokens_total{utility="util-name"} 7' in text
+    assert 'pycmdparse_phase_seconds_total{utility="util-name",phase="dispatch"}' \
+        in text
+    path = str(tmp_path / "util.prom")
+    stats.write_textfile(path)
+    with open(path) as f:
+        assert "pycmdparse_tokens_total 7" in f.read()
@@ -0,0 +1,150 @@
+"""
+Tests plugin subcommands, discovered through entry points, and caching their index
+"""
+import os
+import sys
+
+import pytest
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.help_cache import HelpCache
+from pycmdparse.parse_settings import ParseSettings
+from pycmdparse.parseresult_enum import ParseResultEnum
+from pycmdparse.plugin_index import PluginIndex
+
+AUDIT_MODULE = '''
+from pycmdparse.cmdline import CmdLine
+
+
+class AuditCmdLine(CmdLine):
+    yaml_def = """
+    utility:
+      name: tool audit
+    summary: Audits an environment
+    supported_options:
+      - category:
+        options:
+        - name      : strict
+          long      : strict
+          opt       : bool
+    """
+    strict = None
+'''
+
+ENTRY_POINTS = '''
+[plugin_tool.subcommands]
+audit = plugin_tool_audit:AuditCmdLine
+logs = plugin_tool_audit:NoSuchCmdLine
+'''
+
+
+class PluginCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: tool
+    supported_options:
+      - category:
+        options:
+        - name      : verbose
+          short     : v
+          opt       : bool
+    subcommands:
+      - name   : logs
+        summary: Shows the logs of an environment
+        cmdline: LogsCmdLine
+    '''
+    parse_settings = ParseSettings(plugin_group="plugin_tool.subcommands")
+    verbose = None
+
+    class LogsCmdLine(CmdLine):
+        yaml_def = '''
+        utility:
+          name: tool logs
+        '''
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+    PluginCmdLine.reset()
+    PluginIndex.clear()
+    HelpCache.clear()
+
+
+@pytest.fixture
+def plugin(tmp_path, monkeypatch):
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "plugin_tool_audit.py").write_text(AUDIT_MODULE, encoding="utf-8")
+    dist_info = site / "plugin_tool_audit-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: plugin-tool-audit\nVersion: 1.0\n",
+        encoding="utf-8")
+    (dist_info / "entry_points.txt").write_text(ENTRY_POINTS, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(site))
+    yield site
+    sys.modules.pop("plugin_tool_audit", None)
+
+
+def test_plugin(plugin):
+    assert PluginCmdLine.parse(["tool", "-v"]) is ParseResultEnum.PARSE_ERROR
+    assert PluginCmdLine.parse_errors == [
+        "A subcommand is required. One of: logs, audit"]
+    # the plugin's module is only imported when its subcommand is used
+    assert "plugin_tool_audit" not in sys.modules
+    PluginCmdLine.reset()
+    assert PluginCmdLine.parse(["tool", "-v", "audit", "--strict"]) \
+        is ParseResultEnum.SUCCESS
+    audit = sys.modules["plugin_tool_audit"].AuditCmdLine
+    assert PluginCmdLine.parse_info.subcommand_cmdline is audit
+    assert audit.strict is True
+    # the spec's subcommand takes precedence over the plugin
+    PluginCmdLine.reset()
+    assert PluginCmdLine.parse(["tool", "logs"]) is ParseResultEnum.SUCCESS
+    assert PluginCmdLine.parse_info.subcommand_cmdline is PluginCmdLine.LogsCmdLine
+
+
+def test_help(plugin, capsys):
+    assert PluginCmdLine.parse(["tool", "-h"]) is ParseResultEnum.SHOW_USAGE
+    PluginCmdLine.display_info(ParseResultEnum.SHOW_USAGE)
+    assert "Subcommands:\n\nlogs   Shows the logs of an environment\n" \
+           "audit  Audits an environment\n" in capsys.readouterr().out
+
+
+def test_help_broken_plugin(plugin, capsys):
+    (plugin / "plugin_tool_audit.py").write_text("raise RuntimeError('broken')\n",
+                                                 encoding="utf-8")
+    assert PluginCmdLine.parse(["tool", "-h"]) is ParseResultEnum.SHOW_USAGE
+    PluginCmdLine.display_info(ParseResultEnum.SHOW_USAGE)
+    # listed without a summary
+    assert "logs   Shows the logs of an environment\naudit\n" \
+        in capsys.readouterr().out
+
+
+def test_index_cache(plugin, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    index = {"audit": "plugin_tool_audit.AuditCmdLine",
+             "logs": "plugin_tool_audit.NoSuchCmdLine"}
+    assert PluginIndex.load("plugin_tool.subcommands", cache_dir) == index
+    scans = []
+    scan = PluginIndex._scan
+
+    def counting(group):
+        scans.append(group)
+        return scan(group)
+    monkeypatch.setattr(PluginIndex, "_scan", staticmethod(counting))
+    assert PluginIndex.load("plugin_tool.subcommands", cache_dir) == index
+    # a new process reads the index persisted in the cache directory
+    PluginIndex.clear()
+    assert PluginIndex.load("plugin_tool.subcommands", cache_dir) == index
+    assert scans == []
+    # installing a package changes the modification time of its directory
+    (plugin / "plugin_tool_audit-1.0.dist-info" / "entry_points.txt").write_text(
+        "[plugin_tool.subcommands]\naudit = plugin_tool_audit:AuditCmdLine\n",
+        encoding="utf-8")
+    mtime = os.stat(str(plugin)).st_mtime_ns + 1000000000
+    os.utime(str(plugin), ns=(mtime, mtime))
+    assert PluginIndex.load("plugin_tool.subcommands", cache_dir) == {
+        "audit": "plugin_tool_audit.AuditCmdLine"}
+    assert scans == ["plugin_tool.subcommands"]
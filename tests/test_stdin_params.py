@@ -0,0 +1,124 @@
+"""
+Tests reading positional params from stdin
+"""
+import io
+import types
+
+import pytest
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.parseresult_enum import ParseResultEnum
+from pycmdparse.token_reader import TokenReader
+
+
+class StdinCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: tool
+    positional_params:
+      params: PATH... | -
+      text: The paths to process. If none - or '-' - then read from stdin
+      stdin: true
+    supported_options:
+      - category:
+        options:
+        - name      : verbose
+          short     : v
+          opt       : bool
+        - name      : name
+          long      : name
+          opt       : param
+    '''
+    verbose = None
+    name = None
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+    StdinCmdLine.reset()
+
+
+class Producer(io.RawIOBase):
+    """
+    A stream that returns one piece of data per read - like a pipe being written
+    to - and records how many reads were made
+    """
+    def __init__(self, pieces):
+        self.pieces = list(pieces)
+        self.reads = 0
+
+    def readable(self):
+        return True
+
+    def read1(self, size=-1):
+        self.reads += 1
+        return self.pieces.pop(0) if self.pieces else b""
+
+
+def set_stdin(monkeypatch, data):
+    stream = io.BytesIO(data) if isinstance(data, bytes) else data
+    monkeypatch.setattr("sys.stdin", types.SimpleNamespace(buffer=stream))
+
+
+@pytest.mark.parametrize("args", [["tool", "-v", "-"], ["tool", "-v"]])
+def test_read_stdin(monkeypatch, args):
+    set_stdin(monkeypatch, b"a\r\nb c\n\nd")
+    assert StdinCmdLine.parse(args) is ParseResultEnum.SUCCESS
+    assert StdinCmdLine.verbose
+    assert list(StdinCmdLine.positional_params) == ["a", "b c", "d"]
+
+
+def test_params_supplied(monkeypatch):
+    set_stdin(monkeypatch, b"a\n")
+    StdinCmdLine.parse(["tool", "--name", "-", "x", "-"])
+    assert StdinCmdLine.name == "-"
+    assert StdinCmdLine.positional_params == ["x", "-"]
+
+
+def test_nul_delimited(monkeypatch):
+    set_stdin(monkeypatch, b"one\ntwo\0three\0")
+    monkeypatch.setattr(StdinCmdLine, "yaml_def", StdinCmdLine.yaml_def.replace(
+        "stdin: true", "stdin: true\n      stdin_delimiter: nul"))
+    StdinCmdLine.parse(["tool"])
+    assert list(StdinCmdLine.positional_params) == ["one\ntwo", "three"]
+
+
+def test_unknown_delimiter(monkeypatch):
+    monkeypatch.setattr(StdinCmdLine, "yaml_def", StdinCmdLine.yaml_def.replace(
+        "stdin: true", "stdin: true\n      stdin_delimiter: tab"))
+    with pytest.raises(CmdLineException, match="Unknown stdin_delimiter: 'tab'"):
+        StdinCmdLine.parse(["tool"])
+
+
+def test_not_enabled(monkeypatch):
+    set_stdin(monkeypatch, b"a\n")
+    monkeypatch.setattr(StdinCmdLine, "yaml_def",
+                        StdinCmdLine.yaml_def.replace("stdin: true", ""))
+    StdinCmdLine.parse(["tool", "-"])
+    assert StdinCmdLine.positional_params == ["-"]
+    StdinCmdLine.reset()
+    StdinCmdLine.parse(["tool"])
+    assert StdinCmdLine.positional_params == []
+
+
+def test_streamed(monkeypatch):
+    producer = Producer([b"a\nb", b"c\nd\n", b"e"])
+    set_stdin(monkeypatch, producer)
+    StdinCmdLine.parse(["tool"])
+    params = StdinCmdLine.positional_params
+    assert producer.reads == 0
+    assert next(params) == "a"
+    assert producer.reads == 1
+    # the partial param is held until the rest of it arrives
+    assert next(params) == "bc"
+    assert producer.reads == 2
+    assert list(StdinCmdLine.positional_params) == ["d", "e"]
+
+
+def test_stream_chunks(monkeypatch):
+    monkeypatch.setattr(TokenReader, "CHUNK_SIZE", 64)
+    paths = ["/data/file-{:05}".format(i) for i in range(5000)]
+    stream = io.BufferedReader(io.BytesIO("\n".join(paths).encode()))
+    assert list(TokenReader.stream(stream)) == paths
@@ -0,0 +1,233 @@
+"""
+Tests subcommands, and loading their specs only when they're on the command line
+"""
+import sys
+
+import pytest
+
+from pycmdparse.cmdline import CmdLine
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.errorkind_enum import ErrorKindEnum
+from pycmdparse.lint import Lint
+from pycmdparse.parseresult_enum import ParseResultEnum
+from pycmdparse.splitter import Splitter
+
+LOGS_MODULE = '''
+from pycmdparse.cmdline import CmdLine
+
+
+class LogsCmdLine(CmdLine):
+    yaml_def = """
+    utility:
+      name: tool logs
+    supported_options:
+      - category:
+        options:
+        - name      : follow
+          short     : f
+          opt       : bool
+    """
+    follow = None
+'''
+
+
+class ToolCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: tool
+    summary: >
+      Deploys builds, and shows their logs.
+    supported_options:
+      - category:
+        options:
+        - name      : verbose
+          short     : v
+          opt       : bool
+        - name      : region
+          long      : region
+          opt       : param
+    subcommands:
+      - name   : deploy
+        summary: Deploys a build to an environment
+        cmdline: DeployCmdLine
+      - name   : run
+        summary: Runs a command in an environment
+        cmdline: RunCmdLine
+      - name   : logs
+        summary: Shows the logs of an environment
+        cmdline: subcommand_logs.LogsCmdLine
+    '''
+    verbose = None
+    region = None
+
+    class DeployCmdLine(CmdLine):
+        yaml_def = '''
+        utility:
+          name: tool deploy
+        positional_params:
+          params: ENV
+        supported_options:
+          - category:
+            options:
+            - name      : force
+              short     : f
+              opt       : bool
+            - name      : tag
+              long      : tag
+              opt       : param
+        '''
+        force = None
+        tag = None
+
+    class RunCmdLine(CmdLine):
+        yaml_def = '''
+        utility:
+          name: tool run
+        positional_params:
+          params: COMMAND...
+        '''
+
+
+# noinspection PyUnusedLocal
+def setup_function(function):
+    CmdLine.reset()
+    ToolCmdLine.reset()
+    ToolCmdLine.DeployCmdLine.reset()
+    ToolCmdLine.RunCmdLine.reset()
+
+
+@pytest.fixture
+def logs_module(tmp_path, monkeypatch):
+    (tmp_path / "subcommand_logs.py").write_text(LOGS_MODULE, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield
+    sys.modules.pop("subcommand_logs", None)
+
+
+def test_subcommand(logs_module):
+    deploy = ToolCmdLine.DeployCmdLine
+    assert ToolCmdLine.parse(["tool", "-v", "--region=eu", "deploy", "-f",
+                              "--tag=v2", "prod"]) is ParseResultEnum.SUCCESS
+    assert ToolCmdLine.verbose is True and ToolCmdLine.region == "eu"
+    assert ToolCmdLine.parse_info.subcommand == "deploy"
+    assert ToolCmdLine.parse_info.subcommand_cmdline is deploy
+    assert deploy.force is True and deploy.tag == "v2"
+    assert deploy.positional_params == ["prod"]
+    assert deploy._utility_name == "tool deploy"
+    # only the spec of the subcommand on the command line is loaded
+    assert ToolCmdLine.RunCmdLine._raw_spec is None
+    assert "subcommand_logs" not in sys.modules
+
+
+def test_args_passed_as_is():
+    # the subcommand's spec defines no options, so none of its args are split
+    run = ToolCmdLine.RunCmdLine
+    assert ToolCmdLine.parse("tool -v run -abc --x=y") is ParseResultEnum.SUCCESS
+    assert run.positional_params == ["-abc", "--x=y"]
+    assert ToolCmdLine.parse(["tool", "--", "run", "-v"]) is ParseResultEnum.SUCCESS
+    assert ToolCmdLine.verbose is False
+    assert run.positional_params == ["-v"]
+
+
+def test_dotted_path(logs_module):
+    assert ToolCmdLine.parse(["tool", "logs", "-f"]) is ParseResultEnum.SUCCESS
+    logs = sys.modules["subcommand_logs"].LogsCmdLine
+    assert ToolCmdLine.parse_info.subcommand_cmdline is logs
+    assert logs.follow is True
+
+
+@pytest.mark.parametrize("args, message", [
+    (["tool", "-v"], "A subcommand is required. One of: deploy, run, logs"),
+    (["tool", "--region", "eu", "destroy", "-f"], "Unknown subcommand: 'destroy'")])
+def test_subcommand_errors(args, message):
+    assert ToolCmdLine.parse(args) is ParseResultEnum.PARSE_ERROR
+    assert ToolCmdLine.parse_info.errors[0].kind is ErrorKindEnum.SUBCOMMAND
+    assert ToolCmdLine.parse_errors == [message]
+    assert ToolCmdLine.parse_info.subcommand is None
+
+
+def test_subcommand_parse_error(capsys):
+    assert ToolCmdLine.parse(["tool", "deploy", "--force"]) \
+        is ParseResultEnum.PARSE_ERROR
+    assert ToolCmdLine.parse_errors == []
+    assert ToolCmdLine.DeployCmdLine.parse_errors == ["Unsupported option: '--force'"]
+    ToolCmdLine.display_info(ParseResultEnum.PARSE_ERROR)
+    assert "try: tool deploy -h" in capsys.readouterr().out
+
+
+def test_help(capsys, monkeypatch):
+    def fail():
+        raise AssertionError("a subcommand's spec was loaded")
+    monkeypatch.setattr(ToolCmdLine.DeployCmdLine, "_load_spec", fail)
+    assert ToolCmdLine.parse(["tool", "-h"]) is ParseResultEnum.SHOW_USAGE
+    ToolCmdLine.display_info(ParseResultEnum.SHOW_USAGE)
+    out = capsys.readouterr().out
+    assert "tool [-v] [--region] SUBCOMMAND [ARGS...]" in out
+    assert "Subcommands:\n\ndeploy  Deploys a build to an environment\n" \
+           "run     Runs a command in an environment\n" in out
+    monkeypatch.undo()
+    assert ToolCmdLine.parse(["tool", "deploy", "-h"]) is ParseResultEnum.SHOW_USAGE
+    ToolCmdLine.display_info(ParseResultEnum.SHOW_USAGE)
+    assert "tool deploy [-f] [--tag] ENV" in capsys.readouterr().out
+
+
+class BareCmdLine(CmdLine):
+    yaml_def = '''
+    utility:
+      name: bare
+    subcommands:
+      - name   : run
+        summary: Runs a command in an environment
+        cmdline: RunCmdLine
+    '''
+    RunCmdLine = ToolCmdLine.RunCmdLine
+
+
+@pytest.mark.parametrize("arg", ["-h", "--help"])
+def test_help_without_options(capsys, arg):
+    BareCmdLine.reset()
+    assert BareCmdLine.parse(["bare", arg]) is ParseResultEnum.SHOW_USAGE
+    BareCmdLine.display_info(ParseResultEnum.SHOW_USAGE)
+    assert "Subcommands:\n\nrun  Runs a command" in capsys.readouterr().out
+    # the subcommand's spec defines no options, so its '-h' is a positional param
+    assert BareCmdLine.parse(["bare", "run", "-h"]) is ParseResultEnum.SUCCESS
+    assert BareCmdLine.RunCmdLine.positional_params == ["-h"]
+
+
+@pytest.mark.parametrize("old, new, message", [
+    ("cmdline: RunCmdLine", "cmdline: NoSuchCmdLine",
+     "Unable to find the cmdline of subcommand 'run': NoSuchCmdLine"),
+    ("name   : run", "name   : deploy",
+     "Subcommand 'deploy' is defined more than once"),
+    ("summary: >", "positional_params:\n      params: X\n    summary: >",
+     "A spec can't define both positional_params and subcommands")])
+def test_invalid_spec(monkeypatch, logs_module, old, new, message):
+    monkeypatch.setattr(ToolCmdLine, "yaml_def", ToolCmdLine.yaml_def.replace(
+        old, new))
+    with pytest.raises(CmdLineException) as e:
+        ToolCmdLine.parse(["tool", "run"])
+    assert e.value.args[0] == message
+    assert Lint.lint(ToolCmdLine) == [message]
+
+
+def test_import_error(tmp_path, monkeypatch):
+    (tmp_path / "subcommand_broken.py").write_text("import no_such_dependency\n",
+                                                   encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(ToolCmdLine, "yaml_def", ToolCmdLine.yaml_def.replace(
+        "subcommand_logs.LogsCmdLine", "subcommand_broken.LogsCmdLine"))
+    with pytest.raises(CmdLineException) as e:
+        ToolCmdLine.parse(["tool", "logs"])
+    assert e.value.args[0] == "Unable to import subcommand_broken: No module " \
+                              "named 'no_such_dependency'"
+
+
+def test_lint(logs_module):
+    assert Lint.lint(ToolCmdLine) == []
+
+
+def test_arg_indices():
+    args = ["tool", "-vf", "--region=eu", "x", "--", "-y"]
+    assert len(Splitter.split_list(args, True).pop_all()) == 8
+    assert Splitter.arg_indices(args, True) == [0, 1, 1, 2, 2, 3, 4, 5]
+    assert Splitter.arg_indices(args, False) == list(range(len(args)))
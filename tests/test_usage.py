@@ -2,8 +2,15 @@
 Tests that parse and show usage doesn't crash if things aren't
 defined in the yaml. Doesn't validate usage. Just want to make
 sure the parser isn't real easy to crash.
+Also tests that usage can be requested, and shown, without building
+the options.
 """
+import pytest
+
 from pycmdparse.cmdline import CmdLine
+from pycmdparse.cmdline_exception import CmdLineException
+from pycmdparse.help_cache import HelpCache
+from pycmdparse.parseresult_enum import ParseResultEnum
 
 
 # noinspection PyUnusedLocal
@@ -78,3 +85,56 @@ def test_usage_addendum():
         '''
     TestCmdLine.parse("util-name")
     TestCmdLine.show_usage()
+
+
+def test_usage_without_building_options():
+    # the invalid default is only detected when the options are built, which
+    # requesting usage doesn't do
+    class TestCmdLine(CmdLine):
+        yaml_def = '''
+        supported_options:
+          - category:
+            options:
+            - long    : count
+              datatype: int
+              default : abc
+        '''
+    for cmd_line in ["util-name -h", "util-name --HELP", "util-name -hv",
+                     ["util-name", "--help=x"]]:
+        TestCmdLine.reset()
+        assert TestCmdLine.parse(cmd_line) is ParseResultEnum.SHOW_USAGE
+    TestCmdLine.reset()
+    with pytest.raises(CmdLineException):
+        TestCmdLine.parse("util-name --count 1")
+
+
+def test_usage_no_options():
+    # with no options defined, '-h' is a positional param
+    class TestCmdLine(CmdLine):
+        yaml_def = '''
+        positional_params:
+          params: X
+          text: X
+        '''
+    assert TestCmdLine.parse("util-name -h") is ParseResultEnum.SUCCESS
+    assert TestCmdLine.positional_params == ["-h"]
+
+
+def test_usage_before_parse(capsys):
+    class TestCmdLine(CmdLine):
+        yaml_def = '''
+        utility:
+          name: util-name
+        supported_options:
+          - category:
+            options:
+            - long : a-opt
+        '''
+    HelpCache.clear()
+    TestCmdLine.show_usage()
+    before = capsys.readouterr().out
+    assert "--a-opt" in before
+    HelpCache.clear()
+    TestCmdLine.parse("util-name --a-opt X")
+    TestCmdLine.show_usage()
+    assert capsys.readouterr().out == before
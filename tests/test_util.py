@@ -0,0 +1,40 @@
+"""
+Tests the word-wrapping used to render usage instructions
+"""
+from pycmdparse.util import Util
+
+
+def test_split_on_space():
+    assert Util.split_string("this is a test of stringsplitting", 10) == \
+        ["this is a", "test of", "stringspli", "tting"]
+
+
+def test_empty():
+    assert Util.split_string(None, 10) == []
+    assert Util.split_string("", 10) == []
+    assert Util.split_string("   \n  ", 10) == []
+
+
+def test_blank_lines():
+    assert Util.split_string("abc\n\ndef", 10) == ["abc", "", "def"]
+
+
+def test_leading_indent():
+    assert Util.split_string("  - an indented item", 10) == \
+        ["  - an", "indented", "item"]
+
+
+def test_space_past_segment():
+    # a space just past the segment allows a full width segment
+    assert Util.split_string("abcde fghij", 5) == ["abcde", "fghij"]
+
+
+def test_interior_spaces():
+    assert Util.split_string("a  b  c   d", 6) == ["a  b", "c   d"]
+
+
+def test_long_line():
+    words = ["word{}".format(i) for i in range(10000)]
+    segments = Util.split_string(" ".join(words), 80)
+    assert all(len(segment) <= 80 for segment in segments)
+    assert " ".join(segments).split() == words